@@ -0,0 +1,70 @@
+import argparse
+import pathlib
+import sys
+
+BASE_DIR = pathlib.Path(__file__).resolve().parent
+if str(BASE_DIR) not in sys.path:
+    sys.path.insert(0, str(BASE_DIR))
+
+import uvicorn
+
+from src.api.server import create_api
+from src.game.chaser_pool import ChaserPool
+from src.game.game_runner import (
+    load_default_comment_bank,
+    load_default_question_pool,
+    load_default_draw_index,
+    load_default_question_stats,
+    start_default_llm_telemetry,
+)
+from src.utils.prefork import fork_workers, preload, worker_path
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Serve the headless JSON/HTTP game API")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--keep-alive", type=int, default=75, help="Keep-alive timeout in seconds")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="Worker processes, forked after loading the shared data; worker i listens on port + i")
+    args = parser.parse_args()
+
+    question_stats = load_default_question_stats(BASE_DIR)
+
+    def serve(worker_index: int | None = None, **kwargs) -> None:
+        start_default_llm_telemetry(BASE_DIR, worker_index)
+        question_stats.start_flusher()
+
+        app = create_api(BASE_DIR, question_stats=question_stats, **kwargs)
+
+        uvicorn.run(
+            app,
+            host=args.host,
+            port=args.port + (worker_index or 0),
+            timeout_keep_alive=args.keep_alive,
+            access_log=False,
+        )
+
+    if args.workers <= 1:
+        serve()
+        return
+
+    questions = load_default_question_pool(BASE_DIR)
+    # cached for the workers, like the pool
+    load_default_draw_index(BASE_DIR)
+    comment_bank = load_default_comment_bank(BASE_DIR)
+    comment_bank.load()
+    preload("dotenv", "openai")
+
+    def serve_worker(worker_index: int) -> None:
+        # each worker flushes its own increments; the next start merges them
+        question_stats.path = worker_path(question_stats.path, worker_index)
+        question_stats.mark_baseline()
+
+        serve(worker_index, questions=questions, chaser_pool=ChaserPool(comment_bank=comment_bank))
+
+    sys.exit(1 if fork_workers(args.workers, serve_worker) else 0)
+
+
+if __name__ == "__main__":
+    main()
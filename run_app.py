@@ -1,4 +1,5 @@
 import pathlib
+import signal
 import sys
 
 BASE_DIR = pathlib.Path(__file__).resolve().parent
@@ -7,11 +8,67 @@ if str(SRC_DIR) not in sys.path:
     sys.path.insert(0, str(SRC_DIR))
 
 from ui.app import create_app
+from config.serving import GRADIO_PORT, MAX_THREADS, METRICS_PORT, WORKERS
+# same module objects as the ones ui.app uses, so the metrics are shared
+from src.game.chaser_pool import ChaserPool
+from src.game.degraded import DEGRADED
+from src.game.game_runner import (
+    load_default_comment_bank,
+    load_default_question_pool,
+    load_default_draw_index,
+    load_default_question_stats,
+    start_default_llm_telemetry,
+)
+from src.game.session_manager import SessionManager
+from src.llm.router import ROUTER
+from src.llm.scheduler import SCHEDULER
+from src.llm.telemetry import TELEMETRY
+from src.utils.prefork import fork_workers, preload, worker_path
+from src.utils.tracing import start_metrics_server
+
+def serve(worker_index: int = 0, **kwargs) -> None:
+    sessions = SessionManager()
+    if METRICS_PORT:
+        start_metrics_server(METRICS_PORT + worker_index, gauges=lambda: {**sessions.metrics(), **DEGRADED.metrics(), **ROUTER.metrics(), **SCHEDULER.metrics(), **TELEMETRY.metrics()})
+
+    app = create_app(BASE_DIR, sessions=sessions, **kwargs)
+    app.launch(max_threads=MAX_THREADS, server_port=GRADIO_PORT + worker_index)
+
 
 def main() -> None:
-    app = create_app(BASE_DIR)
-    app.launch()
+    if WORKERS <= 1:
+        serve()
+        return
+
+    questions = load_default_question_pool(BASE_DIR)
+    # cached for the workers, like the pool
+    load_default_draw_index(BASE_DIR)
+    question_stats = load_default_question_stats(BASE_DIR)
+    comment_bank = load_default_comment_bank(BASE_DIR)
+    comment_bank.load()
+    preload("dotenv", "openai")
+
+    def serve_worker(worker_index: int) -> None:
+        # each worker flushes its own increments; the next start merges them
+        question_stats.path = worker_path(question_stats.path, worker_index)
+        question_stats.mark_baseline()
+        start_default_llm_telemetry(BASE_DIR, worker_index)
+        # SIGTERM from the parent stops the server like Ctrl+C, so the finally block runs
+        signal.signal(signal.SIGTERM, signal.default_int_handler)
+
+        try:
+            serve(
+                worker_index,
+                questions=questions,
+                question_stats=question_stats,
+                chaser_pool=ChaserPool(comment_bank=comment_bank),
+            )
+        finally:
+            question_stats.stop_flusher()
+            TELEMETRY.stop_dumper()
+
+    sys.exit(1 if fork_workers(WORKERS, serve_worker) else 0)
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,181 @@
+"""
+Startup benchmark.
+
+- Import cost of each entry point, measured with `python -X importtime` in a
+  fresh interpreter (median of several runs), with the heaviest packages
+- Time to first request of the HTTP API and the Gradio app (process start
+  until the first successful response)
+- Compares everything with scripts/startup_budget.json and exits with
+  status 1 when a budget is exceeded
+
+Example:
+    python scripts/bench_startup.py --runs 5
+"""
+
+import argparse
+import json
+import os
+import pathlib
+import re
+import socket
+import statistics
+import subprocess
+import sys
+import time
+import urllib.request
+
+BASE_DIR = pathlib.Path(__file__).resolve().parents[1]
+BUDGET_PATH = BASE_DIR / "scripts" / "startup_budget.json"
+
+ENTRY_POINTS = {
+    "question_loader": "import src.utils.question_loader",
+    "game_engine": "import src.game.engine",
+    "game_runner": "import src.game.game_runner",
+    "http_api": "import src.api.server",
+    "gradio_app": "import src.ui.app",
+}
+
+IMPORTTIME_LINE = re.compile(r"import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+
+def measure_imports(statement: str, runs: int) -> dict:
+    walls = []
+    last_stderr = ""
+
+    for _ in range(runs):
+        t0 = time.perf_counter()
+        proc = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", statement],
+            cwd=BASE_DIR,
+            capture_output=True,
+            text=True,
+        )
+        walls.append(time.perf_counter() - t0)
+        if proc.returncode != 0:
+            raise RuntimeError(f"{statement!r} failed:\n{proc.stderr[-2000:]}")
+        last_stderr = proc.stderr
+
+    # cumulative time of top-level packages (no indentation beyond one space)
+    top_level: dict[str, int] = {}
+    for line in last_stderr.splitlines():
+        m = IMPORTTIME_LINE.match(line)
+        if not m:
+            continue
+        cumulative_us, indent, name = int(m.group(2)), len(m.group(3)), m.group(4)
+        if indent == 1:
+            root = name.split(".")[0]
+            top_level[root] = top_level.get(root, 0) + cumulative_us
+
+    heaviest = sorted(top_level.items(), key=lambda kv: kv[1], reverse=True)[:5]
+
+    return {
+        "wall_ms": round(statistics.median(walls) * 1000, 1),
+        "heaviest_ms": {name: round(us / 1000, 1) for name, us in heaviest},
+    }
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def time_to_first_request(args: list[str], url: str, env: dict, timeout_seconds: float = 60.0) -> float:
+    t0 = time.perf_counter()
+    proc = subprocess.Popen(args, cwd=BASE_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+    try:
+        while time.perf_counter() - t0 < timeout_seconds:
+            if proc.poll() is not None:
+                raise RuntimeError(f"{args} exited with status {proc.returncode}")
+            try:
+                with urllib.request.urlopen(url, timeout=1.0) as response:
+                    if response.status < 500:
+                        return time.perf_counter() - t0
+            except OSError:
+                time.sleep(0.05)
+
+        raise RuntimeError(f"{url} did not answer within {timeout_seconds}s")
+
+    finally:
+        proc.terminate()
+        proc.wait(timeout=10)
+
+
+def measure_first_requests() -> dict:
+    env = dict(os.environ)
+    env.setdefault("OPENAI_API_KEY", "stub")
+    env["GRADIO_ANALYTICS_ENABLED"] = "False"
+
+    results = {}
+
+    if (BASE_DIR / "data" / "processed" / "question_chaser.jsonl").exists():
+        port = free_port()
+        results["http_api"] = time_to_first_request(
+            [sys.executable, "run_api.py", "--port", str(port)],
+            f"http://127.0.0.1:{port}/health",
+            env,
+        )
+
+    port = free_port()
+    app_env = dict(env, GRADIO_SERVER_PORT=str(port))
+    results["gradio_app"] = time_to_first_request(
+        [sys.executable, "run_app.py"],
+        f"http://127.0.0.1:{port}/",
+        app_env,
+    )
+
+    return {name: round(seconds * 1000, 1) for name, seconds in results.items()}
+
+
+def check_budget(report: dict, budget: dict) -> list[str]:
+    failures = []
+
+    for name, limit_ms in budget.get("import_wall_ms", {}).items():
+        value = report["imports"].get(name, {}).get("wall_ms")
+        if value is not None and value > limit_ms:
+            failures.append(f"import {name}: {value} ms > budget {limit_ms} ms")
+
+    for name, limit_ms in budget.get("time_to_first_request_ms", {}).items():
+        value = report.get("time_to_first_request_ms", {}).get(name)
+        if value is not None and value > limit_ms:
+            failures.append(f"first request {name}: {value} ms > budget {limit_ms} ms")
+
+    return failures
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Measure import time and time to first request")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--skip-servers", action="store_true", help="Only measure imports")
+    parser.add_argument("--output", type=pathlib.Path, default=None)
+    args = parser.parse_args()
+
+    report = {
+        "python": sys.version.split()[0],
+        "imports": {name: measure_imports(stmt, args.runs) for name, stmt in ENTRY_POINTS.items()},
+    }
+
+    if not args.skip_servers:
+        report["time_to_first_request_ms"] = measure_first_requests()
+
+    budget = json.loads(BUDGET_PATH.read_text(encoding="utf-8")) if BUDGET_PATH.exists() else {}
+    failures = check_budget(report, budget)
+    report["budget_failures"] = failures
+
+    text = json.dumps(report, indent=2)
+    print(text)
+
+    if args.output is not None:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(text, encoding="utf-8")
+
+    if failures:
+        print("\nStartup budget exceeded:", file=sys.stderr)
+        for f in failures:
+            print(f"  - {f}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
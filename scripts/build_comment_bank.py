@@ -0,0 +1,99 @@
+"""
+Pre-generate chaser comments for the most asked questions.
+
+- Picks the `--top` questions most asked in the Chase (from
+  data/processed/question_stats.npz; pool order when there are no stats)
+- Generates the comment of every persona for every player option and
+  chaser outcome (32 per question) with bounded async concurrency
+- Keeps the comments of an existing bank, so a rerun only fills the gaps
+- Writes data/processed/comment_bank.npz, served by ChaserLogic at runtime
+
+Example:
+    python scripts/build_comment_bank.py --top 200 --concurrency 32
+"""
+
+import argparse
+import asyncio
+import pathlib
+import sys
+import time
+
+BASE_DIR = pathlib.Path(__file__).resolve().parents[1]
+if str(BASE_DIR) not in sys.path:
+    sys.path.insert(0, str(BASE_DIR))
+
+from src.game.chaser_logic import ChaserLogic
+from src.game.chaser_pool import CHASER_MODEL_DEFAULT
+from src.game.comment_bank import CommentBank, agenerate_comments
+from src.game.game_runner import load_default_comment_bank, load_default_question_pool, load_default_question_stats
+from src.game.state import GamePhase
+from src.llm.personas import get_all_personas
+from src.llm.question_answerer import QuestionAnswerer
+from src.llm.scheduler import PRIORITY_BATCH, llm_work
+
+PROGRESS_EVERY = 200
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Pre-generate chaser comments for the hottest questions")
+    parser.add_argument("--top", type=int, default=200, help="Number of questions")
+    parser.add_argument("--model", default=CHASER_MODEL_DEFAULT)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--output", type=pathlib.Path, default=None, help="Default: data/processed/comment_bank.npz")
+
+    return parser.parse_args()
+
+
+def hottest_questions(questions, n: int):
+    stats = load_default_question_stats(BASE_DIR)
+    attempts = dict(zip(stats.ids, stats.counts("player_attempts", GamePhase.CHASE).tolist()))
+
+    # stable sort: questions never asked keep the pool order
+    return sorted(questions, key=lambda q: -attempts.get(q.id, 0))[:n]
+
+
+def main() -> None:
+    args = parse_args()
+
+    bank = load_default_comment_bank(BASE_DIR)
+    if args.output is not None:
+        bank.path = args.output
+    bank.load()
+    existing = bank.items()
+
+    questions = hottest_questions(load_default_question_pool(BASE_DIR), args.top)
+
+    qa = QuestionAnswerer(model=args.model)
+    chasers = [ChaserLogic(model=args.model, persona=persona, qa=qa) for persona in get_all_personas()]
+
+    done = 0
+
+    def progress(key, comment) -> None:
+        nonlocal done
+        done += 1
+        if done % PROGRESS_EVERY == 0:
+            print(f"... {done} comments", file=sys.stderr)
+
+    async def run():
+        try:
+            # batch work: live games served by this process keep the priority
+            with llm_work(priority=PRIORITY_BATCH, flow="comment_bank"):
+                return await agenerate_comments(questions, chasers, existing, args.concurrency, progress)
+        finally:
+            # while the loop the async client used is still running
+            await qa.aclose()
+
+    t0 = time.perf_counter()
+    comments = asyncio.run(run())
+
+    stored = CommentBank.save(bank.path, questions, comments)
+    usage = qa.client.usage
+    print(
+        f"{stored} comments for {len(questions)} questions in {bank.path} "
+        f"({done} generated in {time.perf_counter() - t0:.1f} s, "
+        f"{usage.prompt_tokens} prompt + {usage.completion_tokens} completion tokens)"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+"""
+Load test for the HTTP game API.
+
+- Simulates N concurrent players through complete games
+- Reports throughput, p50/p95/p99 per interaction, error rates and the
+  server's RSS over time, and saves everything as JSON
+
+With --spawn, a stub LLM backend and the API server are started as
+subprocesses first, so the test needs no network or API key:
+
+    python scripts/load_test.py --spawn --players 200 --duration 60 --llm-latency-ms 400 --output plots/load_test.json
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import pathlib
+import subprocess
+import sys
+import time
+
+BASE_DIR = pathlib.Path(__file__).resolve().parents[1]
+if str(BASE_DIR) not in sys.path:
+    sys.path.insert(0, str(BASE_DIR))
+
+import httpx
+
+from src.api.load_test import LoadTestConfig, run_load_test
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Load test the Chaser HTTP game API")
+    parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+    parser.add_argument("--players", type=int, default=50)
+    parser.add_argument("--duration", type=float, default=60.0, help="Seconds to run")
+    parser.add_argument("--think-time-ms", type=float, default=500.0)
+    parser.add_argument("--offer", choices=["low", "mid", "high", "random"], default="random")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--output", type=pathlib.Path, default=None)
+
+    parser.add_argument("--spawn", action="store_true", help="Start a stub LLM and the API server locally")
+    parser.add_argument("--api-port", type=int, default=8000)
+    parser.add_argument("--llm-port", type=int, default=8100)
+    parser.add_argument("--llm-latency-ms", type=float, default=300.0)
+    parser.add_argument("--llm-jitter-ms", type=float, default=100.0)
+    parser.add_argument("--llm-error-rate", type=float, default=0.0)
+
+    return parser.parse_args()
+
+
+def wait_until_ready(url: str, timeout_seconds: float = 30.0) -> None:
+    deadline = time.monotonic() + timeout_seconds
+    while time.monotonic() < deadline:
+        try:
+            if httpx.get(url, timeout=1.0).status_code < 500:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+
+    raise RuntimeError(f"{url} did not become ready in {timeout_seconds}s")
+
+
+def spawn_servers(args: argparse.Namespace) -> list[subprocess.Popen]:
+    stub = subprocess.Popen([
+        sys.executable, str(BASE_DIR / "scripts" / "stub_llm_server.py"),
+        "--port", str(args.llm_port),
+        "--latency-ms", str(args.llm_latency_ms),
+        "--jitter-ms", str(args.llm_jitter_ms),
+        "--error-rate", str(args.llm_error_rate),
+    ])
+
+    env = dict(os.environ)
+    env["OPENAI_BASE_URL"] = f"http://127.0.0.1:{args.llm_port}/v1"
+    env["OPENAI_API_KEY"] = "stub"
+
+    api = subprocess.Popen(
+        [sys.executable, str(BASE_DIR / "run_api.py"), "--port", str(args.api_port)],
+        env=env,
+    )
+
+    wait_until_ready(f"http://127.0.0.1:{args.llm_port}/v1/chat/completions")
+    wait_until_ready(f"http://127.0.0.1:{args.api_port}/health")
+
+    return [stub, api]
+
+
+def main() -> None:
+    args = parse_args()
+
+    processes = []
+    base_url = args.base_url
+    if args.spawn:
+        processes = spawn_servers(args)
+        base_url = f"http://127.0.0.1:{args.api_port}"
+
+    config = LoadTestConfig(
+        base_url=base_url,
+        players=args.players,
+        duration_seconds=args.duration,
+        think_time_ms=args.think_time_ms,
+        offer_choice=args.offer,
+        seed=args.seed,
+    )
+
+    try:
+        report = asyncio.run(run_load_test(config))
+    finally:
+        for p in processes:
+            p.terminate()
+        for p in processes:
+            p.wait(timeout=10)
+
+    if args.spawn:
+        report["stub_llm"] = {
+            "latency_ms": args.llm_latency_ms,
+            "jitter_ms": args.llm_jitter_ms,
+            "error_rate": args.llm_error_rate,
+        }
+
+    text = json.dumps(report, indent=2)
+    print(text)
+
+    if args.output is not None:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(text, encoding="utf-8")
+        print(f"Report saved to {args.output}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
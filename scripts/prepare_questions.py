@@ -2,6 +2,7 @@
 - Read raw CSV paths from data/raw/
 - Call functions from src.utils.prepare_questions
 - Write processed questions to data/processed/
+- Build the question index next to them
 
 """
 
@@ -15,11 +16,13 @@ if str(BASE_DIR) not in sys.path:
 
 
 from src.utils.prepare_questions import (
+    PROCESSED_INDEX_PATH,
     PROCESSED_QUESTIONS_PATH,
     PROCESSED_CLEAN_CSV_PATH,
     load_and_normalize_questions,
     save_questions_to_jsonl
 )
+from src.utils.question_index import QuestionIndex
 
 def main() -> None:
     if not PROCESSED_CLEAN_CSV_PATH.exists():
@@ -32,6 +35,9 @@ def main() -> None:
     print(f"Normalized questions: {len(questions)}")
     save_questions_to_jsonl(questions, PROCESSED_QUESTIONS_PATH)
     print(f"Processed questions saved to {PROCESSED_QUESTIONS_PATH}")
+    index = QuestionIndex.build(questions)
+    index.save(PROCESSED_INDEX_PATH)
+    print(f"Question index ({len(index.terms)} terms) saved to {PROCESSED_INDEX_PATH}")
 
 
 if __name__ == "__main__":
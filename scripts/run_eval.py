@@ -0,0 +1,93 @@
+"""
+Accuracy and latency evaluation of answer models over the question pool.
+
+- Runs several models over the processed pool, or a sample of it
+  stratified by correct option
+- Bounded async concurrency; every answer is checkpointed to JSONL and a
+  rerun resumes where the last one stopped
+- Prints (and optionally saves) a JSON report per model: accuracy,
+  parse-failure rate, tokens and latency percentiles
+
+Example:
+    python scripts/run_eval.py --models gpt-4.1-mini gpt-4.1-nano --sample 500 --seed 1 --concurrency 32
+    # split over 4 processes, then merge the reports
+    python scripts/run_eval.py --models gpt-4.1-mini --num-shards 4 --shard-index 0 --checkpoint data/processed/llm_eval.0.jsonl
+    python scripts/run_eval.py --models gpt-4.1-mini --report data/processed/llm_eval.*.jsonl
+"""
+
+import argparse
+import json
+import pathlib
+import sys
+
+BASE_DIR = pathlib.Path(__file__).resolve().parents[1]
+if str(BASE_DIR) not in sys.path:
+    sys.path.insert(0, str(BASE_DIR))
+
+from src.game.game_runner import load_default_question_pool
+from src.llm.evaluation import EvalConfig, load_checkpoint, run_evaluation, stratified_sample, summarize_eval
+from src.llm.question_answerer import ANSWER_MODE_CONSTRAINED, ANSWER_MODE_DEFAULT, ANSWER_MODE_FREE
+
+CHECKPOINT_PATH_DEFAULT = BASE_DIR / "data" / "processed" / "llm_eval.jsonl"
+PROGRESS_EVERY = 100
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Evaluate answer models on the question pool")
+    parser.add_argument("--models", nargs="+", default=["gpt-4.1-mini"])
+    parser.add_argument("--sample", type=int, default=None, help="Stratified sample size (default: whole pool)")
+    parser.add_argument("--seed", type=int, default=None, help="Seed of the sample")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--answer-mode", choices=[ANSWER_MODE_CONSTRAINED, ANSWER_MODE_FREE], default=ANSWER_MODE_DEFAULT)
+    parser.add_argument("--checkpoint", type=pathlib.Path, default=CHECKPOINT_PATH_DEFAULT)
+    parser.add_argument("--num-shards", type=int, default=1)
+    parser.add_argument("--shard-index", type=int, default=0)
+    parser.add_argument("--report", type=pathlib.Path, nargs="+", default=None,
+                        help="Only summarize these checkpoints (e.g. all shards), no LLM calls")
+    parser.add_argument("--output", type=pathlib.Path, default=None, help="Write the JSON report here")
+
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+
+    if args.report:
+        results = [r for r in load_checkpoint(args.report) if r.model in args.models]
+        report = summarize_eval(results)
+    else:
+        questions = load_default_question_pool(BASE_DIR)
+        if args.sample is not None:
+            questions = stratified_sample(questions, args.sample, seed=args.seed)
+
+        config = EvalConfig(
+            models=args.models,
+            concurrency=args.concurrency,
+            answer_mode=args.answer_mode,
+            checkpoint_path=args.checkpoint,
+            num_shards=args.num_shards,
+            shard_index=args.shard_index,
+        )
+
+        done = 0
+
+        def progress(_) -> None:
+            nonlocal done
+            done += 1
+            if done % PROGRESS_EVERY == 0:
+                print(f"... {done} answers", file=sys.stderr)
+
+        report = run_evaluation(questions, config, on_result=progress)
+        report["sample"] = args.sample
+        report["seed"] = args.seed
+
+    text = json.dumps(report, indent=2)
+    print(text)
+
+    if args.output is not None:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(text, encoding="utf-8")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""
+Headless LLM-vs-LLM (or bot-vs-LLM) tournament.
+
+- Plays complete games through src.game.game_runner without any input()
+- Runs many games concurrently with a bounded number of workers
+- Prints (and optionally saves) a JSON report: games/sec, LLM calls and
+  tokens per game, latency percentiles per phase
+
+Example:
+    python scripts/run_tournament.py --games 500 --concurrency 64 --contestant bot --bot-accuracy 0.7
+"""
+
+import argparse
+import json
+import pathlib
+import sys
+
+BASE_DIR = pathlib.Path(__file__).resolve().parents[1]
+if str(BASE_DIR) not in sys.path:
+    sys.path.insert(0, str(BASE_DIR))
+
+from src.game.game_runner import load_default_draw_index, load_default_question_pool
+from src.game.tournament import TournamentConfig, run_tournament
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Run headless Chaser games and report throughput and latency")
+    parser.add_argument("--games", type=int, default=100)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--seed", type=int, default=None, help="Base seed; game i uses derive_seed(seed, i)")
+    parser.add_argument("--chaser-model", default="gpt-4.1-mini")
+    parser.add_argument("--p-correct", type=float, default=0.75)
+    parser.add_argument("--contestant", choices=["bot", "llm"], default="bot")
+    parser.add_argument("--contestant-model", default="gpt-4.1-mini")
+    parser.add_argument("--bot-accuracy", type=float, default=0.6)
+    parser.add_argument("--offer", choices=["low", "mid", "high", "random"], default="mid")
+    parser.add_argument("--output", type=pathlib.Path, default=None, help="Write the JSON report here")
+
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+
+    questions = load_default_question_pool(BASE_DIR)
+
+    config = TournamentConfig(
+        n_games=args.games,
+        concurrency=args.concurrency,
+        base_seed=args.seed,
+        chaser_model=args.chaser_model,
+        p_correct=args.p_correct,
+        contestant=args.contestant,
+        contestant_model=args.contestant_model,
+        bot_accuracy=args.bot_accuracy,
+        offer_choice=args.offer,
+    )
+
+    done = 0
+
+    def on_result(result) -> None:
+        nonlocal done
+        done += 1
+        if done % max(1, args.games // 20) == 0 or done == args.games:
+            print(f"  {done}/{args.games} games finished", file=sys.stderr)
+
+    report = run_tournament(questions, config, on_result=on_result, question_index=load_default_draw_index(BASE_DIR))
+
+    text = json.dumps(report, indent=2)
+    print(text)
+
+    if args.output is not None:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(text, encoding="utf-8")
+        print(f"Report saved to {args.output}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""
+Look up questions of the processed pool by keyword.
+
+- Loads data/processed/question_chaser.index.npz (built by
+  scripts/prepare_questions.py; rebuilt in memory if missing or stale)
+- Words are ANDed, "OR" separates alternatives, "-word" excludes a word
+- Prints the query time, the number of matches and the first matches
+- `--save` writes the index, e.g. after editing the pool by hand
+
+Example:
+    python scripts/search_questions.py "river OR lake -africa" --limit 10
+"""
+
+import argparse
+import pathlib
+import statistics
+import sys
+import time
+
+BASE_DIR = pathlib.Path(__file__).resolve().parents[1]
+if str(BASE_DIR) not in sys.path:
+    sys.path.insert(0, str(BASE_DIR))
+
+from src.game.game_runner import load_default_question_index
+from src.utils.question_loader import load_questions_from_jsonl
+
+TIMING_RUNS = 100
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Search the question pool by keyword")
+    parser.add_argument("query", nargs="?", default="", help='e.g. "river OR lake -africa"')
+    parser.add_argument("--limit", type=int, default=20, help="Matches to print")
+    parser.add_argument("--save", action="store_true", help="Write the index to data/processed/")
+
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+
+    pool_path = BASE_DIR / "data" / "processed" / "question_chaser.jsonl"
+    questions = load_questions_from_jsonl(pool_path)
+
+    t0 = time.perf_counter()
+    index = load_default_question_index(BASE_DIR, questions)
+    print(f"Index loaded in {(time.perf_counter() - t0) * 1000:.1f} ms: {index.stats()}")
+
+    if args.save:
+        path = BASE_DIR / "data" / "processed" / "question_chaser.index.npz"
+        index.save(path)
+        print(f"Question index saved to {path}")
+
+    if not args.query:
+        return
+
+    timings = []
+    for _ in range(TIMING_RUNS):
+        t0 = time.perf_counter()
+        positions = index.positions(args.query)
+        timings.append(time.perf_counter() - t0)
+
+    print(f"{len(positions)} matches for {args.query!r} in {statistics.median(timings) * 1e6:.1f} us (median)")
+    for i in positions[:args.limit].tolist():
+        q = questions[i]
+        print(f"  {q.id}  {q.question}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,37 @@
+"""
+Serve the stub OpenAI-compatible LLM backend (src/llm/stub_server.py).
+
+Example:
+    python scripts/stub_llm_server.py --port 8100 --latency-ms 400 --jitter-ms 150
+    OPENAI_BASE_URL=http://127.0.0.1:8100/v1 OPENAI_API_KEY=stub python run_api.py
+"""
+
+import argparse
+import pathlib
+import sys
+
+BASE_DIR = pathlib.Path(__file__).resolve().parents[1]
+if str(BASE_DIR) not in sys.path:
+    sys.path.insert(0, str(BASE_DIR))
+
+import uvicorn
+
+from src.llm.stub_server import StubConfig, create_stub_app
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Stub OpenAI chat completions backend with configurable latency")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8100)
+    parser.add_argument("--latency-ms", type=float, default=300.0)
+    parser.add_argument("--jitter-ms", type=float, default=100.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    config = StubConfig(latency_ms=args.latency_ms, jitter_ms=args.jitter_ms, error_rate=args.error_rate)
+    uvicorn.run(create_stub_app(config, seed=args.seed), host=args.host, port=args.port, access_log=False)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,227 @@
+"""
+Load generator for the HTTP game API.
+
+Simulates N concurrent players, each playing complete games in a loop
+(new game -> Cash Builder -> offers -> Chase -> Final Chase) with think time
+between interactions. Records latency and errors per interaction type and
+samples the server's RSS from /stats while the test runs.
+"""
+
+import asyncio
+import random
+import time
+from dataclasses import dataclass, field, asdict
+from typing import Any, Dict, List, Optional
+
+import httpx
+
+from src.utils.latency import latency_percentiles
+
+INTERACTIONS = [
+    "new_game",
+    "cash_builder_answer",
+    "get_offers",
+    "choose_offer",
+    "chase_answer",
+    "final_chase_start",
+    "final_chase_answer",
+    "final_chase_chaser",
+]
+MAX_CHASE_STEPS = 200
+
+
+@dataclass
+class LoadTestConfig:
+    base_url: str = "http://127.0.0.1:8000"
+    players: int = 50
+    duration_seconds: float = 60.0
+    think_time_ms: float = 500.0
+    offer_choice: str = "random"
+    request_timeout_seconds: float = 120.0
+    rss_sample_interval_seconds: float = 1.0
+    seed: Optional[int] = None
+
+
+class InteractionFailed(Exception):
+    pass
+
+
+@dataclass
+class LoadRecorder:
+    latencies: Dict[str, List[float]] = field(default_factory=lambda: {i: [] for i in INTERACTIONS})
+    errors: Dict[str, int] = field(default_factory=lambda: {i: 0 for i in INTERACTIONS})
+    error_samples: List[str] = field(default_factory=list)
+    rss_samples: List[Dict[str, float]] = field(default_factory=list)
+    games_started: int = 0
+    games_completed: int = 0
+
+    def record_error(self, interaction: str, message: str) -> None:
+        self.errors[interaction] += 1
+        if len(self.error_samples) < 20:
+            self.error_samples.append(f"{interaction}: {message}")
+
+
+class SimulatedPlayer:
+    def __init__(self, client: httpx.AsyncClient, config: LoadTestConfig, recorder: LoadRecorder, rng: random.Random):
+        self.client = client
+        self.config = config
+        self.recorder = recorder
+        self.rng = rng
+
+    async def think(self) -> None:
+        if self.config.think_time_ms > 0:
+            await asyncio.sleep(self.rng.expovariate(1000.0 / self.config.think_time_ms))
+
+    async def call(self, interaction: str, method: str, path: str, body: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        t0 = time.perf_counter()
+        try:
+            response = await self.client.request(method, path, json=body)
+        except httpx.HTTPError as e:
+            self.recorder.record_error(interaction, f"{type(e).__name__}: {e}")
+            raise InteractionFailed(interaction)
+
+        elapsed = time.perf_counter() - t0
+
+        if response.status_code >= 400:
+            self.recorder.record_error(interaction, f"HTTP {response.status_code}: {response.text[:200]}")
+            raise InteractionFailed(interaction)
+
+        self.recorder.latencies[interaction].append(elapsed)
+
+        return response.json()
+
+    def pick_answer(self) -> str:
+        return self.rng.choice(["A", "B", "C", "D"])
+
+    async def play_game(self) -> None:
+        self.recorder.games_started += 1
+
+        r = await self.call("new_game", "POST", "/games", {})
+        session_id = r["session_id"]
+        base = f"/games/{session_id}"
+
+        try:
+            while r.get("question") and r["state"]["phase"] == "CASH_BUILDER":
+                await self.think()
+                r = await self.call("cash_builder_answer", "POST", f"{base}/cash-builder/answer", {"answer": self.pick_answer()})
+
+            await self.think()
+            await self.call("get_offers", "GET", f"{base}/offers")
+
+            choice = self.config.offer_choice
+            if choice == "random":
+                choice = self.rng.choice(["low", "mid", "high"])
+
+            await self.think()
+            r = await self.call("choose_offer", "POST", f"{base}/offers/choose", {"choice": choice})
+
+            steps = 0
+            while r["state"]["phase"] == "CHASE" and steps < MAX_CHASE_STEPS:
+                await self.think()
+                r = await self.call("chase_answer", "POST", f"{base}/chase/answer", {"answer": self.pick_answer()})
+                steps += 1
+
+            if r["state"]["phase"] == "FINAL_CHASE":
+                await self.think()
+                r = await self.call("final_chase_start", "POST", f"{base}/final-chase/start")
+
+                while r.get("question"):
+                    await self.think()
+                    r = await self.call("final_chase_answer", "POST", f"{base}/final-chase/answer", {"answer": self.pick_answer()})
+
+                await self.call("final_chase_chaser", "POST", f"{base}/final-chase/chaser")
+
+            self.recorder.games_completed += 1
+
+        finally:
+            try:
+                await self.client.delete(base)
+            except httpx.HTTPError:
+                pass
+
+    async def run_until(self, deadline: float) -> None:
+        while time.monotonic() < deadline:
+            try:
+                await self.play_game()
+            except InteractionFailed:
+                await asyncio.sleep(0.1)
+
+
+async def sample_server_rss(client: httpx.AsyncClient, config: LoadTestConfig, recorder: LoadRecorder, t_start: float, deadline: float) -> None:
+    while time.monotonic() < deadline:
+        try:
+            response = await client.get("/stats")
+            if response.status_code == 200:
+                stats = response.json()
+                recorder.rss_samples.append({
+                    "t": round(time.monotonic() - t_start, 2),
+                    "rss_bytes": stats.get("process_rss_bytes", 0),
+                    "live_sessions": stats.get("live_sessions", 0),
+                })
+        except httpx.HTTPError:
+            pass
+
+        await asyncio.sleep(config.rss_sample_interval_seconds)
+
+
+async def run_load_test(config: LoadTestConfig) -> Dict[str, Any]:
+    recorder = LoadRecorder()
+    base_rng = random.Random(config.seed)
+
+    limits = httpx.Limits(max_connections=config.players + 1, max_keepalive_connections=config.players + 1)
+    timeout = httpx.Timeout(config.request_timeout_seconds)
+
+    async with httpx.AsyncClient(base_url=config.base_url, limits=limits, timeout=timeout) as client:
+        t_start = time.monotonic()
+        deadline = t_start + config.duration_seconds
+
+        players = [
+            SimulatedPlayer(client, config, recorder, random.Random(base_rng.getrandbits(64)))
+            for _ in range(config.players)
+        ]
+
+        await asyncio.gather(
+            sample_server_rss(client, config, recorder, t_start, deadline),
+            *(player.run_until(deadline) for player in players),
+        )
+
+        wall_seconds = time.monotonic() - t_start
+
+    return build_report(config, recorder, wall_seconds)
+
+
+def build_report(config: LoadTestConfig, recorder: LoadRecorder, wall_seconds: float) -> Dict[str, Any]:
+    total_requests = sum(len(v) for v in recorder.latencies.values()) + sum(recorder.errors.values())
+    total_errors = sum(recorder.errors.values())
+
+    interactions = {}
+    for name in INTERACTIONS:
+        ok = len(recorder.latencies[name])
+        errors = recorder.errors[name]
+        if ok + errors == 0:
+            continue
+        interactions[name] = {
+            **latency_percentiles(recorder.latencies[name]),
+            "errors": errors,
+            "error_rate": round(errors / (ok + errors), 4),
+        }
+
+    rss_values = [s["rss_bytes"] for s in recorder.rss_samples]
+
+    return {
+        "config": asdict(config),
+        "wall_seconds": round(wall_seconds, 3),
+        "games_started": recorder.games_started,
+        "games_completed": recorder.games_completed,
+        "games_per_sec": round(recorder.games_completed / wall_seconds, 3) if wall_seconds > 0 else 0.0,
+        "requests": total_requests,
+        "requests_per_sec": round(total_requests / wall_seconds, 3) if wall_seconds > 0 else 0.0,
+        "error_rate": round(total_errors / total_requests, 4) if total_requests else 0.0,
+        "interactions": interactions,
+        "rss": {
+            "max_bytes": max(rss_values) if rss_values else None,
+            "last_bytes": rss_values[-1] if rss_values else None,
+            "samples": recorder.rss_samples,
+        },
+        "error_samples": recorder.error_samples,
+    }
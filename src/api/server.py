@@ -0,0 +1,425 @@
+"""
+Headless JSON/HTTP API for the game.
+
+Exposes the game_runner operations over plain HTTP with session ids, so
+non-browser clients and load generators can drive games without Gradio.
+Built on Starlette and served by uvicorn (HTTP/1.1 keep-alive).
+
+    POST   /games                            start a game        {"seed": int?}
+    GET    /games/{id}                       game snapshot
+    DELETE /games/{id}                       end a game
+    POST   /games/{id}/cash-builder/answer   {"answer": "A".."D"}
+    GET    /games/{id}/offers                offers for the Chase
+    POST   /games/{id}/offers/choose         {"choice": "low"|"mid"|"high"}
+    POST   /games/{id}/chase/answer          {"answer": "A".."D"}
+    POST   /games/{id}/final-chase/start
+    POST   /games/{id}/final-chase/answer    {"answer": "A".."D"}
+    POST   /games/{id}/final-chase/chaser    chaser round (?stream=1 for NDJSON progress)
+    GET    /health, GET /stats, GET /metrics (Prometheus text format)
+    GET    /llm-telemetry                    LLM calls per model, persona and call type, model routing, scheduling
+"""
+
+import asyncio
+import contextlib
+import json
+import pathlib
+from typing import TYPE_CHECKING, Any, AsyncIterator, Dict, List, Optional
+
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse, Response, StreamingResponse
+from starlette.routing import Route
+
+from src.utils.data_models import Question
+from src.utils.tracing import REGISTRY, PROMETHEUS_CONTENT_TYPE
+from src.llm.telemetry import TELEMETRY
+from src.llm.router import ROUTER
+from src.llm.scheduler import SCHEDULER, llm_work
+from src.game.state import GameState, GamePhase
+from src.game.chaser_logic import ChaserLogic, ChaserAnswer
+from src.game.chaser_pool import ChaserPool
+from src.game.degraded import DEGRADED
+from src.game.session_manager import GameSession, SessionManager
+from src.game.game_runner import (
+    load_default_comment_bank,
+    load_default_question_pool,
+    load_default_draw_index,
+    initialize_game_from_pool,
+    get_cash_builder_question,
+    advence_cash_builder,
+    prepare_chase_offers,
+    choose_chase_offer,
+    get_next_chase_question_for_state,
+    arun_chase_step_with_chaser,
+    start_final_chase_default,
+    advence_final_chase_player,
+    get_final_chase_player_question,
+    arun_final_chase_chaser_round
+)
+
+if TYPE_CHECKING:
+    from src.game.question_stats import QuestionStats
+
+VALID_ANSWERS = ["A", "B", "C", "D"]
+
+
+class ApiError(Exception):
+    def __init__(self, status_code: int, message: str):
+        super().__init__(message)
+        self.status_code = status_code
+        self.message = message
+
+
+# ---------- serialization ----------
+
+
+def question_to_dict(q: Optional[Question]) -> Optional[Dict[str, Any]]:
+    """
+    Public view of a question: never includes the correct option.
+    """
+    if q is None:
+        return None
+
+    return {"id": q.id, "question": q.question, "options": q.options}
+
+
+def chaser_answer_to_dict(answer: ChaserAnswer) -> Dict[str, Any]:
+    return {"chosen_option": answer.chosen_option, "is_correct": answer.is_correct, "degraded": answer.degraded_reason}
+
+
+def state_to_dict(state: GameState) -> Dict[str, Any]:
+    return {
+        "phase": state.phase.name,
+        "persona": state.persona.name if state.persona else None,
+        "seed": state.rng.seed,
+        "player": {
+            "secured_cash": state.player.secured_cash,
+            "correct_answers": state.player.correct_answers,
+            "board_position": state.player.board_position,
+            "final_chase_score": state.player.final_chase_score,
+        },
+        "chaser": {
+            "board_position": state.chaser.board_position,
+            "final_chase_score": state.chaser.final_chase_score,
+        },
+        "outcome_message": state.outcome_message,
+    }
+
+
+def offers_to_dict(state: GameState) -> Dict[str, Any]:
+    o = state.offers
+    return {
+        "low": {"money": o.low_offer_money, "start_pos": o.low_start_pos},
+        "mid": {"money": o.mid_offer_money, "start_pos": o.mid_start_pos},
+        "high": {"money": o.high_offer_money, "start_pos": o.high_start_pos},
+        "chosen_money": o.chosen_offer_money,
+    }
+
+
+# ---------- helpers ----------
+
+
+async def read_json(request: Request) -> Dict[str, Any]:
+    body = await request.body()
+    if not body:
+        return {}
+
+    try:
+        data = json.loads(body)
+    except json.JSONDecodeError:
+        raise ApiError(400, "Request body is not valid JSON")
+
+    if not isinstance(data, dict):
+        raise ApiError(400, "Request body must be a JSON object")
+
+    return data
+
+
+def read_answer(data: Dict[str, Any]) -> str:
+    answer = str(data.get("answer", "")).strip().upper()
+    if answer not in VALID_ANSWERS:
+        raise ApiError(400, "answer must be one of A, B, C, D")
+
+    return answer
+
+
+def require_phase(state: GameState, phase: GamePhase) -> None:
+    if state.phase != phase:
+        raise ApiError(409, f"Game is in phase {state.phase.name}, expected {phase.name}")
+
+
+def offers_generated(state: GameState) -> bool:
+    return state.offers.mid_offer_money > 0
+
+
+def create_api(
+    root_dir: pathlib.Path,
+    sessions: SessionManager | None = None,
+    question_stats: "QuestionStats | None" = None,
+    questions: List[Question] | None = None,
+    chaser_pool: ChaserPool | None = None,
+) -> Starlette:
+    """
+    Create the Starlette app. The question pool and the chasers are built
+    once and shared by every game started through the API.
+    """
+    if sessions is None:
+        sessions = SessionManager()
+    sessions.start_sweeper()
+
+    if chaser_pool is None:
+        chaser_pool = ChaserPool(comment_bank=load_default_comment_bank(root_dir))
+    chaser_pool.start_warmup()
+
+    if questions is None:
+        questions = load_default_question_pool(root_dir)
+    question_index = load_default_draw_index(root_dir)
+
+    def get_session(request: Request) -> GameSession:
+        session = sessions.get(request.path_params["session_id"])
+        if session is None:
+            raise ApiError(404, "Unknown or expired session")
+
+        return session
+
+    # ---------- endpoints ----------
+
+    async def health(request: Request) -> Response:
+        return JSONResponse({"status": "ok"})
+
+    def comment_bank_stats() -> Dict[str, int]:
+        bank = chaser_pool.comment_bank
+        return bank.stats() if bank is not None else {}
+
+    async def stats(request: Request) -> Response:
+        return JSONResponse({**sessions.stats(), **comment_bank_stats(), "chase_mode": DEGRADED.snapshot()})
+
+    async def metrics(request: Request) -> Response:
+        bank = {f"chaser_{name}": value for name, value in comment_bank_stats().items()}
+        body = REGISTRY.render_prometheus({**sessions.metrics(), **bank, **DEGRADED.metrics(), **ROUTER.metrics(), **SCHEDULER.metrics(), **TELEMETRY.metrics()})
+        return Response(body, headers={"Content-Type": PROMETHEUS_CONTENT_TYPE})
+
+    async def llm_telemetry(request: Request) -> Response:
+        return JSONResponse({**TELEMETRY.snapshot(), "routing": ROUTER.snapshot(), "scheduling": SCHEDULER.snapshot()})
+
+    async def new_game(request: Request) -> Response:
+        data = await read_json(request)
+        seed = data.get("seed")
+        if seed is not None and not isinstance(seed, int):
+            raise ApiError(400, "seed must be an integer")
+
+        def build() -> tuple[GameState, ChaserLogic]:
+            state = initialize_game_from_pool(questions, seed=seed, stats=question_stats, question_index=question_index)
+            # blocks only if warm-up has not built this chaser yet
+            return state, chaser_pool.get(state.persona)
+
+        state, chaser = await asyncio.to_thread(build)
+        session = sessions.create(state, chaser, owns_chaser=False)
+
+        return JSONResponse({
+            "session_id": session.session_id,
+            "state": state_to_dict(state),
+            "question": question_to_dict(get_cash_builder_question(state)),
+        }, status_code=201)
+
+    async def get_game(request: Request) -> Response:
+        session = get_session(request)
+        return JSONResponse({"state": state_to_dict(session.state)})
+
+    async def delete_game(request: Request) -> Response:
+        sessions.remove(request.path_params["session_id"])
+        return Response(status_code=204)
+
+    async def cash_builder_answer(request: Request) -> Response:
+        session = get_session(request)
+        answer = read_answer(await read_json(request))
+
+        async with session.lock:
+            state = session.state
+            require_phase(state, GamePhase.CASH_BUILDER)
+
+            before = state.player.correct_answers
+            state = advence_cash_builder(state, answer)
+
+            return JSONResponse({
+                "correct": state.player.correct_answers > before,
+                "state": state_to_dict(state),
+                "question": question_to_dict(get_cash_builder_question(state)),
+            })
+
+    async def get_offers(request: Request) -> Response:
+        session = get_session(request)
+
+        async with session.lock:
+            state = session.state
+            require_phase(state, GamePhase.CHASE)
+
+            # generated once, so the offers shown are the offers applied
+            if not offers_generated(state):
+                state.offers = prepare_chase_offers(state)
+
+            return JSONResponse({"offers": offers_to_dict(state)})
+
+    async def choose_offer(request: Request) -> Response:
+        session = get_session(request)
+        data = await read_json(request)
+        choice = str(data.get("choice", "")).strip().lower()
+        if choice not in ["low", "mid", "high"]:
+            raise ApiError(400, "choice must be one of low, mid, high")
+
+        async with session.lock:
+            state = session.state
+            require_phase(state, GamePhase.CHASE)
+            if state.offers.chosen_offer_money is not None:
+                raise ApiError(409, "An offer has already been chosen")
+
+            if not offers_generated(state):
+                state.offers = prepare_chase_offers(state)
+
+            state = choose_chase_offer(state, state.offers, choice)
+            q = get_next_chase_question_for_state(state)
+
+            return JSONResponse({
+                "state": state_to_dict(state),
+                "offers": offers_to_dict(state),
+                "question": question_to_dict(q),
+            })
+
+    async def chase_answer(request: Request) -> Response:
+        session = get_session(request)
+        answer = read_answer(await read_json(request))
+
+        async with session.lock:
+            state = session.state
+            require_phase(state, GamePhase.CHASE)
+            if state.offers.chosen_offer_money is None:
+                raise ApiError(409, "Choose an offer first")
+
+            if state.current_question is None:
+                get_next_chase_question_for_state(state)
+
+            q = state.current_question
+            with llm_work(flow=session.session_id):
+                state, chaser_answer, comment = await arun_chase_step_with_chaser(state, answer, session.chaser)
+
+            next_q = get_next_chase_question_for_state(state) if state.phase == GamePhase.CHASE else None
+
+            return JSONResponse({
+                "player_correct": answer == q.correct_option,
+                "correct_option": q.correct_option,
+                "chaser": chaser_answer_to_dict(chaser_answer),
+                "comment": comment,
+                "state": state_to_dict(state),
+                "question": question_to_dict(next_q),
+            })
+
+    async def final_chase_start(request: Request) -> Response:
+        session = get_session(request)
+
+        async with session.lock:
+            state = session.state
+            require_phase(state, GamePhase.FINAL_CHASE)
+            if state.final_chase.player_questions:
+                raise ApiError(409, "Final chase has already been started")
+
+            state = start_final_chase_default(state)
+
+            return JSONResponse({
+                "state": state_to_dict(state),
+                "question": question_to_dict(get_final_chase_player_question(state)),
+            })
+
+    async def final_chase_answer(request: Request) -> Response:
+        session = get_session(request)
+        answer = read_answer(await read_json(request))
+
+        async with session.lock:
+            state = session.state
+            require_phase(state, GamePhase.FINAL_CHASE)
+            if get_final_chase_player_question(state) is None:
+                raise ApiError(409, "No final chase question left for the player")
+
+            before = state.player.final_chase_score
+            state = advence_final_chase_player(state, answer)
+
+            return JSONResponse({
+                "correct": state.player.final_chase_score > before,
+                "state": state_to_dict(state),
+                "question": question_to_dict(get_final_chase_player_question(state)),
+            })
+
+    def check_chaser_round(state: GameState) -> None:
+        require_phase(state, GamePhase.FINAL_CHASE)
+        if not state.final_chase.chaser_questions:
+            raise ApiError(409, "Final chase has not been started")
+        if get_final_chase_player_question(state) is not None:
+            raise ApiError(409, "Player has not finished the final chase yet")
+
+    async def final_chase_chaser(request: Request) -> Response:
+        session = get_session(request)
+        stream = request.query_params.get("stream") in ["1", "true"]
+
+        check_chaser_round(session.state)
+
+        async def progress():
+            # the lock is taken inside the generator so an unconsumed stream never holds it
+            async with session.lock:
+                check_chaser_round(session.state)
+
+                rounds = arun_final_chase_chaser_round(session.state, session.chaser, flow=session.session_id)
+                async for state, idx, chaser_answer in rounds:
+                    yield {
+                        "index": idx,
+                        "chaser": chaser_answer_to_dict(chaser_answer),
+                        "chaser_score": state.chaser.final_chase_score,
+                        "answered": state.final_chase.chaser_current_index,
+                    }
+
+        if stream:
+            async def ndjson():
+                try:
+                    async for event in progress():
+                        yield json.dumps(event) + "\n"
+                except ApiError as e:
+                    yield json.dumps({"error": e.message}) + "\n"
+                    return
+                yield json.dumps({"state": state_to_dict(session.state)}) + "\n"
+
+            return StreamingResponse(ndjson(), media_type="application/x-ndjson")
+
+        answers = [event async for event in progress()]
+
+        return JSONResponse({"answers": answers, "state": state_to_dict(session.state)})
+
+    async def api_error(request: Request, exc: ApiError) -> Response:
+        return JSONResponse({"error": exc.message}, status_code=exc.status_code)
+
+    routes = [
+        Route("/health", health, methods=["GET"]),
+        Route("/stats", stats, methods=["GET"]),
+        Route("/metrics", metrics, methods=["GET"]),
+        Route("/llm-telemetry", llm_telemetry, methods=["GET"]),
+        Route("/games", new_game, methods=["POST"]),
+        Route("/games/{session_id}", get_game, methods=["GET"]),
+        Route("/games/{session_id}", delete_game, methods=["DELETE"]),
+        Route("/games/{session_id}/cash-builder/answer", cash_builder_answer, methods=["POST"]),
+        Route("/games/{session_id}/offers", get_offers, methods=["GET"]),
+        Route("/games/{session_id}/offers/choose", choose_offer, methods=["POST"]),
+        Route("/games/{session_id}/chase/answer", chase_answer, methods=["POST"]),
+        Route("/games/{session_id}/final-chase/start", final_chase_start, methods=["POST"]),
+        Route("/games/{session_id}/final-chase/answer", final_chase_answer, methods=["POST"]),
+        Route("/games/{session_id}/final-chase/chaser", final_chase_chaser, methods=["POST"]),
+    ]
+
+    @contextlib.asynccontextmanager
+    async def lifespan(app: Starlette) -> AsyncIterator[None]:
+        yield
+        sessions.stop_sweeper()
+        # the LLM clients' connections belong to this loop: close them on it
+        await chaser_pool.aclose()
+        # on graceful shutdown, write what the periodic flushes have not yet
+        if question_stats is not None:
+            question_stats.stop_flusher()
+        TELEMETRY.stop_dumper()
+
+    return Starlette(routes=routes, exception_handlers={ApiError: api_error}, lifespan=lifespan)
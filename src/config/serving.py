@@ -0,0 +1,39 @@
+"""
+Queue and concurrency settings for serving the Gradio app.
+
+LLM-bound events are async and mostly wait on the network, so they get a
+high concurrency limit of their own; cheap, CPU-only events share a small
+worker pool. Every value can be overridden with an environment variable.
+"""
+
+import os
+
+
+def _env_int(name: str, default: int) -> int:
+    value = os.getenv(name)
+    return int(value) if value else default
+
+
+# simultaneous LLM-bound events (chase step, chaser final chase) per process
+LLM_EVENT_CONCURRENCY = _env_int("CHASER_LLM_EVENT_CONCURRENCY", 256)
+
+# simultaneous cheap events (cash builder answer, offers, final chase answers)
+FAST_EVENT_CONCURRENCY = _env_int("CHASER_FAST_EVENT_CONCURRENCY", 32)
+
+# simultaneous new-game events (disk load of the question pool)
+NEW_GAME_CONCURRENCY = _env_int("CHASER_NEW_GAME_CONCURRENCY", 8)
+
+# requests waiting in the queue before new ones are rejected
+QUEUE_MAX_SIZE = _env_int("CHASER_QUEUE_MAX_SIZE", 2048)
+
+# worker threads for the remaining sync callbacks
+MAX_THREADS = _env_int("CHASER_MAX_THREADS", 64)
+
+# local port of the Prometheus /metrics endpoint of the Gradio app (0 disables it)
+METRICS_PORT = _env_int("CHASER_METRICS_PORT", 9464)
+
+# processes serving the app, forked after the question pool is loaded (1: no fork)
+WORKERS = _env_int("CHASER_WORKERS", 1)
+
+# port of the first worker; worker i listens on GRADIO_PORT + i
+GRADIO_PORT = _env_int("GRADIO_SERVER_PORT", 7860)
@@ -1,10 +1,24 @@
+import asyncio
+import contextvars
 import random
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from dataclasses import dataclass
-from typing import Tuple
+from typing import TYPE_CHECKING, AsyncIterator, Dict, Iterator, List, Optional, Tuple
 
 from src.utils.data_models import Question
-from src.llm.question_answerer import QuestionAnswerer
+from src.utils.tracing import traced
+from src.llm.question_answerer import AnswerResult, QuestionAnswerer
 from src.llm.personas import ChaserPersona, PROFESSOR
+from src.llm.scheduler import llm_work
+from src.llm.telemetry import CALL_TYPE_ANSWER, CALL_TYPE_COMMENT, CALL_TYPE_FINAL_CHASE
+from src.game.comment_templates import template_comment
+from src.game.degraded import DEGRADED, DEGRADED_REASON_BUDGET, DEGRADED_REASON_ERROR, DegradedMode
+
+if TYPE_CHECKING:
+    from .comment_bank import CommentBank
+
+FINAL_CHASE_MAX_WORKERS = 10
 
 @dataclass
 class ChaserAnswer:
@@ -12,37 +26,240 @@ class ChaserAnswer:
     is_correct: bool
     raw_llm_response: str
     natural_llm_choice: str
+    # per-option log-probabilities of the LLM's own answer, when available
+    option_logprobs: Optional[Dict[str, float]] = None
+    # why the step did without (part of) the LLM, see degraded.py; the
+    # natural choice stays empty when the answer call was skipped
+    degraded_reason: Optional[str] = None
 
 
 class ChaserLogic:
-    def __init__(self, model: str = "gpt-4.1-mini", p_correct: float = 0.75, persona: ChaserPersona | None = None):
-        self.qa = QuestionAnswerer(model = model)
+    def __init__(
+            self,
+            model: str = "gpt-4.1-mini",
+            p_correct: float = 0.75,
+            persona: ChaserPersona | None = None,
+            seed: Optional[int] = None,
+            qa: Optional[QuestionAnswerer] = None,
+            comment_bank: Optional["CommentBank"] = None,
+            degraded: Optional[DegradedMode] = None
+    ):
+        # a ChaserPool passes one answerer (and LLM client) shared by all its chasers
+        self.qa = qa or QuestionAnswerer(model = model)
+        # precomputed comments, served instead of an LLM call when present
+        self.comment_bank = comment_bank
+        # latency budget, circuit breaker and load shedding of chase steps
+        self.degraded = degraded or DEGRADED
         self.p_correct = p_correct
         self.persona = persona or PROFESSOR
+        # used only when the caller does not pass the game's own rng
+        self.rng = random.Random(seed)
+
+    def close(self) -> None:
+        self.qa.close()
+
+    async def aclose(self) -> None:
+        await self.qa.aclose()
+
+    @traced("chaser.answer_in_chase")
+    def answer_in_chase(self, question: Question, rng: Optional[random.Random] = None) -> ChaserAnswer:
+        force_correct, wrong_pick = self.draw_error_model(rng or self.rng)
+
+        return self._answer_with_error_model(question, force_correct, wrong_pick)
+
+    @traced("chaser.answer_and_comment")
+    def answer_and_comment(
+            self,
+            question: Question,
+            player_answer_option: str,
+            rng: Optional[random.Random] = None
+    ) -> Tuple[ChaserAnswer, str]:
+        """
+        Answer a chase question and comment on it, in degraded mode when the
+        LLM is shed, broken or over the step budget (see degraded.py).
+
+        A call in flight cannot be interrupted here: the budget is checked
+        after the answer, and a late answer is kept but the comment then
+        comes from a template.
+        """
+        chaser_answer, player_answer_option, player_correct = self._draw_chase_answer(question, player_answer_option, rng)
+        banked = self._banked_comment(question, chaser_answer, player_answer_option)
+
+        with self.degraded.step() as skip_reason:
+            if skip_reason is not None:
+                return self._degraded_step(question, chaser_answer, player_correct, banked, skip_reason)
+
+            budget = self.degraded.budget()
+            t0 = time.perf_counter()
+            try:
+                result = self.qa.answer_question_detailed(question, persona=self.persona.key)
+            except Exception:
+                if not self.degraded.enabled:
+                    raise
+                self.degraded.record_call(False)
+                return self._degraded_step(question, chaser_answer, player_correct, banked, DEGRADED_REASON_ERROR)
+
+            self._fill_llm_answer(chaser_answer, result)
+            over_budget = budget is not None and time.perf_counter() - t0 > budget
+            self.degraded.record_call(not over_budget)
+
+            if over_budget:
+                return self._degraded_step(question, chaser_answer, player_correct, banked, DEGRADED_REASON_BUDGET)
+            if banked is not None:
+                return chaser_answer, banked
+
+            try:
+                comment = self._comment_with_llm(question, player_correct, chaser_answer, player_answer_option)
+            except Exception:
+                if not self.degraded.enabled:
+                    raise
+                self.degraded.record_call(False)
+                return self._degraded_step(question, chaser_answer, player_correct, None, DEGRADED_REASON_ERROR)
+
+            self.degraded.record_call(budget is None or time.perf_counter() - t0 <= budget)
+            return chaser_answer, comment
+
+    def answer_final_chase(
+            self,
+            questions: List[Question],
+            rng: Optional[random.Random] = None
+    ) -> Iterator[Tuple[int, ChaserAnswer]]:
+        """
+        Answer all Final Chase questions concurrently.
+
+        Error-model draws happen up front in the calling thread, then the LLM
+        calls run in parallel. Yields (question_index, answer) pairs in the
+        order the answers arrive, so the round takes roughly one LLM latency.
+        A question whose LLM call fails keeps its error-model answer (see
+        _failed_final_chase_answer()) instead of ending the round.
+        """
+        if not questions:
+            return
+
+        rng = rng or self.rng
+        draws = [self.draw_error_model(rng) for _ in questions]
+        max_workers = min(len(questions), FINAL_CHASE_MAX_WORKERS)
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            # each call runs in a copy of the caller's context, so it keeps
+            # its scheduler flow and is counted by the caller's collect_usage()
+            futures = {
+                executor.submit(contextvars.copy_context().run, self._final_chase_answer, q, force_correct, wrong_pick): i
+                for i, (q, (force_correct, wrong_pick)) in enumerate(zip(questions, draws))
+            }
+
+            for future in as_completed(futures):
+                yield futures[future], future.result()
+
+    def draw_error_model(self, rng: random.Random) -> Tuple[bool, float]:
+        """
+        Draw the error model for one question: whether the chaser is forced
+        to be correct, and a uniform number used to pick the wrong option.
+        Drawing is kept apart from the LLM call so the rng is only ever
+        touched by the caller's thread, in a fixed order.
+        """
+        return rng.random() < self.p_correct, rng.random()
+
+    def _draw_chase_answer(
+            self,
+            question: Question,
+            player_answer_option: str,
+            rng: Optional[random.Random]
+    ) -> Tuple[ChaserAnswer, str, bool]:
+        """
+        Error-model answer of a chase step, before any LLM call, with the
+        normalized player option and whether the player was right.
+        """
+        force_correct, wrong_pick = self.draw_error_model(rng or self.rng)
+        chosen_option, is_correct = apply_error_model(question, force_correct, wrong_pick)
 
-    def answer_in_chase(self, question: Question) -> ChaserAnswer:
-        llm_choice, raw = self.qa.answer_question(question)
-        llm_choice = llm_choice.upper()
+        player_answer_option = player_answer_option.strip().upper()
+        player_correct = (player_answer_option == question.correct_option)
 
-        force_correct = random.random() < self.p_correct
+        chaser_answer = ChaserAnswer(
+            chosen_option=chosen_option,
+            is_correct=is_correct,
+            raw_llm_response="",
+            natural_llm_choice=""
+        )
+        return chaser_answer, player_answer_option, player_correct
+
+    @staticmethod
+    def _fill_llm_answer(chaser_answer: ChaserAnswer, result: AnswerResult) -> None:
+        chaser_answer.raw_llm_response = result.raw
+        chaser_answer.natural_llm_choice = result.choice.upper()
+        chaser_answer.option_logprobs = result.option_logprobs
+
+    def _degraded_step(
+            self,
+            question: Question,
+            chaser_answer: ChaserAnswer,
+            player_correct: bool,
+            comment: Optional[str],
+            reason: str
+    ) -> Tuple[ChaserAnswer, str]:
+        """
+        Finish a step without (the rest of) the LLM: the answer keeps what
+        it has, the comment is the banked one or a persona template.
+        """
+        chaser_answer.degraded_reason = reason
+        self.degraded.record_degraded(reason)
+
+        if comment is None:
+            comment = template_comment(question, self.persona.key, player_correct, chaser_answer.is_correct)
+        return chaser_answer, comment
 
-        if force_correct:
-            chosen_option = question.correct_option
-            is_correct = True
+    def _final_chase_answer(self, question: Question, force_correct: bool, wrong_pick: float) -> ChaserAnswer:
+        try:
+            return self._answer_with_error_model(question, force_correct, wrong_pick, CALL_TYPE_FINAL_CHASE)
+        except Exception:
+            return self._failed_final_chase_answer(question, force_correct, wrong_pick)
 
-        else:
-            wrong_options = [opt for opt in ["A", "B", "C", "D"] if opt != question.correct_option]
-            chosen_option = random.choice(wrong_options)
-            is_correct = False
+    def _failed_final_chase_answer(self, question: Question, force_correct: bool, wrong_pick: float) -> ChaserAnswer:
+        """
+        Answer of a Final Chase question whose LLM call failed. The error
+        model alone decides the outcome, so the round goes on; the empty
+        natural choice keeps the question out of the LLM accuracy stats.
+        """
+        chosen_option, is_correct = apply_error_model(question, force_correct, wrong_pick)
+        self.degraded.record_degraded(DEGRADED_REASON_ERROR)
 
         return ChaserAnswer(
             chosen_option=chosen_option,
             is_correct=is_correct,
-            raw_llm_response=raw,
-            natural_llm_choice=llm_choice
+            raw_llm_response="",
+            natural_llm_choice="",
+            degraded_reason=DEGRADED_REASON_ERROR
+        )
+
+    def _answer_with_error_model(
+            self,
+            question: Question,
+            force_correct: bool,
+            wrong_pick: float,
+            call_type: str = CALL_TYPE_ANSWER
+    ) -> ChaserAnswer:
+        result = self.qa.answer_question_detailed(question, call_type=call_type, persona=self.persona.key)
+
+        chosen_option, is_correct = apply_error_model(question, force_correct, wrong_pick)
+
+        return ChaserAnswer(
+            chosen_option=chosen_option,
+            is_correct=is_correct,
+            raw_llm_response=result.raw,
+            natural_llm_choice=result.choice.upper(),
+            option_logprobs=result.option_logprobs
         )
     
+    @traced("chaser.generate_comment")
     def generate_comment(self, question: Question, player_correct: bool, chaser_answer: ChaserAnswer, player_answer_option: str) -> str:
+        banked = self._banked_comment(question, chaser_answer, player_answer_option)
+        if banked is not None:
+            return banked
+
+        return self._comment_with_llm(question, player_correct, chaser_answer, player_answer_option)
+
+    def _comment_with_llm(self, question: Question, player_correct: bool, chaser_answer: ChaserAnswer, player_answer_option: str) -> str:
         system_prompt, user_prompt = build_comment_prompts(
             question=question,
             correct_option=question.correct_option,
@@ -52,11 +269,183 @@ class ChaserLogic:
             player_answer_option=player_answer_option
         )
 
-        raw = self.qa.client.chat(system_prompt=system_prompt, user_prompt=user_prompt)
+        raw = self.qa.client.chat(
+            system_prompt=system_prompt,
+            user_prompt=user_prompt,
+            call_type=CALL_TYPE_COMMENT,
+            persona=self.persona.key
+        )
 
         return raw.strip() or "..."
-    
 
+    def _banked_comment(self, question: Question, chaser_answer: ChaserAnswer, player_answer_option: str) -> Optional[str]:
+        if self.comment_bank is None:
+            return None
+
+        return self.comment_bank.get(question, self.persona.key, player_answer_option, chaser_answer.is_correct)
+
+    # ---------- async versions ----------
+
+    @traced("chaser.aanswer_in_chase")
+    async def aanswer_in_chase(self, question: Question, rng: Optional[random.Random] = None) -> ChaserAnswer:
+        force_correct, wrong_pick = self.draw_error_model(rng or self.rng)
+
+        return await self._aanswer_with_error_model(question, force_correct, wrong_pick)
+
+    @traced("chaser.aanswer_and_comment")
+    async def aanswer_and_comment(
+            self,
+            question: Question,
+            player_answer_option: str,
+            rng: Optional[random.Random] = None
+    ) -> Tuple[ChaserAnswer, str]:
+        """
+        Answer a chase question and comment on it with both LLM calls in flight.
+
+        The comment only depends on the error-model outcome, which is drawn
+        before any LLM call, so it does not have to wait for the answer and
+        the step takes one LLM latency instead of two. Calls still running
+        when the step budget is spent are cancelled, and a shed, broken or
+        late LLM leaves the step in degraded mode (see degraded.py).
+        """
+        chaser_answer, player_answer_option, player_correct = self._draw_chase_answer(question, player_answer_option, rng)
+        banked = self._banked_comment(question, chaser_answer, player_answer_option)
+
+        with self.degraded.step() as skip_reason:
+            if skip_reason is not None:
+                return self._degraded_step(question, chaser_answer, player_correct, banked, skip_reason)
+
+            answer_task = asyncio.ensure_future(self.qa.aanswer_question_detailed(question, persona=self.persona.key))
+            tasks = [answer_task]
+            comment_task = None
+            if banked is None:
+                comment_task = asyncio.ensure_future(
+                    self._acomment_with_llm(question, player_correct, chaser_answer, player_answer_option)
+                )
+                tasks.append(comment_task)
+
+            try:
+                done, pending = await asyncio.wait(tasks, timeout=self.degraded.budget())
+            finally:
+                for task in tasks:
+                    task.cancel()
+
+            reason = None
+            for task in tasks:
+                if task in done and task.exception() is not None and not self.degraded.enabled:
+                    raise task.exception()
+                ok = task in done and task.exception() is None
+                self.degraded.record_call(ok)
+                if not ok and reason is None:
+                    reason = DEGRADED_REASON_BUDGET if task in pending else DEGRADED_REASON_ERROR
+
+            if answer_task in done and answer_task.exception() is None:
+                self._fill_llm_answer(chaser_answer, answer_task.result())
+
+            comment = banked
+            if comment_task is not None and comment_task in done and comment_task.exception() is None:
+                comment = comment_task.result()
+
+            if reason is not None:
+                return self._degraded_step(question, chaser_answer, player_correct, comment, reason)
+            return chaser_answer, comment
+
+    async def aanswer_final_chase(
+            self,
+            questions: List[Question],
+            rng: Optional[random.Random] = None,
+            flow: Optional[str] = None
+    ) -> AsyncIterator[Tuple[int, ChaserAnswer]]:
+        """
+        Async version of answer_final_chase(): all LLM calls run on the event
+        loop at once and (question_index, answer) pairs are yielded as they arrive.
+        The calls are tasks of their own, labelled with the scheduler `flow`
+        when they are created (a block around the yields could not be).
+        """
+        if not questions:
+            return
+
+        rng = rng or self.rng
+        draws = [self.draw_error_model(rng) for _ in questions]
+
+        async def answer_one(i: int, q: Question, force_correct: bool, wrong_pick: float) -> Tuple[int, ChaserAnswer]:
+            try:
+                return i, await self._aanswer_with_error_model(q, force_correct, wrong_pick, CALL_TYPE_FINAL_CHASE)
+            except Exception:
+                return i, self._failed_final_chase_answer(q, force_correct, wrong_pick)
+
+        with llm_work(flow=flow):
+            tasks = [
+                asyncio.ensure_future(answer_one(i, q, force_correct, wrong_pick))
+                for i, (q, (force_correct, wrong_pick)) in enumerate(zip(questions, draws))
+            ]
+
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def _aanswer_with_error_model(
+            self,
+            question: Question,
+            force_correct: bool,
+            wrong_pick: float,
+            call_type: str = CALL_TYPE_ANSWER
+    ) -> ChaserAnswer:
+        result = await self.qa.aanswer_question_detailed(question, call_type=call_type, persona=self.persona.key)
+
+        chosen_option, is_correct = apply_error_model(question, force_correct, wrong_pick)
+
+        return ChaserAnswer(
+            chosen_option=chosen_option,
+            is_correct=is_correct,
+            raw_llm_response=result.raw,
+            natural_llm_choice=result.choice.upper(),
+            option_logprobs=result.option_logprobs
+        )
+
+    @traced("chaser.agenerate_comment")
+    async def agenerate_comment(self, question: Question, player_correct: bool, chaser_answer: ChaserAnswer, player_answer_option: str) -> str:
+        banked = self._banked_comment(question, chaser_answer, player_answer_option)
+        if banked is not None:
+            return banked
+
+        return await self._acomment_with_llm(question, player_correct, chaser_answer, player_answer_option)
+
+    async def _acomment_with_llm(self, question: Question, player_correct: bool, chaser_answer: ChaserAnswer, player_answer_option: str) -> str:
+        system_prompt, user_prompt = build_comment_prompts(
+            question=question,
+            correct_option=question.correct_option,
+            player_correct=player_correct,
+            chaser_answer=chaser_answer,
+            persona=self.persona,
+            player_answer_option=player_answer_option
+        )
+
+        raw = await self.qa.client.achat(
+            system_prompt=system_prompt,
+            user_prompt=user_prompt,
+            call_type=CALL_TYPE_COMMENT,
+            persona=self.persona.key
+        )
+
+        return raw.strip() or "..."
+
+
+def apply_error_model(question: Question, force_correct: bool, wrong_pick: float) -> Tuple[str, bool]:
+    """
+    Turn an error-model draw into the option the chaser shows and whether it is correct.
+    """
+    if force_correct:
+        return question.correct_option, True
+
+    wrong_options = [opt for opt in ["A", "B", "C", "D"] if opt != question.correct_option]
+    return wrong_options[int(wrong_pick * len(wrong_options))], False
+
+
+@traced("chaser.build_comment_prompts")
 def build_comment_prompts(
     question: Question,
     correct_option: str,
@@ -0,0 +1,122 @@
+import threading
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional, Tuple
+
+from src.llm.personas import ChaserPersona, get_all_personas
+from src.llm.question_answerer import QuestionAnswerer
+from .chaser_logic import ChaserLogic
+
+if TYPE_CHECKING:
+    from .comment_bank import CommentBank
+
+CHASER_MODEL_DEFAULT = "gpt-4.1-mini"
+CHASER_P_CORRECT_DEFAULT = 0.75
+
+
+class ChaserPool:
+    """
+    Process-level registry of shared ChaserLogic instances, keyed by
+    (model, persona, p_correct).
+
+    A ChaserLogic keeps no per-game state (every game passes its own rng),
+    so one instance per key can serve all games at once, and all instances
+    of a model share a single LLM client and its connection pool. New games
+    take a reference instead of building clients.
+
+    An optional CommentBank is shared by all chasers as well; it is loaded
+    during warm-up, and until then every comment comes from the LLM.
+    """
+
+    def __init__(self, comment_bank: Optional["CommentBank"] = None):
+        self.comment_bank = comment_bank
+        self._chasers: Dict[Tuple[str, str, float], ChaserLogic] = {}
+        self._answerers: Dict[str, QuestionAnswerer] = {}
+        self._lock = threading.Lock()
+
+        self._warmer: Optional[threading.Thread] = None
+        self.warmup_error: Optional[str] = None
+
+    def get(
+            self,
+            persona: ChaserPersona,
+            model: str = CHASER_MODEL_DEFAULT,
+            p_correct: float = CHASER_P_CORRECT_DEFAULT
+    ) -> ChaserLogic:
+        key = (model, persona.key, p_correct)
+
+        chaser = self._chasers.get(key)
+        if chaser is not None:
+            return chaser
+
+        with self._lock:
+            chaser = self._chasers.get(key)
+            if chaser is None:
+                qa = self._answerers.get(model)
+                if qa is None:
+                    qa = QuestionAnswerer(model=model)
+                    self._answerers[model] = qa
+
+                chaser = ChaserLogic(
+                    model=model, p_correct=p_correct, persona=persona, qa=qa, comment_bank=self.comment_bank
+                )
+                self._chasers[key] = chaser
+
+        return chaser
+
+    def warm(
+            self,
+            model: str = CHASER_MODEL_DEFAULT,
+            p_correct: float = CHASER_P_CORRECT_DEFAULT,
+            personas: Optional[Iterable[ChaserPersona]] = None
+    ) -> None:
+        """
+        Build the chasers for every persona (and their clients, sync and
+        async) and load the comment bank ahead of the first game.
+        """
+        if self.comment_bank is not None:
+            self.comment_bank.load()
+
+        for persona in personas or get_all_personas():
+            self.get(persona, model=model, p_correct=p_correct)
+
+        self._answerers[model].client.warm()
+
+    def start_warmup(
+            self,
+            model: str = CHASER_MODEL_DEFAULT,
+            p_correct: float = CHASER_P_CORRECT_DEFAULT
+    ) -> None:
+        """
+        Warm the pool on a daemon thread, so the server starts listening
+        while the LLM SDK is imported and the clients are built. A game
+        that starts before warm-up is done builds its chaser on demand.
+        """
+        if self._warmer is not None:
+            return
+
+        def run() -> None:
+            try:
+                self.warm(model=model, p_correct=p_correct)
+            except Exception as e:
+                # e.g. no API key: the first game reports the same error
+                self.warmup_error = f"{type(e).__name__}: {e}"
+
+        self._warmer = threading.Thread(target=run, name="chaser-pool-warmup", daemon=True)
+        self._warmer.start()
+
+    def __len__(self) -> int:
+        return len(self._chasers)
+
+    def close(self) -> None:
+        for qa in self._take_answerers():
+            qa.close()
+
+    async def aclose(self) -> None:
+        for qa in self._take_answerers():
+            await qa.aclose()
+
+    def _take_answerers(self) -> List[QuestionAnswerer]:
+        with self._lock:
+            answerers = list(self._answerers.values())
+            self._answerers.clear()
+            self._chasers.clear()
+        return answerers
@@ -0,0 +1,246 @@
+"""
+Precomputed chaser comments.
+
+A chase-step comment only depends on the question, the persona, the
+player's option and whether the chaser was right (see
+build_comment_prompts), so for a given question there are
+4 personas x 4 player options x 2 chaser outcomes = 32 possible prompts.
+`scripts/build_comment_bank.py` generates them offline for the most asked
+questions; at runtime ChaserLogic serves a comment from the bank with a
+dict lookup and a slice, and only calls the LLM on a miss.
+
+File layout (one .npz): question ids, a CRC32 of each question's text (a
+comment is only served if the question has not changed since), the
+persona keys, and all comments as one UTF-8 blob with one offset per slot.
+An empty slot means "not generated".
+"""
+
+import asyncio
+import os
+import pathlib
+import threading
+import zlib
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional, Tuple
+
+from src.utils.data_models import Question
+from src.llm.personas import ChaserPersona, get_all_personas
+
+if TYPE_CHECKING:
+    from .chaser_logic import ChaserLogic
+
+OPTIONS = ["A", "B", "C", "D"]
+# slots per (question, persona): player option x chaser correct
+SLOTS_PER_PERSONA = len(OPTIONS) * 2
+OPTION_INDEX = {option: i for i, option in enumerate(OPTIONS)}
+
+# (question id, persona key, player option, chaser correct)
+CommentKey = Tuple[str, str, str, bool]
+
+
+def question_fingerprint(question: Question) -> int:
+    text = "\x1f".join([question.question, *(question.options[o] for o in OPTIONS), question.correct_option])
+    return zlib.crc32(text.encode("utf-8"))
+
+
+class CommentBank:
+    def __init__(self, path: Optional[pathlib.Path] = None):
+        self.path = path
+        self.hits = 0
+        self.misses = 0
+
+        self._lock = threading.Lock()
+        self._loaded = False
+        self._index: Dict[str, int] = {}
+        self._fingerprints: List[int] = []
+        self._personas: Dict[str, int] = {}
+        self._offsets: List[int] = [0]
+        self._blob = b""
+
+    # ---------- lookup ----------
+
+    def get(
+            self,
+            question: Question,
+            persona_key: str,
+            player_option: str,
+            chaser_correct: bool
+    ) -> Optional[str]:
+        """
+        The stored comment, or None (not loaded, not generated, invalid
+        player answer or question changed since the bank was built).
+        """
+        comment = self._lookup(question, persona_key, player_option.upper(), chaser_correct)
+        # plain increments: approximate under threads, good enough for a hit rate
+        if comment is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return comment
+
+    def _lookup(self, question: Question, persona_key: str, player_option: str, chaser_correct: bool) -> Optional[str]:
+        q_idx = self._index.get(question.id)
+        p_idx = self._personas.get(persona_key)
+        o_idx = OPTION_INDEX.get(player_option)
+        if q_idx is None or p_idx is None or o_idx is None:
+            return None
+
+        if self._fingerprints[q_idx] != question_fingerprint(question):
+            return None
+
+        slot = (q_idx * len(self._personas) + p_idx) * SLOTS_PER_PERSONA + o_idx * 2 + int(chaser_correct)
+        start, end = self._offsets[slot], self._offsets[slot + 1]
+        if start == end:
+            return None
+
+        return self._blob[start:end].decode("utf-8")
+
+    def __len__(self) -> int:
+        offsets = self._offsets
+        return sum(1 for i in range(len(offsets) - 1) if offsets[i + 1] > offsets[i])
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "comment_bank_questions": len(self._index),
+            "comment_bank_hits": self.hits,
+            "comment_bank_misses": self.misses,
+        }
+
+    def items(self) -> Dict[CommentKey, str]:
+        """
+        Every stored comment by key, e.g. to extend the bank.
+        """
+        out: Dict[CommentKey, str] = {}
+        personas = sorted(self._personas, key=self._personas.get)
+        for qid, q_idx in self._index.items():
+            for p_idx, persona_key in enumerate(personas):
+                for option, o_idx in OPTION_INDEX.items():
+                    for chaser_correct in (False, True):
+                        slot = (q_idx * len(personas) + p_idx) * SLOTS_PER_PERSONA + o_idx * 2 + int(chaser_correct)
+                        start, end = self._offsets[slot], self._offsets[slot + 1]
+                        if end > start:
+                            out[(qid, persona_key, option, chaser_correct)] = self._blob[start:end].decode("utf-8")
+        return out
+
+    # ---------- persistence ----------
+
+    def load(self, path: Optional[pathlib.Path] = None) -> bool:
+        """
+        Load the bank from disk once; False if there is no file.
+        """
+        path = path or self.path
+        if path is None or not path.exists():
+            return False
+
+        with self._lock:
+            if self._loaded:
+                return True
+
+            import numpy as np
+
+            with np.load(path) as data:
+                ids = [str(qid) for qid in data["ids"]]
+                fingerprints = data["fingerprints"].tolist()
+                personas = [str(key) for key in data["personas"]]
+                offsets = data["offsets"].tolist()
+                blob = data["blob"].tobytes()
+
+            # swap everything in at once: lookups may be running
+            self._offsets = offsets
+            self._blob = blob
+            self._fingerprints = fingerprints
+            self._personas = {key: i for i, key in enumerate(personas)}
+            self._index = {qid: i for i, qid in enumerate(ids)}
+            self._loaded = True
+
+        return True
+
+    @staticmethod
+    def save(
+            path: pathlib.Path,
+            questions: List[Question],
+            comments: Dict[CommentKey, str],
+            personas: Optional[List[ChaserPersona]] = None
+    ) -> int:
+        """
+        Write the comments of `questions` to `path` (atomically) and
+        return how many were stored.
+        """
+        import numpy as np
+
+        persona_keys = [p.key for p in personas or get_all_personas()]
+
+        offsets = [0]
+        chunks: List[bytes] = []
+        size = stored = 0
+        for q in questions:
+            for persona_key in persona_keys:
+                for option in OPTIONS:
+                    for chaser_correct in (False, True):
+                        comment = comments.get((q.id, persona_key, option, chaser_correct), "")
+                        data = comment.encode("utf-8")
+                        chunks.append(data)
+                        size += len(data)
+                        stored += int(bool(data))
+                        offsets.append(size)
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(path.name + ".tmp")
+        with tmp_path.open("wb") as f:
+            np.savez_compressed(
+                f,
+                ids=np.array([q.id for q in questions], dtype=str),
+                fingerprints=np.array([question_fingerprint(q) for q in questions], dtype=np.uint32),
+                personas=np.array(persona_keys, dtype=str),
+                offsets=np.array(offsets, dtype=np.uint64),
+                blob=np.frombuffer(b"".join(chunks), dtype=np.uint8),
+            )
+        os.replace(tmp_path, path)
+
+        return stored
+
+
+# ---------- offline generation ----------
+
+async def agenerate_comments(
+        questions: List[Question],
+        chasers: List["ChaserLogic"],
+        existing: Optional[Dict[CommentKey, str]] = None,
+        concurrency: int = 16,
+        on_comment: Optional[Callable[[CommentKey, str], None]] = None
+) -> Dict[CommentKey, str]:
+    """
+    Generate every missing comment for `questions` with each chaser (one
+    per persona, without a bank), through the same prompt as the game.
+    """
+    from .chaser_logic import ChaserAnswer
+
+    comments = dict(existing or {})
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def generate(question: Question, chaser: "ChaserLogic", option: str, chaser_correct: bool) -> None:
+        wrong = next(o for o in OPTIONS if o != question.correct_option)
+        chaser_answer = ChaserAnswer(
+            chosen_option=question.correct_option if chaser_correct else wrong,
+            is_correct=chaser_correct,
+            raw_llm_response="",
+            natural_llm_choice=""
+        )
+
+        async with semaphore:
+            comment = await chaser.agenerate_comment(question, option == question.correct_option, chaser_answer, option)
+
+        key = (question.id, chaser.persona.key, option, chaser_correct)
+        comments[key] = comment
+        if on_comment is not None:
+            on_comment(key, comment)
+
+    await asyncio.gather(*(
+        generate(q, chaser, option, chaser_correct)
+        for q in questions
+        for chaser in chasers
+        for option in OPTIONS
+        for chaser_correct in (False, True)
+        if (q.id, chaser.persona.key, option, chaser_correct) not in comments
+    ))
+
+    return comments
@@ -0,0 +1,102 @@
+"""
+Local chaser comments for degraded mode.
+
+When the LLM is slow, failing or shed (see src/game/degraded.py), the
+chase step still needs a comment in the chaser's voice. These templates
+cover every persona and every (chaser correct, player correct) outcome,
+always name the correct answer like the LLM comments do, and cost a
+format() call. The variant is picked from the question id, so the same
+step always gets the same comment and the game's rng is never touched.
+"""
+
+import zlib
+from typing import Dict, List, Tuple
+
+from src.utils.data_models import Question
+
+# (chaser correct, player correct) -> variants; {answer} is "B) Paris"
+Templates = Dict[Tuple[bool, bool], List[str]]
+
+COMMENT_TEMPLATES: Dict[str, Templates] = {
+    "professor": {
+        (True, True): [
+            "Quite right, the answer is {answer}. We both did our homework, it seems.",
+            "Correct on both sides: {answer}. A well-established fact, I'm pleased you knew it.",
+        ],
+        (True, False): [
+            "The answer is {answer}. A classic, I'm afraid; it is worth remembering.",
+            "{answer} is the correct answer. An instructive mistake on your part.",
+        ],
+        (False, True): [
+            "The answer is indeed {answer}. An interesting exception to my usual record.",
+            "Well done, it is {answer}. I shall have to revisit my notes on that one.",
+        ],
+        (False, False): [
+            "Neither of us had it: the answer is {answer}. A humbling question.",
+            "The correct answer is {answer}. A curious gap we apparently share.",
+        ],
+    },
+    "beast": {
+        (True, True): [
+            "It's {answer}. You got it, but so did I, and I'm still coming for you.",
+            "{answer}. Lucky you knew that one, because I'm not slowing down.",
+        ],
+        (True, False): [
+            "It's {answer}. Easy for me, and I'm one step closer to you.",
+            "{answer}, obviously. You're making this too easy for me.",
+        ],
+        (False, True): [
+            "Fine, it's {answer}. Terrible question. Enjoy it while it lasts.",
+            "{answer}. One slip. Don't get comfortable, I'm still right behind you.",
+        ],
+        (False, False): [
+            "It's {answer}. Neither of us got it, and I'm still the one chasing.",
+            "{answer}. A bad question for both of us, but only one of us should worry.",
+        ],
+    },
+    "trickster": {
+        (True, True): [
+            "It's {answer}! Great minds think alike, and so do ours, apparently.",
+            "{answer}, of course. We're practically a double act now.",
+        ],
+        (True, False): [
+            "Ta-da, it's {answer}! Better luck on the next trick.",
+            "The answer was {answer}. Don't worry, I won't tell anyone. Much.",
+        ],
+        (False, True): [
+            "It's {answer}? Well, even magicians drop a card sometimes.",
+            "{answer}! You got me there, I'll pretend I meant to do that.",
+        ],
+        (False, False): [
+            "It was {answer}! We both fell for that one, what a pair.",
+            "{answer}, apparently. Let's agree that question never happened.",
+        ],
+    },
+    "machine": {
+        (True, True): [
+            "Answer: {answer}. Both responses correct. Proceeding.",
+            "Correct answer {answer} confirmed. Player match noted.",
+        ],
+        (True, False): [
+            "Answer: {answer}. Player response incorrect. Gap reduced.",
+            "Correct answer {answer} retrieved. Player error logged.",
+        ],
+        (False, True): [
+            "Answer: {answer}. Chaser error logged. Recalibrating.",
+            "Correct answer {answer}. Anomaly in chaser output recorded.",
+        ],
+        (False, False): [
+            "Answer: {answer}. Both responses incorrect. No change in position.",
+            "Correct answer {answer}. Error recorded on both sides.",
+        ],
+    },
+}
+
+
+def template_comment(question: Question, persona_key: str, player_correct: bool, chaser_correct: bool) -> str:
+    templates = COMMENT_TEMPLATES.get(persona_key) or COMMENT_TEMPLATES["professor"]
+    variants = templates[(chaser_correct, player_correct)]
+    variant = variants[zlib.crc32(f"{question.id}\x1f{persona_key}".encode("utf-8")) % len(variants)]
+
+    answer = f"{question.correct_option}) {question.options[question.correct_option]}"
+    return variant.format(answer=answer)
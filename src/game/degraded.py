@@ -0,0 +1,309 @@
+"""
+Degraded mode for the chase step.
+
+A chase step normally waits on two LLM calls (the chaser's own answer and
+its comment). Neither decides the outcome: the error model does. So when
+the LLM cannot keep up, the step can finish without it:
+
+- budget: the step gets `budget_seconds`; calls still running by then are
+  cancelled, the answer keeps only the error model's option and the
+  comment comes from a local persona template (see comment_templates.py)
+- breaker: a circuit breaker follows the outcome of the step's LLM calls
+  (errors and budget overruns count as failures). Once the failure rate
+  of the latest calls reaches `error_rate`, it opens and steps skip the
+  LLM altogether; after `cooldown_seconds` one step is let through as a
+  probe, and its outcome closes or reopens the breaker
+- shed: when `shed_in_flight` steps are already waiting on the LLM in
+  this process, new steps skip it too, so a deep queue drains at CPU
+  speed instead of piling up behind the provider. Shedding stops once
+  fewer than `SHED_RESUME_RATIO` of that many steps are waiting
+
+The current mode (normal, degraded while the breaker is not closed,
+shedding), its transitions and the degraded steps per reason are exported
+with the other Prometheus metrics.
+
+Set CHASER_DEGRADED=0 to always wait for the LLM. The budget can be set
+with CHASER_STEP_BUDGET_MS, the shedding threshold with
+CHASER_SHED_IN_FLIGHT, the breaker with CHASER_BREAKER_ERROR_RATE and
+CHASER_BREAKER_COOLDOWN_MS.
+"""
+
+import contextlib
+import os
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, Iterator, Optional, Tuple
+
+STEP_BUDGET_DEFAULT = 5.0
+SHED_IN_FLIGHT_DEFAULT = 128
+# hysteresis, so the mode does not flip with every step at the threshold
+SHED_RESUME_RATIO = 0.8
+BREAKER_WINDOW_SIZE = 50
+BREAKER_MIN_CALLS = 10
+BREAKER_ERROR_RATE_DEFAULT = 0.5
+BREAKER_COOLDOWN_DEFAULT = 30.0
+
+BREAKER_CLOSED = "closed"
+BREAKER_OPEN = "open"
+BREAKER_HALF_OPEN = "half_open"
+
+MODE_NORMAL = "normal"
+MODE_DEGRADED = "degraded"
+MODE_SHEDDING = "shedding"
+MODES = [MODE_NORMAL, MODE_DEGRADED, MODE_SHEDDING]
+
+DEGRADED_REASON_BUDGET = "budget"
+DEGRADED_REASON_BREAKER = "breaker"
+DEGRADED_REASON_SHED = "shed"
+DEGRADED_REASON_ERROR = "error"
+
+
+class CircuitBreaker:
+    def __init__(
+            self,
+            window_size: int = BREAKER_WINDOW_SIZE,
+            min_calls: int = BREAKER_MIN_CALLS,
+            error_rate: float = BREAKER_ERROR_RATE_DEFAULT,
+            cooldown_seconds: float = BREAKER_COOLDOWN_DEFAULT,
+            clock: Callable[[], float] = time.monotonic
+    ):
+        self.min_calls = min_calls
+        self.error_rate = error_rate
+        self.cooldown_seconds = cooldown_seconds
+        self.clock = clock
+
+        self._lock = threading.Lock()
+        self._outcomes: Deque[bool] = deque(maxlen=window_size)
+        self._state = BREAKER_CLOSED
+        self._opened_at = 0.0
+        self._probing = False
+        self._probe_at = 0.0
+        self.opened = 0
+
+    @property
+    def state(self) -> str:
+        return self._state
+
+    def allow(self) -> bool:
+        """
+        Whether a call may go to the LLM. While open, the first caller after
+        the cooldown becomes the probe; everyone else keeps being refused
+        until the probe's outcome is recorded (or, if it never is, for
+        another cooldown).
+        """
+        with self._lock:
+            if self._state == BREAKER_CLOSED:
+                return True
+
+            now = self.clock()
+            if self._state == BREAKER_OPEN and now - self._opened_at >= self.cooldown_seconds:
+                self._state = BREAKER_HALF_OPEN
+
+            if self._state == BREAKER_HALF_OPEN and (not self._probing or now - self._probe_at >= self.cooldown_seconds):
+                self._probing = True
+                self._probe_at = now
+                return True
+
+            return False
+
+    def record(self, ok: bool) -> None:
+        with self._lock:
+            if self._state == BREAKER_HALF_OPEN:
+                if not self._probing:
+                    return
+                self._probing = False
+                if ok:
+                    self._state = BREAKER_CLOSED
+                    self._outcomes.clear()
+                else:
+                    self._open()
+                return
+
+            if self._state == BREAKER_OPEN:
+                # late outcome of a call let through before the breaker opened
+                return
+
+            self._outcomes.append(ok)
+            if len(self._outcomes) >= self.min_calls:
+                failures = len(self._outcomes) - sum(self._outcomes)
+                if failures / len(self._outcomes) >= self.error_rate:
+                    self._open()
+
+    def _open(self) -> None:
+        self._state = BREAKER_OPEN
+        self._opened_at = self.clock()
+        self._outcomes.clear()
+        self.opened += 1
+
+    def reset(self) -> None:
+        with self._lock:
+            self._state = BREAKER_CLOSED
+            self._outcomes.clear()
+            self._probing = False
+
+
+class DegradedMode:
+    def __init__(
+            self,
+            budget_seconds: Optional[float] = STEP_BUDGET_DEFAULT,
+            shed_in_flight: Optional[int] = SHED_IN_FLIGHT_DEFAULT,
+            breaker: Optional[CircuitBreaker] = None,
+            enabled: bool = True
+    ):
+        self.enabled = enabled
+        # None disables the budget / shedding
+        self.budget_seconds = budget_seconds
+        self.shed_in_flight = shed_in_flight
+        self.breaker = breaker or CircuitBreaker()
+
+        self._lock = threading.Lock()
+        # steps waiting on the LLM (shed and breaker steps do not)
+        self.in_flight = 0
+        self._shedding = False
+        self._mode = MODE_NORMAL
+        self._transitions: Dict[Tuple[str, str], int] = {}
+        self._degraded: Dict[str, int] = {}
+        self.steps = 0
+
+    @classmethod
+    def from_env(cls) -> "DegradedMode":
+        budget_ms = os.getenv("CHASER_STEP_BUDGET_MS")
+        shed = os.getenv("CHASER_SHED_IN_FLIGHT")
+        error_rate = os.getenv("CHASER_BREAKER_ERROR_RATE")
+        cooldown_ms = os.getenv("CHASER_BREAKER_COOLDOWN_MS")
+
+        breaker = CircuitBreaker(
+            error_rate=float(error_rate) if error_rate else BREAKER_ERROR_RATE_DEFAULT,
+            cooldown_seconds=float(cooldown_ms) / 1000.0 if cooldown_ms else BREAKER_COOLDOWN_DEFAULT
+        )
+        return cls(
+            budget_seconds=float(budget_ms) / 1000.0 if budget_ms else STEP_BUDGET_DEFAULT,
+            shed_in_flight=int(shed) if shed else SHED_IN_FLIGHT_DEFAULT,
+            breaker=breaker,
+            enabled=os.getenv("CHASER_DEGRADED", "1") != "0"
+        )
+
+    # ---------- decisions ----------
+
+    @contextlib.contextmanager
+    def step(self) -> Iterator[Optional[str]]:
+        """
+        Wrap one chase step. Yields the reason to skip the LLM (shed,
+        breaker) or None when the step may call it.
+        """
+        with self._lock:
+            self.steps += 1
+            if self.shed_in_flight is not None:
+                if self.in_flight >= self.shed_in_flight:
+                    self._shedding = True
+                elif self.in_flight < self.shed_in_flight * SHED_RESUME_RATIO:
+                    self._shedding = False
+
+        reason = None
+        if self.enabled:
+            if self._shedding:
+                reason = DEGRADED_REASON_SHED
+            elif not self.breaker.allow():
+                reason = DEGRADED_REASON_BREAKER
+        self._update_mode()
+
+        if reason is not None:
+            yield reason
+            return
+
+        with self._lock:
+            self.in_flight += 1
+        try:
+            yield None
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+                if self._shedding and self.in_flight < self.shed_in_flight * SHED_RESUME_RATIO:
+                    self._shedding = False
+            self._update_mode()
+
+    def budget(self) -> Optional[float]:
+        return self.budget_seconds if self.enabled else None
+
+    def record_call(self, ok: bool) -> None:
+        """
+        Outcome of one LLM call of a step (a budget overrun is not ok).
+        """
+        if self.enabled:
+            self.breaker.record(ok)
+            self._update_mode()
+
+    def record_degraded(self, reason: str) -> None:
+        with self._lock:
+            self._degraded[reason] = self._degraded.get(reason, 0) + 1
+
+    def _update_mode(self) -> None:
+        if not self.enabled:
+            mode = MODE_NORMAL
+        elif self._shedding:
+            mode = MODE_SHEDDING
+        elif self.breaker.state != BREAKER_CLOSED:
+            mode = MODE_DEGRADED
+        else:
+            mode = MODE_NORMAL
+
+        with self._lock:
+            if mode != self._mode:
+                transition = (self._mode, mode)
+                self._transitions[transition] = self._transitions.get(transition, 0) + 1
+                self._mode = mode
+
+    @property
+    def mode(self) -> str:
+        return self._mode
+
+    # ---------- reporting ----------
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "enabled": self.enabled,
+                "mode": self._mode,
+                "breaker": self.breaker.state,
+                "breaker_opened": self.breaker.opened,
+                "budget_seconds": self.budget_seconds,
+                "shed_in_flight": self.shed_in_flight,
+                "in_flight": self.in_flight,
+                "steps": self.steps,
+                "degraded_steps": dict(sorted(self._degraded.items())),
+                "transitions": [
+                    {"from": source, "to": target, "count": n}
+                    for (source, target), n in sorted(self._transitions.items())
+                ],
+            }
+
+    def metrics(self) -> Dict[str, float]:
+        """
+        Current mode, transitions and degraded steps as Prometheus gauges.
+        """
+        with self._lock:
+            out: Dict[str, float] = {
+                f'chaser_chase_mode{{mode="{mode}"}}': int(mode == self._mode)
+                for mode in MODES
+            }
+            out["chaser_chase_in_flight"] = self.in_flight
+            out["chaser_chase_steps"] = self.steps
+            out["chaser_llm_breaker_open"] = int(self.breaker.state != BREAKER_CLOSED)
+            for (source, target), n in sorted(self._transitions.items()):
+                out[f'chaser_chase_mode_transitions{{from="{source}",to="{target}"}}'] = n
+            for reason, n in sorted(self._degraded.items()):
+                out[f'chaser_chase_degraded_steps{{reason="{reason}"}}'] = n
+        return out
+
+    def reset(self) -> None:
+        self.breaker.reset()
+        with self._lock:
+            self._mode = MODE_NORMAL
+            self._transitions.clear()
+            self._degraded.clear()
+            self.steps = 0
+
+
+# process-wide: every chaser's chase steps go through it
+DEGRADED = DegradedMode.from_env()
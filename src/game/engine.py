@@ -1,8 +1,8 @@
-import random
-
-from typing import List, Optional
+from typing import Iterable, List, Optional, Set
 
 from src.utils.data_models import Question
+from src.utils.tracing import traced
+from .rng import GameRng
 from .state import GameState, GamePhase, OfferState
 
 N_CASH_BUILDER_QUESTION_DEFAULT = 8
@@ -22,13 +22,21 @@ HIGH_MULT_MAX = 4.0
 N_FINAL_PLAYER_QUESTION_DEFAULT = 10
 N_FINAL_CHASER_QUESTION_DEFAULT = 10
 
+# rejected draws in a row before a question sharing rare terms is accepted
+MAX_BALANCED_DRAW_TRIES = 64
+
 
-def start_new_game(question_pool: List[Question]) -> GameState:
+@traced("engine.start_new_game")
+def start_new_game(question_pool: List[Question], seed: Optional[int] = None) -> GameState:
     """
     Initialize a new game with a given pool of questions.
     Starts in the CASH_BUILDER phase.
+
+    All randomness of the game comes from state.rng, so passing the same
+    seed (and the same answers) replays the game exactly.
     """
     state = GameState()
+    state.rng = GameRng(seed)
     state.phase = GamePhase.CASH_BUILDER
     state.question_pool = list(question_pool)
     state.current_question = None
@@ -45,6 +53,57 @@ def start_new_game(question_pool: List[Question]) -> GameState:
     return state
 
 
+# ---------- QUESTION DRAWS ----------
+
+
+def _draw_balanced(state: GameState, excluded: Set[str]) -> Optional[Question]:
+    pool = state.question_pool
+    index = state.question_index
+    rng = state.rng.py
+
+    for _ in range(MAX_BALANCED_DRAW_TRIES):
+        q = rng.choice(pool)
+        if q.id in excluded:
+            continue
+        terms = index.rare_terms(q.id)
+        if state.drawn_terms.isdisjoint(terms):
+            state.drawn_terms.update(terms)
+            return q
+
+    # small or clustered pool: take any question not drawn yet
+    available = [q for q in pool if q.id not in excluded]
+    if not available:
+        return None
+    q = rng.choice(available)
+    state.drawn_terms.update(index.rare_terms(q.id))
+    return q
+
+
+def draw_questions(state: GameState, n: int, exclude_ids: Iterable[str] = ()) -> List[Question]:
+    """
+    Draw up to n distinct questions from the pool, none of them in `exclude_ids`.
+
+    Without a question index this is a uniform sample. With one, a question
+    sharing a rare term with a question already drawn in this game is put
+    back, so one game does not cluster on a topic.
+    """
+    excluded = set(exclude_ids)
+
+    if state.question_index is None:
+        pool = [q for q in state.question_pool if q.id not in excluded] if excluded else state.question_pool
+        return state.rng.py.sample(pool, min(n, len(pool)))
+
+    selected: List[Question] = []
+    while len(selected) < n:
+        q = _draw_balanced(state, excluded)
+        if q is None:
+            break
+        excluded.add(q.id)
+        selected.append(q)
+
+    return selected
+
+
 # ---------- CASH BUILDER PHASE ----------
 
 
@@ -56,8 +115,7 @@ def start_cash_builder(state: GameState, n_questions: int) -> GameState:
     if not state.question_pool:
         raise ValueError("Question pool is empty. Cannot start Cash Builder")
     
-    n = min(n_questions, len(state.question_pool))
-    selected = random.sample(state.question_pool, n)
+    selected = draw_questions(state, n_questions)
 
     state.cash_builder.questions = selected
     state.cash_builder.current_index = 0
@@ -83,6 +141,7 @@ def get_current_cash_builder_question(state: GameState) -> Optional[Question]:
     return questions[idx]
 
 
+@traced("engine.process_cash_builder_answer")
 def process_cash_builder_answer(state: GameState, player_answer: str) -> GameState:
     """
     Process the player's answer in the Cash Builder phase.
@@ -95,10 +154,14 @@ def process_cash_builder_answer(state: GameState, player_answer: str) -> GameSta
         return state
     
     normalized_answer = player_answer.strip().upper()
+    player_correct = (normalized_answer == current_q.correct_option)
 
-    if normalized_answer == current_q.correct_option:
+    if player_correct:
         state.player.correct_answers += 1
 
+    if state.stats is not None:
+        state.stats.record_player(current_q, GamePhase.CASH_BUILDER, player_correct)
+
     state.cash_builder.current_index += 1
 
     next_q = get_current_cash_builder_question(state)
@@ -114,6 +177,7 @@ def process_cash_builder_answer(state: GameState, player_answer: str) -> GameSta
 # ---------- CHASE (BOARD) PHASE ----------
 
 
+@traced("engine.generate_chase_offers")
 def generate_chase_offers(state: GameState) -> OfferState:
     """
     Generate low/middle/high offers (money and positions) for the Chase phase,
@@ -127,11 +191,11 @@ def generate_chase_offers(state: GameState) -> OfferState:
 
     mid_offer_money = base_cash
 
-    low_mult = random.uniform(LOW_MULT_MIN, LOW_MULT_MAX)
+    low_mult = state.rng.py.uniform(LOW_MULT_MIN, LOW_MULT_MAX)
     low_offer_money = round(base_cash * low_mult)
     low_offer_money = max(low_offer_money, LOW_OFFER_MINIMUM)
 
-    high_mult = random.uniform(HIGH_MULT_MIN, HIGH_MULT_MAX)
+    high_mult = state.rng.py.uniform(HIGH_MULT_MIN, HIGH_MULT_MAX)
     high_offer_money = round(base_cash * high_mult)
 
     offers = OfferState(
@@ -184,34 +248,46 @@ def apply_player_offer_choice(state: GameState, offers: OfferState, choice: str)
 
 
 
+@traced("engine.get_next_chase_question")
 def get_next_chase_question(state: GameState) -> Question:
     """
     Select the next question for the Chase phase.
     """
     used_ids = set(state.chase.question_ids_used)
-    available = [q for q in state.question_pool if q.id not in used_ids]
 
-    if not available:
-        available = state.question_pool
+    if state.question_index is not None and state.question_pool:
+        drawn = draw_questions(state, 1, used_ids) or draw_questions(state, 1)
+        q = drawn[0]
+    else:
+        available = [q for q in state.question_pool if q.id not in used_ids]
+
+        if not available:
+            available = state.question_pool
+
+        if not available:
+            raise ValueError("Question pool is empty, cannot get chase questions")
+
+        q = state.rng.py.choice(available)
 
-    if not available:
-        raise ValueError("Question pool is empty, cannot get chase questions")
-    
-    q = random.choice(available)
     state.chase.question_ids_used.append(q.id)
     state.current_question = q
 
     return q
 
 
+@traced("engine.process_chase_step")
 def process_chase_step(
     state: GameState,
     player_answer: str,
     chaser_correct: bool,
+    chaser_natural_correct: Optional[bool] = None,
 ) -> GameState:
     """
     Process a single step in the Chase phase.
 
+    `chaser_natural_correct` is whether the LLM itself (before the error
+    model) picked the right option; it only feeds the question stats.
+
     - Evaluate the player's answer (correct / incorrect).
     - Move player towards the bank if correct.
     - Move chaser towards the player if chaser_correct is True.
@@ -225,6 +301,11 @@ def process_chase_step(
     normalized_answer = player_answer.strip().upper()
     player_correct = (normalized_answer == q.correct_option)
 
+    if state.stats is not None:
+        state.stats.record_player(q, GamePhase.CHASE, player_correct)
+        if chaser_natural_correct is not None:
+            state.stats.record_chaser(q, GamePhase.CHASE, chaser_natural_correct)
+
     if player_correct and state.player.board_position is not None:
         state.player.board_position -= 1
 
@@ -256,6 +337,7 @@ def process_chase_step(
 # ---------- FINAL CHASE PHASE ----------
 
 
+@traced("engine.start_final_chase")
 def start_final_chase(
     state: GameState,
     n_player_questions: int,
@@ -269,11 +351,8 @@ def start_final_chase(
     if not state.question_pool:
         raise ValueError("Question pool is empty")
     
-    n_p = min(n_player_questions, len(state.question_pool))
-    player_qs = random.sample(state.question_pool, n_p)
-
-    n_c = min(n_chaser_questions, len(state.question_pool))
-    chaser_qs = random.sample(state.question_pool, n_c)
+    player_qs = draw_questions(state, n_player_questions)
+    chaser_qs = draw_questions(state, n_chaser_questions)
 
     state.final_chase.player_questions = player_qs
     state.final_chase.chaser_questions = chaser_qs
@@ -307,6 +386,7 @@ def get_next_final_chase_question_for_player(state: GameState) -> Optional[Quest
     return q
 
 
+@traced("engine.process_final_chase_player_answer")
 def process_final_chase_player_answer(state: GameState, player_answer: str) -> GameState:
     """
     Process the player's answer in the Final Chase.
@@ -318,15 +398,27 @@ def process_final_chase_player_answer(state: GameState, player_answer: str) -> G
         return None
     
     normalized_answer = player_answer.strip().upper()
-    if normalized_answer == q.correct_option:
+    player_correct = (normalized_answer == q.correct_option)
+
+    if player_correct:
         state.player.final_chase_score += 1
 
+    if state.stats is not None:
+        state.stats.record_player(q, GamePhase.FINAL_CHASE, player_correct)
+
     state.final_chase.player_current_index += 1
     state.current_question = None
 
     return state
 
 
+def is_final_chase_player_done(state: GameState) -> bool:
+    """
+    Return True once the player has answered all Final Chase questions.
+    """
+    return state.final_chase.player_current_index >= len(state.final_chase.player_questions)
+
+
 def get_next_final_chase_question_for_chaser(state: GameState) -> Optional[Question]:
     """
     Return the next Final Chase question for the chaser, or None if finished.
@@ -343,22 +435,33 @@ def get_next_final_chase_question_for_chaser(state: GameState) -> Optional[Quest
     return q
 
 
-def process_final_chase_chaser_answer(state: GameState, chaser_correct: bool) -> GameState:
+@traced("engine.process_final_chase_chaser_answer")
+def process_final_chase_chaser_answer(
+    state: GameState,
+    chaser_correct: bool,
+    chaser_natural_correct: Optional[bool] = None,
+    answered_question: Optional[Question] = None,
+) -> GameState:
     """
     Process the chaser's (LLM) correctness in the Final Chase.
     - Increment chaser's final_chase_score if chaser_correct.
     - Advance chaser question index.
     - When both player and chaser are finished, determine final outcome and set phase=COMPLETED.
+
+    Answers may be applied in the order they arrive rather than in question
+    order; pass `answered_question` so the stats are attributed correctly.
     """
     q = get_next_final_chase_question_for_chaser(state)
     if q is not None:
-        pass
-    else:
+        if state.stats is not None and chaser_natural_correct is not None:
+            state.stats.record_chaser(answered_question or q, GamePhase.FINAL_CHASE, chaser_natural_correct)
+
         if chaser_correct:
             state.chaser.final_chase_score += 1
         state.final_chase.chaser_current_index += 1
+        state.current_question = None
 
-    player_done = state.final_chase.player_current_index >= len(state.final_chase.player_questions)
+    player_done = is_final_chase_player_done(state)
     chaser_done = state.final_chase.chaser_current_index >= len(state.final_chase.chaser_questions)
 
     if player_done and chaser_done:
@@ -366,10 +469,10 @@ def process_final_chase_chaser_answer(state: GameState, chaser_correct: bool) ->
         cs = state.chaser.final_chase_score
 
         if ps > cs:
-            state.outcome_message("Player wins the final chase")
+            state.outcome_message = "Player wins the final chase"
 
         else:
-            state.outcome_message("Chaser wins the final chase")
+            state.outcome_message = "Chaser wins the final chase"
 
         state.phase = GamePhase.COMPLETED
         state.current_question = None
@@ -1,7 +1,11 @@
+import asyncio
+import os
 import pathlib
-from typing import List, Optional
+import threading
+from typing import TYPE_CHECKING, AsyncIterator, Dict, Iterator, List, Optional
 
 from src.utils.data_models import Question
+from src.utils.prefork import worker_path
 from src.utils.question_loader import load_questions_from_jsonl
 from .state import GameState
 from .engine import (
@@ -18,6 +22,7 @@ from .engine import (
     process_final_chase_player_answer,
     get_next_final_chase_question_for_chaser,
     process_final_chase_chaser_answer,
+    is_final_chase_player_done,
     N_CASH_BUILDER_QUESTION_DEFAULT,
     N_FINAL_PLAYER_QUESTION_DEFAULT,
     N_FINAL_CHASER_QUESTION_DEFAULT
@@ -25,18 +30,128 @@ from .engine import (
 
 from .chaser_logic import ChaserLogic, ChaserAnswer
 from src.llm.personas import get_random_persona
+from src.llm.telemetry import TELEMETRY
+
+if TYPE_CHECKING:
+    # numpy is only needed once stats or the question index are actually loaded
+    from src.utils.question_index import QuestionIndex
+    from .question_stats import QuestionStats
+    from .comment_bank import CommentBank
+
+
+# one question index per pool file, shared by every game of the process
+_question_indexes: Dict[pathlib.Path, "QuestionIndex"] = {}
+_question_indexes_lock = threading.Lock()
+
+
+def excluded_keywords_from_env() -> List[str]:
+    value = os.getenv("CHASER_EXCLUDED_KEYWORDS", "")
+    return [keyword.strip() for keyword in value.split(",") if keyword.strip()]
+
+
+def topic_balanced_from_env() -> bool:
+    return os.getenv("CHASER_TOPIC_BALANCED", "0") == "1"
+
 
 def load_default_question_pool(root_dir: pathlib.Path) -> List[Question]:
+    """
+    The processed question pool, without the questions matching
+    CHASER_EXCLUDED_KEYWORDS.
+    """
     path = root_dir / "data" / "processed" / "question_chaser.jsonl"
     if not path.exists():
         raise FileNotFoundError("Question file not found")
-    return load_questions_from_jsonl(path)
+    questions = load_questions_from_jsonl(path)
+
+    keywords = excluded_keywords_from_env()
+    if keywords:
+        questions = load_default_question_index(root_dir, questions).exclude(questions, keywords)
+
+    return questions
+
+
+def load_default_question_index(
+        root_dir: pathlib.Path,
+        questions: Optional[List[Question]] = None
+) -> "QuestionIndex":
+    """
+    The index saved by scripts/prepare_questions.py, loaded once per process.
+    It covers the whole processed pool (`questions` if already read), so
+    it also serves pools with excluded questions.
+    """
+    from src.utils.question_index import QuestionIndex
+
+    path = root_dir / "data" / "processed" / "question_chaser.index.npz"
+    with _question_indexes_lock:
+        index = _question_indexes.get(path)
+        if index is None:
+            if questions is None:
+                questions = load_questions_from_jsonl(root_dir / "data" / "processed" / "question_chaser.jsonl")
+            index = _question_indexes[path] = QuestionIndex.load(path, questions)
+
+    return index
+
+
+def load_default_draw_index(root_dir: pathlib.Path) -> Optional["QuestionIndex"]:
+    """
+    The question index games draw with, or None for uniform draws
+    (CHASER_TOPIC_BALANCED unset).
+    """
+    return load_default_question_index(root_dir) if topic_balanced_from_env() else None
+
 
+def load_default_question_stats(root_dir: pathlib.Path) -> "QuestionStats":
+    from .question_stats import QuestionStats
 
-def initialize_game(root_dir: pathlib.Path) -> GameState:
+    path = root_dir / "data" / "processed" / "question_stats.npz"
+    stats = QuestionStats(path=path)
+    stats.load()
+    # increments flushed by the workers of a multi-process run
+    stats.merge(sorted(path.parent.glob(f"{path.stem}.worker*{path.suffix}")))
+    return stats
+
+
+def load_default_comment_bank(root_dir: pathlib.Path) -> "CommentBank":
+    """
+    The comment bank built by scripts/build_comment_bank.py, not loaded
+    yet: ChaserPool.warm() loads it (if the file exists) off the request path.
+    """
+    from .comment_bank import CommentBank
+
+    return CommentBank(path=root_dir / "data" / "processed" / "comment_bank.npz")
+
+
+def start_default_llm_telemetry(root_dir: pathlib.Path, worker_index: Optional[int] = None) -> None:
+    """
+    Dump the process-wide LLM telemetry to data/processed/ periodically,
+    one file per worker in a multi-process run.
+    """
+    if TELEMETRY.path is None:
+        path = root_dir / "data" / "processed" / "llm_telemetry.json"
+        TELEMETRY.path = path if worker_index is None else worker_path(path, worker_index)
+    TELEMETRY.start_dumper()
+
+
+def initialize_game(
+        root_dir: pathlib.Path,
+        seed: Optional[int] = None,
+        stats: Optional["QuestionStats"] = None
+) -> GameState:
     questions = load_default_question_pool(root_dir)
-    state = start_new_game(questions)
-    state.persona = get_random_persona()
+
+    return initialize_game_from_pool(questions, seed=seed, stats=stats, question_index=load_default_draw_index(root_dir))
+
+
+def initialize_game_from_pool(
+        questions: List[Question],
+        seed: Optional[int] = None,
+        stats: Optional["QuestionStats"] = None,
+        question_index: Optional["QuestionIndex"] = None
+) -> GameState:
+    state = start_new_game(questions, seed=seed)
+    state.stats = stats
+    state.question_index = question_index
+    state.persona = get_random_persona(state.rng.py)
     state = start_cash_builder(state, N_CASH_BUILDER_QUESTION_DEFAULT)
     
     return state
@@ -65,6 +180,14 @@ def get_next_chase_question_for_state(state: GameState) -> Question:
 
     return q
 
+def chaser_natural_correct(chaser_answer: ChaserAnswer, q: Question) -> Optional[bool]:
+    """
+    Whether the LLM itself was right; None when a degraded step skipped it.
+    """
+    if not chaser_answer.natural_llm_choice:
+        return None
+    return chaser_answer.natural_llm_choice == q.correct_option
+
 def run_chase_step_with_chaser(
         state: GameState,
         player_answer: str,
@@ -75,19 +198,15 @@ def run_chase_step_with_chaser(
     if q is None:
         raise ValueError("No current question set in state for chase step")
     
-    chaser_answer = chaser.answer_in_chase(q)
-
-    normalized_player_answer = player_answer.strip().upper()
-    player_correct = (normalized_player_answer == q.correct_option)
+    chaser_answer, comment = chaser.answer_and_comment(q, player_answer, rng=state.rng.py)
 
     state = process_chase_step(
         state = state,
         player_answer=player_answer,
-        chaser_correct=chaser_answer.is_correct
+        chaser_correct=chaser_answer.is_correct,
+        chaser_natural_correct=chaser_natural_correct(chaser_answer, q)
     )
 
-    comment = chaser.generate_comment(question = q, player_correct=player_correct, chaser_answer=chaser_answer, player_answer_option=normalized_player_answer)
-
     return state, chaser_answer, comment
 
 def start_final_chase_default(state: GameState) -> GameState:
@@ -114,4 +233,97 @@ def advence_final_chase_chaser(state: GameState, chaser_correct: bool) -> GameSt
 def get_final_chase_player_question(state: GameState) -> Question | None:
     q = get_next_final_chase_question_for_player(state)
 
-    return q
\ No newline at end of file
+    return q
+
+
+def run_final_chase_chaser_round(
+        state: GameState,
+        chaser: ChaserLogic
+) -> Iterator[tuple[GameState, int, ChaserAnswer]]:
+    """
+    Play the chaser's half of the Final Chase.
+
+    All remaining chaser questions are answered concurrently; the state is
+    advanced and yielded as each answer arrives so callers can show progress.
+    """
+    if not is_final_chase_player_done(state):
+        raise ValueError("Player has not finished the final chase yet")
+
+    start = state.final_chase.chaser_current_index
+    remaining = state.final_chase.chaser_questions[start:]
+
+    for idx, chaser_answer in chaser.answer_final_chase(remaining, rng=state.rng.py):
+        q = remaining[idx]
+        state = process_final_chase_chaser_answer(
+            state,
+            chaser_correct=chaser_answer.is_correct,
+            chaser_natural_correct=chaser_natural_correct(chaser_answer, q),
+            answered_question=q
+        )
+
+        yield state, start + idx, chaser_answer
+
+
+# ---------- ASYNC RUNNER ----------
+# Same operations as above for async callers (the Gradio app): LLM calls
+# wait on the event loop instead of holding a worker thread.
+
+
+async def ainitialize_game(
+        root_dir: pathlib.Path,
+        seed: Optional[int] = None,
+        stats: Optional["QuestionStats"] = None
+) -> GameState:
+    return await asyncio.to_thread(initialize_game, root_dir, seed, stats)
+
+
+async def arun_chase_step_with_chaser(
+        state: GameState,
+        player_answer: str,
+        chaser: ChaserLogic
+) -> tuple[GameState, ChaserAnswer, str]:
+    """
+    Async chase step. The chaser's answer and its comment are requested
+    concurrently, so the step costs one LLM latency instead of two.
+    """
+    q = state.current_question
+    if q is None:
+        raise ValueError("No current question set in state for chase step")
+
+    chaser_answer, comment = await chaser.aanswer_and_comment(q, player_answer, rng=state.rng.py)
+
+    state = process_chase_step(
+        state = state,
+        player_answer=player_answer,
+        chaser_correct=chaser_answer.is_correct,
+        chaser_natural_correct=chaser_natural_correct(chaser_answer, q)
+    )
+
+    return state, chaser_answer, comment
+
+
+async def arun_final_chase_chaser_round(
+        state: GameState,
+        chaser: ChaserLogic,
+        flow: Optional[str] = None
+) -> AsyncIterator[tuple[GameState, int, ChaserAnswer]]:
+    """
+    `flow` (the game's session) groups the round's LLM calls in the
+    scheduler's fair queueing (src/llm/scheduler.py).
+    """
+    if not is_final_chase_player_done(state):
+        raise ValueError("Player has not finished the final chase yet")
+
+    start = state.final_chase.chaser_current_index
+    remaining = state.final_chase.chaser_questions[start:]
+
+    async for idx, chaser_answer in chaser.aanswer_final_chase(remaining, rng=state.rng.py, flow=flow):
+        q = remaining[idx]
+        state = process_final_chase_chaser_answer(
+            state,
+            chaser_correct=chaser_answer.is_correct,
+            chaser_natural_correct=chaser_natural_correct(chaser_answer, q),
+            answered_question=q
+        )
+
+        yield state, start + idx, chaser_answer
@@ -0,0 +1,226 @@
+import os
+import pathlib
+import threading
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+
+from src.utils.data_models import Question
+from .state import GamePhase
+
+N_PHASES = len(GamePhase)
+INITIAL_CAPACITY = 1024
+FLUSH_INTERVAL_SECONDS_DEFAULT = 60
+
+COUNTERS = ["player_correct", "player_attempts", "chaser_natural_correct", "chaser_attempts"]
+
+
+class QuestionStats:
+    """
+    In-process per-question answer statistics.
+
+    Question ids are mapped to dense indices on first sight. Counters are
+    stored as (phase, question) uint32 arrays, so recording an answer is a
+    dict lookup plus one increment, and queries over the whole pool are
+    vectorized.
+    """
+
+    def __init__(self, path: Optional[pathlib.Path] = None):
+        self.path = path
+        self.ids: List[str] = []
+        self._index: Dict[str, int] = {}
+        self._capacity = INITIAL_CAPACITY
+        self._counters = {
+            name: np.zeros((N_PHASES, self._capacity), dtype=np.uint32) for name in COUNTERS
+        }
+        self._lock = threading.Lock()
+        self._dirty = False
+        # counts at mark_baseline(), left out of flushes
+        self._baseline: Optional[Dict[str, np.ndarray]] = None
+
+        self._flusher: Optional[threading.Thread] = None
+        self._stop_flusher = threading.Event()
+
+    # ---------- recording ----------
+
+    def record_player(self, question: Question, phase: GamePhase, correct: bool) -> None:
+        with self._lock:
+            idx = self._index_of(question.id)
+            row = phase.value - 1
+            self._counters["player_attempts"][row, idx] += 1
+            if correct:
+                self._counters["player_correct"][row, idx] += 1
+            self._dirty = True
+
+    def record_chaser(self, question: Question, phase: GamePhase, natural_correct: bool) -> None:
+        with self._lock:
+            idx = self._index_of(question.id)
+            row = phase.value - 1
+            self._counters["chaser_attempts"][row, idx] += 1
+            if natural_correct:
+                self._counters["chaser_natural_correct"][row, idx] += 1
+            self._dirty = True
+
+    def _index_of(self, question_id: str) -> int:
+        idx = self._index.get(question_id)
+        if idx is not None:
+            return idx
+
+        idx = len(self.ids)
+        if idx >= self._capacity:
+            self._grow(max(self._capacity * 2, idx + 1))
+
+        self._index[question_id] = idx
+        self.ids.append(question_id)
+
+        return idx
+
+    def _grow(self, capacity: int) -> None:
+        for name, arr in self._counters.items():
+            grown = np.zeros((N_PHASES, capacity), dtype=arr.dtype)
+            grown[:, :arr.shape[1]] = arr
+            self._counters[name] = grown
+        self._capacity = capacity
+
+    # ---------- queries ----------
+
+    def counts(self, name: str, phase: Optional[GamePhase] = None) -> np.ndarray:
+        """
+        Counter `name` for every known question (aligned with self.ids),
+        for one phase or summed over all phases.
+        """
+        with self._lock:
+            arr = self._counters[name][:, :len(self.ids)]
+            if phase is None:
+                return arr.sum(axis=0, dtype=np.int64)
+            return arr[phase.value - 1].astype(np.int64)
+
+    def empirical_difficulty(
+        self,
+        phase: Optional[GamePhase] = None,
+        prior_correct: float = 1.0,
+        prior_wrong: float = 1.0,
+    ) -> np.ndarray:
+        """
+        Smoothed share of wrong player answers for every known question,
+        aligned with self.ids. Unseen questions get the prior mean.
+        """
+        correct = self.counts("player_correct", phase)
+        attempts = self.counts("player_attempts", phase)
+
+        return 1.0 - (correct + prior_correct) / (attempts + prior_correct + prior_wrong)
+
+    def chaser_natural_accuracy(
+        self,
+        phase: Optional[GamePhase] = None,
+        prior_correct: float = 1.0,
+        prior_wrong: float = 1.0,
+    ) -> np.ndarray:
+        correct = self.counts("chaser_natural_correct", phase)
+        attempts = self.counts("chaser_attempts", phase)
+
+        return (correct + prior_correct) / (attempts + prior_correct + prior_wrong)
+
+    def difficulty_for(self, questions: Iterable[Question], phase: Optional[GamePhase] = None) -> np.ndarray:
+        """
+        Empirical difficulty aligned with `questions`, for samplers that
+        want to weight their candidates.
+        """
+        difficulty = self.empirical_difficulty(phase)
+        prior = 0.5
+        return np.array(
+            [difficulty[self._index[q.id]] if q.id in self._index else prior for q in questions],
+            dtype=np.float64,
+        )
+
+    # ---------- persistence ----------
+
+    def flush(self, path: Optional[pathlib.Path] = None) -> bool:
+        """
+        Write the counters to disk if anything changed since the last flush.
+        The file is replaced atomically.
+        """
+        path = path or self.path
+        if path is None:
+            return False
+
+        with self._lock:
+            if not self._dirty:
+                return False
+            n = len(self.ids)
+            arrays = {name: arr[:, :n].copy() for name, arr in self._counters.items()}
+            if self._baseline is not None:
+                for name, base in self._baseline.items():
+                    arrays[name][:, :base.shape[1]] -= base
+            ids = np.array(self.ids, dtype=str)
+            self._dirty = False
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(path.name + ".tmp")
+        with tmp_path.open("wb") as f:
+            np.savez(f, ids=ids, **arrays)
+        os.replace(tmp_path, path)
+
+        return True
+
+    def mark_baseline(self) -> None:
+        """
+        From now on, flush only what is recorded after this call. Used by
+        pre-forked workers: they share the counters loaded by the parent,
+        and each flushes its own increments to its own file.
+        """
+        with self._lock:
+            n = len(self.ids)
+            self._baseline = {name: arr[:, :n].copy() for name, arr in self._counters.items()}
+            self._dirty = False
+
+    def merge(self, paths: Iterable[pathlib.Path]) -> int:
+        """
+        Fold the counters of other files (e.g. the workers' increments) into
+        this store, write it to self.path and delete them. Returns how many
+        files were merged.
+        """
+        paths = [p for p in paths if p.exists() and p != self.path]
+        for path in paths:
+            self.load(path)
+
+        if paths:
+            with self._lock:
+                self._dirty = True
+            self.flush()
+            for path in paths:
+                path.unlink()
+
+        return len(paths)
+
+    def load(self, path: Optional[pathlib.Path] = None) -> None:
+        """
+        Add counters previously flushed to `path` to this store.
+        """
+        path = path or self.path
+        if path is None or not path.exists():
+            return
+
+        with np.load(path) as data:
+            ids = [str(qid) for qid in data["ids"]]
+            with self._lock:
+                indices = np.array([self._index_of(qid) for qid in ids], dtype=np.int64)
+                for name in COUNTERS:
+                    self._counters[name][:, indices] += data[name].astype(np.uint32)
+
+    def start_flusher(self, interval_seconds: float = FLUSH_INTERVAL_SECONDS_DEFAULT) -> None:
+        if self._flusher is not None and self._flusher.is_alive():
+            return
+
+        self._stop_flusher.clear()
+
+        def loop() -> None:
+            while not self._stop_flusher.wait(interval_seconds):
+                self.flush()
+
+        self._flusher = threading.Thread(target=loop, name="question-stats-flusher", daemon=True)
+        self._flusher.start()
+
+    def stop_flusher(self) -> None:
+        self._stop_flusher.set()
+        self.flush()
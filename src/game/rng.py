@@ -0,0 +1,33 @@
+import hashlib
+import random
+import secrets
+from typing import Optional
+
+
+def new_seed() -> int:
+    return secrets.randbits(63)
+
+
+def derive_seed(base_seed: int, index: int) -> int:
+    """
+    Derive an independent, reproducible seed for the index-th game of a run,
+    so simulations can be sharded across processes deterministically.
+    """
+    digest = hashlib.blake2b(f"{base_seed}:{index}".encode("ascii"), digest_size=8).digest()
+    return int.from_bytes(digest, "big") >> 1
+
+
+class GameRng:
+    """
+    Per-game random state.
+
+    `py` is a random.Random used by the engine, personas and the chaser
+    error model. A game can be replayed from `seed` alone.
+    """
+
+    def __init__(self, seed: Optional[int] = None):
+        self.seed = new_seed() if seed is None else seed
+        self.py = random.Random(self.seed)
+
+    def __repr__(self) -> str:
+        return f"GameRng(seed={self.seed})"
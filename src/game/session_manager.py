@@ -0,0 +1,246 @@
+import asyncio
+import sys
+import threading
+import time
+import uuid
+from collections import OrderedDict, deque
+from dataclasses import dataclass, field
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+
+from src.utils.memory import get_private_bytes, get_rss_bytes
+from .state import GameState
+from .chaser_logic import ChaserLogic
+
+SESSION_TTL_SECONDS_DEFAULT = 30 * 60
+SESSION_MAX_MEMORY_BYTES_DEFAULT = 1024 * 1024 * 1024
+SWEEP_INTERVAL_SECONDS_DEFAULT = 60
+SESSION_SPANS_MAX = 500
+
+
+def estimate_state_bytes(state: GameState) -> int:
+    """
+    Rough size of what a GameState holds on its own. The questions are
+    shared by every game of the process (start_new_game only copies the
+    list), so only the lists pointing to them are counted.
+    """
+    size = sys.getsizeof(state) + sys.getsizeof(state.question_pool)
+    size += sys.getsizeof(state.cash_builder.questions) + sys.getsizeof(state.chase.question_ids_used)
+    size += sys.getsizeof(state.final_chase.player_questions) + sys.getsizeof(state.final_chase.chaser_questions)
+    size += sys.getsizeof(state.drawn_terms)
+
+    return size
+
+
+def estimate_session_bytes(session: "GameSession") -> int:
+    """
+    estimate_state_bytes() plus the UI cache and the spans of the session.
+    """
+    size = estimate_state_bytes(session.state)
+    size += sys.getsizeof(session.ui_cache) + sum(sys.getsizeof(v) for v in session.ui_cache.values())
+    size += sys.getsizeof(session.spans)
+
+    return size
+
+
+@dataclass
+class GameSession:
+    session_id: str
+    state: GameState
+    chaser: Optional[ChaserLogic] = None
+    # False for chasers borrowed from a ChaserPool, which outlive the game
+    owns_chaser: bool = True
+    created_at: float = 0.0
+    last_active: float = 0.0
+    size_bytes: int = 0
+    # last value sent to each UI component, used to send only what changed
+    ui_cache: Dict[Any, Any] = field(default_factory=dict)
+    # (span name, seconds) of the latest traced calls made for this game
+    spans: Deque[Tuple[str, float]] = field(default_factory=lambda: deque(maxlen=SESSION_SPANS_MAX), repr=False)
+    # serializes async requests (HTTP API) that touch the same game
+    lock: asyncio.Lock = field(default_factory=asyncio.Lock, repr=False)
+
+    def close(self) -> None:
+        if self.chaser is not None and self.owns_chaser:
+            self.chaser.close()
+        self.chaser = None
+
+
+class SessionManager:
+    """
+    Process-level registry of live games.
+
+    Sessions are kept in LRU order. Idle sessions are evicted after
+    `ttl_seconds`, and the least recently used ones are evicted whenever
+    the estimated total size goes over `max_memory_bytes`. Evicted sessions
+    have their LLM clients closed, unless the chaser is shared.
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: float = SESSION_TTL_SECONDS_DEFAULT,
+        max_memory_bytes: int = SESSION_MAX_MEMORY_BYTES_DEFAULT,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.ttl_seconds = ttl_seconds
+        self.max_memory_bytes = max_memory_bytes
+        self.clock = clock
+
+        self._sessions: "OrderedDict[str, GameSession]" = OrderedDict()
+        self._memory_bytes = 0
+        self._lock = threading.Lock()
+
+        self.evicted_ttl = 0
+        self.evicted_memory = 0
+
+        self._sweeper: Optional[threading.Thread] = None
+        self._stop_sweeper = threading.Event()
+
+    def create(
+        self,
+        state: GameState,
+        chaser: Optional[ChaserLogic] = None,
+        owns_chaser: bool = True,
+    ) -> GameSession:
+        now = self.clock()
+        session = GameSession(
+            session_id=uuid.uuid4().hex,
+            state=state,
+            chaser=chaser,
+            owns_chaser=owns_chaser,
+            created_at=now,
+            last_active=now,
+        )
+        session.size_bytes = estimate_session_bytes(session)
+
+        with self._lock:
+            self._sessions[session.session_id] = session
+            self._memory_bytes += session.size_bytes
+            evicted = self._evict_locked(now)
+
+        self._close_all(evicted)
+
+        return session
+
+    def get(self, session_id: Optional[str]) -> Optional[GameSession]:
+        """
+        Return the session and mark it as active, or None if it is unknown
+        or has expired.
+        """
+        if not session_id:
+            return None
+
+        now = self.clock()
+        evicted: List[GameSession] = []
+
+        with self._lock:
+            session = self._sessions.get(session_id)
+
+            if session is not None and now - session.last_active > self.ttl_seconds:
+                self._pop_locked(session_id)
+                self.evicted_ttl += 1
+                evicted.append(session)
+                session = None
+
+            if session is not None:
+                session.last_active = now
+                self._sessions.move_to_end(session_id)
+                # the game and its UI cache grow as it is played
+                size_bytes = estimate_session_bytes(session)
+                self._memory_bytes += size_bytes - session.size_bytes
+                session.size_bytes = size_bytes
+
+        self._close_all(evicted)
+
+        return session
+
+    def remove(self, session_id: Optional[str]) -> None:
+        if not session_id:
+            return
+
+        with self._lock:
+            session = self._pop_locked(session_id)
+
+        if session is not None:
+            session.close()
+
+    def evict_expired(self) -> int:
+        with self._lock:
+            evicted = self._evict_locked(self.clock())
+
+        self._close_all(evicted)
+
+        return len(evicted)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "live_sessions": len(self._sessions),
+                "sessions_memory_bytes": self._memory_bytes,
+                "max_memory_bytes": self.max_memory_bytes,
+                "evicted_ttl": self.evicted_ttl,
+                "evicted_memory": self.evicted_memory,
+                "process_rss_bytes": get_rss_bytes(),
+                "process_private_bytes": get_private_bytes(),
+            }
+
+    def metrics(self) -> Dict[str, int]:
+        """
+        stats() as Prometheus gauge names.
+        """
+        return {f"chaser_{name}": value for name, value in self.stats().items()}
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    def start_sweeper(self, interval_seconds: float = SWEEP_INTERVAL_SECONDS_DEFAULT) -> None:
+        """
+        Start a daemon thread that evicts expired sessions periodically,
+        so abandoned tabs are reclaimed even when no new requests arrive.
+        """
+        if self._sweeper is not None and self._sweeper.is_alive():
+            return
+
+        self._stop_sweeper.clear()
+
+        def loop() -> None:
+            while not self._stop_sweeper.wait(interval_seconds):
+                self.evict_expired()
+
+        self._sweeper = threading.Thread(target=loop, name="session-sweeper", daemon=True)
+        self._sweeper.start()
+
+    def stop_sweeper(self) -> None:
+        self._stop_sweeper.set()
+
+    def _pop_locked(self, session_id: str) -> Optional[GameSession]:
+        session = self._sessions.pop(session_id, None)
+        if session is not None:
+            self._memory_bytes -= session.size_bytes
+
+        return session
+
+    def _evict_locked(self, now: float) -> List[GameSession]:
+        evicted: List[GameSession] = []
+
+        # LRU order: the oldest activity is at the front
+        while self._sessions:
+            session = next(iter(self._sessions.values()))
+            if now - session.last_active <= self.ttl_seconds:
+                break
+            self._pop_locked(session.session_id)
+            self.evicted_ttl += 1
+            evicted.append(session)
+
+        # never evict the session that was just created or touched
+        while len(self._sessions) > 1 and self._memory_bytes > self.max_memory_bytes:
+            session = next(iter(self._sessions.values()))
+            self._pop_locked(session.session_id)
+            self.evicted_memory += 1
+            evicted.append(session)
+
+        return evicted
+
+    @staticmethod
+    def _close_all(sessions: List[GameSession]) -> None:
+        for session in sessions:
+            session.close()
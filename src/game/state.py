@@ -1,9 +1,14 @@
 from dataclasses import dataclass, field
 from enum import Enum, auto
-from typing import List, Optional
+from typing import TYPE_CHECKING, List, Optional, Set
 
 from src.utils.data_models import Question
 from src.llm.personas import ChaserPersona
+from .rng import GameRng
+
+if TYPE_CHECKING:
+    from src.utils.question_index import QuestionIndex
+    from .question_stats import QuestionStats
 
 class GamePhase(Enum):
     CASH_BUILDER = auto()
@@ -62,6 +67,8 @@ class FinalChaseState:
 class GameState:
     phase: GamePhase = GamePhase.CASH_BUILDER
 
+    rng: GameRng = field(default_factory=GameRng)
+
     persona: Optional[ChaserPersona] = None
 
     player: PlayerState = field(default_factory=PlayerState)
@@ -74,4 +81,12 @@ class GameState:
 
     question_pool: List[Question] = field(default_factory = list)
     current_question: Optional[Question] = None
-    outcome_message: Optional[str] = None
\ No newline at end of file
+    outcome_message: Optional[str] = None
+
+    # shared, process-level store; None disables per-question stats
+    stats: Optional["QuestionStats"] = None
+
+    # shared, loaded with the pool; None draws questions uniformly
+    question_index: Optional["QuestionIndex"] = None
+    # rare terms of the questions drawn so far (see engine.draw_questions)
+    drawn_terms: Set[int] = field(default_factory=set)
@@ -0,0 +1,326 @@
+"""
+Headless games: a contestant (bot or LLM) plays complete games against
+ChaserLogic through game_runner, with no human input. Used to benchmark
+throughput, LLM usage and latency per phase.
+"""
+
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional
+
+from src.utils.data_models import Question
+from src.utils.latency import latency_percentiles
+from src.llm.client import collect_usage
+from src.llm.personas import ChaserPersona
+from src.llm.question_answerer import QuestionAnswerer
+from src.llm.telemetry import TELEMETRY, CALL_TYPE_CONTESTANT
+from src.llm.router import ROUTER
+from .state import GamePhase, OfferState
+from .rng import GameRng, derive_seed, new_seed
+from .chaser_logic import ChaserLogic
+from .chaser_pool import ChaserPool
+from .game_runner import (
+    initialize_game_from_pool,
+    get_cash_builder_question,
+    advence_cash_builder,
+    prepare_chase_offers,
+    choose_chase_offer,
+    get_next_chase_question_for_state,
+    run_chase_step_with_chaser,
+    start_final_chase_default,
+    advence_final_chase_player,
+    get_final_chase_player_question,
+    run_final_chase_chaser_round
+)
+
+if TYPE_CHECKING:
+    from src.utils.question_index import QuestionIndex
+
+PHASES = ["cash_builder", "chase_step", "final_chase_player", "final_chase_chaser"]
+MAX_CHASE_STEPS = 200
+CONTESTANT_SEED_STREAM = 1
+
+
+class BotContestant:
+    """
+    Answers correctly with probability `accuracy`, otherwise picks one of
+    the wrong options. Makes no LLM calls.
+
+    Contestants keep no per-game state (every game passes its own rng), so
+    one instance plays all the games of a run.
+    """
+
+    def __init__(self, accuracy: float = 0.6, offer_choice: str = "mid"):
+        self.accuracy = accuracy
+        self.offer_choice = offer_choice
+
+    def answer(self, question: Question, rng: random.Random) -> str:
+        if rng.random() < self.accuracy:
+            return question.correct_option
+
+        return rng.choice([opt for opt in ["A", "B", "C", "D"] if opt != question.correct_option])
+
+    def choose_offer(self, offers: OfferState, rng: random.Random) -> str:
+        if self.offer_choice == "random":
+            return rng.choice(["low", "mid", "high"])
+
+        return self.offer_choice
+
+    def close(self) -> None:
+        pass
+
+
+class LLMContestant(BotContestant):
+    """
+    Lets an LLM play the contestant role. An unparsable answer counts as wrong.
+    """
+
+    def __init__(self, model: str = "gpt-4.1-mini", offer_choice: str = "mid"):
+        super().__init__(accuracy=0.0, offer_choice=offer_choice)
+        self.qa = QuestionAnswerer(model=model)
+
+    def answer(self, question: Question, rng: random.Random) -> str:
+        try:
+            chosen, _ = self.qa.answer_question(question, call_type=CALL_TYPE_CONTESTANT)
+        except ValueError:
+            return "X"
+
+        return chosen
+
+    def close(self) -> None:
+        self.qa.close()
+
+
+@dataclass
+class GameResult:
+    seed: int
+    persona: str = ""
+    outcome: str = ""
+    secured_cash: int = 0
+    llm_calls: int = 0
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    chaser_answers: int = 0
+    chaser_natural_correct: int = 0
+    # chase steps finished without the LLM's answer (see degraded.py)
+    degraded_steps: int = 0
+    phase_latencies: Dict[str, List[float]] = field(default_factory=lambda: {p: [] for p in PHASES})
+    error: Optional[str] = None
+
+
+def play_headless_game(
+        questions: List[Question],
+        seed: int,
+        contestant: BotContestant,
+        make_chaser: Callable[[ChaserPersona], ChaserLogic],
+        question_index: Optional["QuestionIndex"] = None
+) -> GameResult:
+    """
+    Play one complete game (Cash Builder -> offers -> Chase -> Final Chase)
+    through game_runner and return what happened and how long each step took.
+
+    The contestant and the chasers from `make_chaser` may be shared with
+    other games: they are not closed here, and the game's LLM usage is
+    counted with collect_usage() rather than read from their clients.
+    """
+    result = GameResult(seed=seed)
+    latencies = result.phase_latencies
+
+    state = initialize_game_from_pool(questions, seed=seed, question_index=question_index)
+    contestant_rng = GameRng(derive_seed(seed, CONTESTANT_SEED_STREAM)).py
+    result.persona = state.persona.key
+
+    chaser = make_chaser(state.persona)
+
+    with collect_usage() as usage:
+        try:
+            while state.phase == GamePhase.CASH_BUILDER:
+                q = get_cash_builder_question(state)
+                if q is None:
+                    break
+
+                t0 = time.perf_counter()
+                state = advence_cash_builder(state, contestant.answer(q, contestant_rng))
+                latencies["cash_builder"].append(time.perf_counter() - t0)
+
+            offers = prepare_chase_offers(state)
+            state = choose_chase_offer(state, offers, contestant.choose_offer(offers, contestant_rng))
+
+            steps = 0
+            while state.phase == GamePhase.CHASE and steps < MAX_CHASE_STEPS:
+                q = get_next_chase_question_for_state(state)
+
+                t0 = time.perf_counter()
+                player_answer = contestant.answer(q, contestant_rng)
+                state, chaser_answer, _ = run_chase_step_with_chaser(state, player_answer, chaser)
+                latencies["chase_step"].append(time.perf_counter() - t0)
+
+                if chaser_answer.natural_llm_choice:
+                    result.chaser_answers += 1
+                    result.chaser_natural_correct += int(chaser_answer.natural_llm_choice == q.correct_option)
+                if chaser_answer.degraded_reason is not None:
+                    result.degraded_steps += 1
+                steps += 1
+
+            if state.phase == GamePhase.CHASE:
+                result.outcome = "abandoned"
+
+            elif state.phase == GamePhase.COMPLETED:
+                result.outcome = "caught"
+
+            else:
+                state = start_final_chase_default(state)
+
+                while True:
+                    q = get_final_chase_player_question(state)
+                    if q is None:
+                        break
+
+                    t0 = time.perf_counter()
+                    state = advence_final_chase_player(state, contestant.answer(q, contestant_rng))
+                    latencies["final_chase_player"].append(time.perf_counter() - t0)
+
+                t0 = time.perf_counter()
+                for state, idx, chaser_answer in run_final_chase_chaser_round(state, chaser):
+                    q = state.final_chase.chaser_questions[idx]
+                    if chaser_answer.natural_llm_choice:
+                        result.chaser_answers += 1
+                        result.chaser_natural_correct += int(chaser_answer.natural_llm_choice == q.correct_option)
+                    if chaser_answer.degraded_reason is not None:
+                        result.degraded_steps += 1
+                latencies["final_chase_chaser"].append(time.perf_counter() - t0)
+
+                if state.player.final_chase_score > state.chaser.final_chase_score:
+                    result.outcome = "player_won"
+                else:
+                    result.outcome = "chaser_won"
+
+            result.secured_cash = state.player.secured_cash if result.outcome == "player_won" else 0
+
+        finally:
+            result.llm_calls = usage.calls
+            result.prompt_tokens = usage.prompt_tokens
+            result.completion_tokens = usage.completion_tokens
+
+    return result
+
+
+@dataclass
+class TournamentConfig:
+    n_games: int = 100
+    concurrency: int = 32
+    base_seed: Optional[int] = None
+    chaser_model: str = "gpt-4.1-mini"
+    p_correct: float = 0.75
+    contestant: str = "bot"
+    contestant_model: str = "gpt-4.1-mini"
+    bot_accuracy: float = 0.6
+    offer_choice: str = "mid"
+
+
+def make_contestant(config: TournamentConfig) -> BotContestant:
+    if config.contestant == "llm":
+        return LLMContestant(model=config.contestant_model, offer_choice=config.offer_choice)
+
+    if config.contestant == "bot":
+        return BotContestant(accuracy=config.bot_accuracy, offer_choice=config.offer_choice)
+
+    raise ValueError(f"Unknown contestant type: {config.contestant!r}")
+
+
+def run_tournament(
+        questions: List[Question],
+        config: TournamentConfig,
+        make_chaser: Optional[Callable[[ChaserPersona], ChaserLogic]] = None,
+        on_result: Optional[Callable[[GameResult], None]] = None,
+        question_index: Optional["QuestionIndex"] = None
+) -> Dict:
+    """
+    Play `config.n_games` headless games with at most `config.concurrency`
+    running at once and return the summary report.
+
+    Game i is seeded with derive_seed(base_seed, i), so a run (or any single
+    game of it) can be reproduced from the base seed.
+    """
+    base_seed = new_seed() if config.base_seed is None else config.base_seed
+
+    # one chaser per persona and one LLM client for the whole run, so
+    # concurrent games share a connection pool and coalesce identical questions
+    pool = None
+    if make_chaser is None:
+        pool = ChaserPool()
+
+        def make_chaser(persona: ChaserPersona) -> ChaserLogic:
+            return pool.get(persona, model=config.chaser_model, p_correct=config.p_correct)
+
+    contestant = make_contestant(config)
+
+    def play(i: int) -> GameResult:
+        seed = derive_seed(base_seed, i)
+        try:
+            return play_headless_game(questions, seed, contestant, make_chaser, question_index)
+        except Exception as e:
+            return GameResult(seed=seed, outcome="error", error=f"{type(e).__name__}: {e}")
+
+    results: List[GameResult] = []
+    t0 = time.perf_counter()
+
+    try:
+        with ThreadPoolExecutor(max_workers=config.concurrency) as executor:
+            futures = [executor.submit(play, i) for i in range(config.n_games)]
+
+            for future in as_completed(futures):
+                result = future.result()
+                results.append(result)
+                if on_result is not None:
+                    on_result(result)
+    finally:
+        if pool is not None:
+            pool.close()
+        contestant.close()
+
+    wall_seconds = time.perf_counter() - t0
+
+    report = summarize_results(results, wall_seconds)
+    report["base_seed"] = base_seed
+    report["llm_telemetry"] = TELEMETRY.snapshot()["rows"]
+    report["llm_routing"] = ROUTER.snapshot()["decisions"]
+
+    return report
+
+
+def summarize_results(results: List[GameResult], wall_seconds: float) -> Dict:
+    ok = [r for r in results if r.error is None]
+    n_ok = max(len(ok), 1)
+
+    outcomes: Dict[str, int] = {}
+    for r in results:
+        outcomes[r.outcome] = outcomes.get(r.outcome, 0) + 1
+
+    chaser_answers = sum(r.chaser_answers for r in ok)
+    prompt_tokens = sum(r.prompt_tokens for r in ok)
+    completion_tokens = sum(r.completion_tokens for r in ok)
+
+    return {
+        "games": len(results),
+        "errors": len(results) - len(ok),
+        "wall_seconds": round(wall_seconds, 3),
+        "games_per_sec": round(len(results) / wall_seconds, 3) if wall_seconds > 0 else 0.0,
+        "llm_calls_per_game": round(sum(r.llm_calls for r in ok) / n_ok, 3),
+        "prompt_tokens_per_game": round(prompt_tokens / n_ok, 1),
+        "completion_tokens_per_game": round(completion_tokens / n_ok, 1),
+        "tokens_per_game": round((prompt_tokens + completion_tokens) / n_ok, 1),
+        "outcomes": outcomes,
+        "mean_secured_cash": round(sum(r.secured_cash for r in ok) / n_ok, 1),
+        "degraded_steps": sum(r.degraded_steps for r in ok),
+        "chaser_natural_accuracy": round(
+            sum(r.chaser_natural_correct for r in ok) / chaser_answers, 4
+        ) if chaser_answers else None,
+        "latency_by_phase": {
+            phase: latency_percentiles([t for r in ok for t in r.phase_latencies[phase]])
+            for phase in PHASES
+        },
+        "sample_errors": [r.error for r in results if r.error is not None][:5],
+    }
@@ -0,0 +1,289 @@
+"""
+Record/replay transport for the LLM client.
+
+Real LLM output and latency change from run to run, so two end-to-end
+runs of the same code are not comparable. A cassette fixes both: in
+record mode the HTTP transport under OpenAIClient passes requests to the
+network and appends every request/response pair, with the latency it took,
+to a JSONL file; in replay mode it serves the recorded responses back
+without any network, instantly or with the recorded latency scaled by
+`speed`. A seeded game sends the same requests, so it gets the same
+answers and comments, and timing differences come from the code alone.
+
+Requests are matched on method, path and JSON body (so on model, prompts
+and parameters, not on host or headers). Identical requests are served
+the recorded responses in order, cycling when there are more requests
+than recordings. A request that was never recorded gets a 404 error.
+
+The transports are built on the HTTP library of the installed OpenAI SDK
+(httpx, or its httpx2 fork in recent releases), imported on first use.
+
+Set CHASER_CASSETTE=<path> and CHASER_CASSETTE_MODE=record|replay (default
+replay); CHASER_CASSETTE_SPEED=1 replays with the recorded latencies
+(default 0: no delay).
+"""
+
+import asyncio
+import hashlib
+import importlib
+import json
+import os
+import pathlib
+import threading
+import time
+from types import ModuleType
+from typing import Any, Dict, List, Optional
+
+CASSETTE_MODE_RECORD = "record"
+CASSETTE_MODE_REPLAY = "replay"
+
+# recomputed by httpx for the body served back
+DROPPED_HEADERS = {"content-encoding", "content-length", "transfer-encoding", "connection"}
+
+
+def sdk_http_module() -> ModuleType:
+    """
+    The httpx flavour the OpenAI SDK's clients (and so its requests and
+    responses) come from.
+    """
+    from openai import DefaultHttpxClient
+
+    return importlib.import_module(DefaultHttpxClient.__mro__[1].__module__.partition(".")[0])
+
+
+def request_key(method: str, path: str, body: bytes) -> str:
+    try:
+        # key order does not change the request
+        canonical = json.dumps(json.loads(body), sort_keys=True, separators=(",", ":"))
+    except ValueError:
+        canonical = body.decode("utf-8", errors="replace")
+
+    return hashlib.blake2b(f"{method} {path}\n{canonical}".encode("utf-8"), digest_size=16).hexdigest()
+
+
+class Cassette:
+    def __init__(self, path: pathlib.Path, mode: str = CASSETTE_MODE_REPLAY, speed: float = 0.0):
+        if mode not in (CASSETTE_MODE_RECORD, CASSETTE_MODE_REPLAY):
+            raise ValueError(f"Unknown cassette mode: {mode!r}")
+
+        self.path = pathlib.Path(path)
+        self.mode = mode
+        self.speed = speed
+        self.http = sdk_http_module()
+
+        self._lock = threading.Lock()
+        self._entries: Dict[str, List[Dict[str, Any]]] = {}
+        self._next: Dict[str, int] = {}
+        self.recorded = 0
+        self.hits = 0
+        self.misses = 0
+
+        if self.replaying:
+            self._load()
+
+    @classmethod
+    def from_env(cls) -> Optional["Cassette"]:
+        path = os.getenv("CHASER_CASSETTE")
+        if not path:
+            return None
+
+        return open_cassette(
+            pathlib.Path(path),
+            os.getenv("CHASER_CASSETTE_MODE", CASSETTE_MODE_REPLAY),
+            float(os.getenv("CHASER_CASSETTE_SPEED", "0"))
+        )
+
+    @property
+    def replaying(self) -> bool:
+        return self.mode == CASSETTE_MODE_REPLAY
+
+    def _load(self) -> None:
+        if not self.path.exists():
+            raise FileNotFoundError(f"Cassette not found: {self.path}")
+
+        with self.path.open("r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    # cut short by a killed recording
+                    continue
+                self._entries.setdefault(entry["key"], []).append(entry)
+
+    # ---------- record ----------
+
+    def record(self, request, response, latency_seconds: float) -> None:
+        body = request.content
+        try:
+            request_body: Any = json.loads(body)
+        except ValueError:
+            request_body = body.decode("utf-8", errors="replace")
+
+        entry = {
+            "key": request_key(request.method, request.url.path, body),
+            "method": request.method,
+            "path": request.url.path,
+            "request": request_body,
+            "status": response.status_code,
+            "headers": {k: v for k, v in response.headers.items() if k.lower() not in DROPPED_HEADERS},
+            "body": response.content.decode("utf-8", errors="replace"),
+            "latency_seconds": round(latency_seconds, 6),
+        }
+        line = json.dumps(entry, ensure_ascii=False) + "\n"
+
+        with self._lock:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            # one write per line in append mode: forked workers can share the file
+            with self.path.open("a", encoding="utf-8") as f:
+                f.write(line)
+            self.recorded += 1
+
+    # ---------- replay ----------
+
+    def lookup(self, request) -> Optional[Dict[str, Any]]:
+        key = request_key(request.method, request.url.path, request.content)
+        with self._lock:
+            entries = self._entries.get(key)
+            if not entries:
+                self.misses += 1
+                return None
+
+            i = self._next.get(key, 0)
+            self._next[key] = i + 1
+            self.hits += 1
+            return entries[i % len(entries)]
+
+    def delay(self, entry: Optional[Dict[str, Any]]) -> float:
+        if entry is None or self.speed <= 0:
+            return 0.0
+        return entry["latency_seconds"] / self.speed
+
+    def replay_response(self, request, entry: Optional[Dict[str, Any]]):
+        if entry is None:
+            return self.http.Response(
+                404,
+                json={"error": {"message": "No recorded response for this request", "type": "cassette_miss"}},
+                request=request
+            )
+
+        return self.http.Response(
+            entry["status"],
+            headers=entry["headers"],
+            content=entry["body"].encode("utf-8"),
+            request=request
+        )
+
+    # ---------- transports ----------
+
+    def transport(self) -> "CassetteTransport":
+        return CassetteTransport(self)
+
+    def async_transport(self) -> "AsyncCassetteTransport":
+        return AsyncCassetteTransport(self)
+
+    def detached(self, request, response):
+        """
+        A copy of a read response that owns its (already decoded) body.
+        """
+        return self.http.Response(
+            response.status_code,
+            headers=[(k, v) for k, v in response.headers.items() if k.lower() not in DROPPED_HEADERS],
+            content=response.content,
+            request=request
+        )
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "cassette_mode": self.mode,
+            "cassette_recorded": self.recorded,
+            "cassette_hits": self.hits,
+            "cassette_misses": self.misses,
+        }
+
+
+class CassetteTransport:
+    """
+    Sync transport (the httpx transport interface is duck-typed).
+    """
+    def __init__(self, cassette: Cassette):
+        self.cassette = cassette
+        self._inner = None if cassette.replaying else cassette.http.HTTPTransport()
+
+    def __enter__(self) -> "CassetteTransport":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def handle_request(self, request):
+        if self._inner is None:
+            entry = self.cassette.lookup(request)
+            delay = self.cassette.delay(entry)
+            if delay:
+                time.sleep(delay)
+            return self.cassette.replay_response(request, entry)
+
+        t0 = time.perf_counter()
+        response = self._inner.handle_request(request)
+        try:
+            response.read()
+        finally:
+            response.close()
+        self.cassette.record(request, response, time.perf_counter() - t0)
+
+        return self.cassette.detached(request, response)
+
+    def close(self) -> None:
+        if self._inner is not None:
+            self._inner.close()
+
+
+class AsyncCassetteTransport:
+    def __init__(self, cassette: Cassette):
+        self.cassette = cassette
+        self._inner = None if cassette.replaying else cassette.http.AsyncHTTPTransport()
+
+    async def __aenter__(self) -> "AsyncCassetteTransport":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.aclose()
+
+    async def handle_async_request(self, request):
+        if self._inner is None:
+            entry = self.cassette.lookup(request)
+            delay = self.cassette.delay(entry)
+            if delay:
+                await asyncio.sleep(delay)
+            return self.cassette.replay_response(request, entry)
+
+        t0 = time.perf_counter()
+        response = await self._inner.handle_async_request(request)
+        try:
+            await response.aread()
+        finally:
+            await response.aclose()
+        self.cassette.record(request, response, time.perf_counter() - t0)
+
+        return self.cassette.detached(request, response)
+
+    async def aclose(self) -> None:
+        if self._inner is not None:
+            await self._inner.aclose()
+
+
+_cassettes: Dict[pathlib.Path, Cassette] = {}
+_cassettes_lock = threading.Lock()
+
+
+def open_cassette(path: pathlib.Path, mode: str = CASSETTE_MODE_REPLAY, speed: float = 0.0) -> Cassette:
+    """
+    One Cassette per file in a process, shared by every client: replay
+    order and recorded lines stay consistent across clients.
+    """
+    key = pathlib.Path(path).resolve()
+    with _cassettes_lock:
+        cassette = _cassettes.get(key)
+        if cassette is None:
+            cassette = _cassettes[key] = Cassette(key, mode, speed)
+        return cassette
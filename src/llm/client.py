@@ -1,29 +1,390 @@
+import asyncio
+import contextvars
 import os
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
 
-from typing import Optional
-from dotenv import load_dotenv
+from typing import TYPE_CHECKING, Iterator, Optional
+
+from src.utils.tracing import traced
+from .hedging import Hedger, HedgePolicy
+from .router import ROUTER
+from .scheduler import SCHEDULER
+from .telemetry import TELEMETRY, CALL_TYPE_OTHER, LLMCallRecord
+
+if TYPE_CHECKING:
+    from openai import AsyncOpenAI, DefaultAsyncHttpxClient, DefaultHttpxClient, OpenAI
+
+    from .cassette import Cassette
+
+
+@dataclass
+class ClientUsage:
+    calls: int = 0
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False, compare=False)
+
+    def record(self, prompt_tokens: int, completion_tokens: int) -> None:
+        with self._lock:
+            self.calls += 1
+            self.prompt_tokens += prompt_tokens
+            self.completion_tokens += completion_tokens
+
+    @property
+    def total_tokens(self) -> int:
+        return self.prompt_tokens + self.completion_tokens
+
+
+# usage of the calls made inside a collect_usage() block
+_usage_collector: contextvars.ContextVar[Optional[ClientUsage]] = contextvars.ContextVar(
+    "llm_usage_collector", default=None
+)
+
+
+@contextmanager
+def collect_usage() -> Iterator[ClientUsage]:
+    """
+    Count the LLM calls and tokens of the block (including tasks started
+    from it) on their own, even when the client is shared with other callers.
+    """
+    usage = ClientUsage()
+    token = _usage_collector.set(usage)
+    try:
+        yield usage
+    finally:
+        _usage_collector.reset(token)
 
-from openai import OpenAI
 
 class OpenAIClient:
-    def __init__(self, model: str = "gpt-4.1-mini"):
+    def __init__(
+            self,
+            model: str = "gpt-4.1-mini",
+            hedge: Optional[HedgePolicy] = None,
+            cassette: Optional["Cassette"] = None
+    ):
+        """
+        `hedge` turns on hedged requests (src/llm/hedging.py); by default it
+        is read from the CHASER_HEDGE* env variables, and off. `cassette`
+        records or replays the HTTP traffic (src/llm/cassette.py); by default
+        it is read from the CHASER_CASSETTE* env variables, and off.
+        """
+        # imported here: the SDK takes ~0.6 s to import and most entry points
+        # (scripts, engine, API health checks) never need it
+        from dotenv import load_dotenv
+        from openai import OpenAI
+
         load_dotenv()
 
+        if cassette is None and os.getenv("CHASER_CASSETTE"):
+            from .cassette import Cassette
+            cassette = Cassette.from_env()
+        self.cassette = cassette
+
         api_key = os.getenv("OPENAI_API_KEY")
+        if not api_key and cassette is not None and cassette.replaying:
+            # a replay never reaches the API
+            api_key = "replay"
         if not api_key:
             raise ValueError("OPENAI_API_KEY env variable not set")
         
         self.model = model
-        self.client = OpenAI(api_key = api_key)
+        self.api_key = api_key
+        self.client = OpenAI(api_key = api_key, http_client = self._http_client())
+        self.usage = ClientUsage()
+
+        # created on first async call, so sync-only users never pay for it
+        self._async_client: Optional["AsyncOpenAI"] = None
+        # loop the async clients' connections are bound to (the latest one used)
+        self._async_loop: Optional[asyncio.AbstractEventLoop] = None
+
+        # hedge targets are (model, base_url), None meaning the routed model / primary backend
+        self.hedger: Optional[Hedger] = None
+        self._alternate_client: Optional["OpenAI"] = None
+        self._alternate_async_client: Optional["AsyncOpenAI"] = None
+        hedge = hedge or HedgePolicy.from_env()
+        if hedge is not None:
+            self.hedger = Hedger(hedge, (None, None), (hedge.alternate_model, hedge.alternate_base_url))
+
+    def chat(
+            self,
+            system_prompt: str,
+            user_prompt: str,
+            call_type: str = CALL_TYPE_OTHER,
+            persona: str = "none"
+    ) -> str:
+        """
+        `call_type` and `persona` only label the call in the LLM telemetry.
+        """
+        response = self.complete(system_prompt, user_prompt, call_type=call_type, persona=persona)
+
+        return self._message_text(response)
+
+    async def achat(
+            self,
+            system_prompt: str,
+            user_prompt: str,
+            call_type: str = CALL_TYPE_OTHER,
+            persona: str = "none"
+    ) -> str:
+        """
+        Async version of chat(): waits on the event loop instead of blocking a thread.
+        """
+        response = await self.acomplete(system_prompt, user_prompt, call_type=call_type, persona=persona)
+
+        return self._message_text(response)
+
+    @traced("llm.chat")
+    def complete(
+            self,
+            system_prompt: str,
+            user_prompt: str,
+            call_type: str = CALL_TYPE_OTHER,
+            persona: str = "none",
+            **params
+    ):
+        """
+        Like chat(), but returns the whole ChatCompletion. Extra keyword
+        arguments (max_tokens, logit_bias, logprobs, ...) go to the API as is.
+        """
+        model = ROUTER.choose(call_type, persona, self.model)
+        record = LLMCallRecord(model=model, persona=persona, call_type=call_type)
+        messages = self._messages(system_prompt, user_prompt)
+        t0 = time.perf_counter()
+
+        def start() -> None:
+            # the latency starts once the scheduler lets the call go
+            nonlocal t0
+            t0 = time.perf_counter()
+
+        def send():
+            start()
+            return self.client.chat.completions.with_raw_response.create(
+                model = model,
+                messages = messages,
+                **params
+            )
+
+        def send_hedged():
+            # the primary and the duplicate each take a scheduler slot
+            raw, (hedge_model, _) = self.hedger.run(
+                lambda target: self._client_for(target[1]).chat.completions.with_raw_response.create(
+                    model = target[0] or model,
+                    messages = messages,
+                    **params
+                ),
+                call_type,
+                on_start=start
+            )
+            record.model = hedge_model or model
+            return raw
+
+        try:
+            raw = SCHEDULER.run(call_type, send) if self.hedger is None else send_hedged()
+        except Exception as e:
+            self._record_error(record, t0, e)
+            raise
+
+        return self._handle_response(raw, record, t0)
+
+    @traced("llm.achat")
+    async def acomplete(
+            self,
+            system_prompt: str,
+            user_prompt: str,
+            call_type: str = CALL_TYPE_OTHER,
+            persona: str = "none",
+            **params
+    ):
+        model = ROUTER.choose(call_type, persona, self.model)
+        record = LLMCallRecord(model=model, persona=persona, call_type=call_type)
+        messages = self._messages(system_prompt, user_prompt)
+        t0 = time.perf_counter()
+
+        def start() -> None:
+            nonlocal t0
+            t0 = time.perf_counter()
+
+        async def send():
+            start()
+            return await self._get_async_client().chat.completions.with_raw_response.create(
+                model = model,
+                messages = messages,
+                **params
+            )
+
+        async def send_hedged():
+            raw, (hedge_model, _) = await self.hedger.arun(
+                lambda target: self._async_client_for(target[1]).chat.completions.with_raw_response.create(
+                    model = target[0] or model,
+                    messages = messages,
+                    **params
+                ),
+                call_type,
+                on_start=start
+            )
+            record.model = hedge_model or model
+            return raw
+
+        try:
+            raw = await (SCHEDULER.arun(call_type, send) if self.hedger is None else send_hedged())
+        except Exception as e:
+            self._record_error(record, t0, e)
+            raise
 
-    def chat(self, system_prompt: str, user_prompt: str) -> str:
-        response = self.client.chat.completions.create(
-            model = self.model,
-            messages = [
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": user_prompt}
-            ]
-        )
+        return self._handle_response(raw, record, t0)
 
+    def warm(self) -> None:
+        """
+        Build the async client ahead of the first achat() call.
+        """
+        self._get_async_client()
+
+    def _get_async_client(self) -> "AsyncOpenAI":
+        if self._async_client is None:
+            from openai import AsyncOpenAI
+            self._async_client = AsyncOpenAI(api_key = self.api_key, http_client = self._async_http_client())
+
+        self._note_loop()
+        return self._async_client
+
+    def _note_loop(self) -> None:
+        try:
+            self._async_loop = asyncio.get_running_loop()
+        except RuntimeError:
+            # warm() from a thread: no connection is opened yet
+            pass
+
+    def _client_for(self, base_url: Optional[str]) -> "OpenAI":
+        if base_url is None:
+            return self.client
+
+        if self._alternate_client is None:
+            from openai import OpenAI
+            self._alternate_client = OpenAI(api_key = self.api_key, base_url = base_url, http_client = self._http_client())
+
+        return self._alternate_client
+
+    def _async_client_for(self, base_url: Optional[str]) -> "AsyncOpenAI":
+        if base_url is None:
+            return self._get_async_client()
+
+        if self._alternate_async_client is None:
+            from openai import AsyncOpenAI
+            self._alternate_async_client = AsyncOpenAI(
+                api_key = self.api_key,
+                base_url = base_url,
+                http_client = self._async_http_client()
+            )
+
+        self._note_loop()
+        return self._alternate_async_client
+
+    def _http_client(self) -> Optional["DefaultHttpxClient"]:
+        """
+        None leaves the SDK its own HTTP client.
+        """
+        if self.cassette is None:
+            return None
+
+        from openai import DefaultHttpxClient
+        return DefaultHttpxClient(transport = self.cassette.transport())
+
+    def _async_http_client(self) -> Optional["DefaultAsyncHttpxClient"]:
+        if self.cassette is None:
+            return None
+
+        from openai import DefaultAsyncHttpxClient
+        return DefaultAsyncHttpxClient(transport = self.cassette.async_transport())
+
+    def close(self) -> None:
+        """
+        Close the clients. The async clients can only be closed on the loop
+        their connections belong to: the close is scheduled there when that
+        loop is still running (use aclose() from async code to wait for it).
+        """
+        clients = self._take_async_clients()
+        loop = self._async_loop
+        if clients and loop is not None and loop.is_running() and not loop.is_closed():
+            asyncio.run_coroutine_threadsafe(_close_all(clients), loop)
+        self._close_sync_clients()
+
+    async def aclose(self) -> None:
+        await _close_all(self._take_async_clients())
+        self._close_sync_clients()
+
+    def _take_async_clients(self) -> list["AsyncOpenAI"]:
+        clients = [c for c in (self._async_client, self._alternate_async_client) if c is not None]
+        self._async_client = None
+        self._alternate_async_client = None
+        return clients
+
+    def _close_sync_clients(self) -> None:
+        self.client.close()
+        if self._alternate_client is not None:
+            self._alternate_client.close()
+            self._alternate_client = None
+        if self.hedger is not None:
+            self.hedger.close()
+
+    @staticmethod
+    def _messages(system_prompt: str, user_prompt: str) -> list[dict]:
+        return [
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": user_prompt}
+        ]
+
+    def _handle_response(self, raw, record: LLMCallRecord, t0: float):
+        response = raw.parse()
+
+        record.latency_seconds = time.perf_counter() - t0
+        # not streamed: the first token arrives with the whole response
+        record.ttft_seconds = record.latency_seconds
+        record.retries = _retries_taken(raw.http_request)
+
+        usage = response.usage
+        if usage:
+            record.prompt_tokens = usage.prompt_tokens
+            record.completion_tokens = usage.completion_tokens
+            details = usage.prompt_tokens_details
+            record.cached_tokens = (details.cached_tokens or 0) if details else 0
+
+        self.usage.record(record.prompt_tokens, record.completion_tokens)
+        collector = _usage_collector.get()
+        if collector is not None:
+            collector.record(record.prompt_tokens, record.completion_tokens)
+        TELEMETRY.record(record)
+
+        return response
+
+    @staticmethod
+    def _message_text(response) -> str:
         message = response.choices[0].message.content
-        return message or ""
\ No newline at end of file
+        return message or ""
+
+    @staticmethod
+    def _record_error(record: LLMCallRecord, t0: float, error: Exception) -> None:
+        record.latency_seconds = time.perf_counter() - t0
+        record.retries = _retries_taken(getattr(error, "request", None))
+        record.error = True
+        TELEMETRY.record(record)
+
+
+def _retries_taken(request) -> int:
+    """
+    Retries the SDK made before this request: it sends the count in a header.
+    """
+    if request is None:
+        return 0
+
+    try:
+        return int(request.headers.get("x-stainless-retry-count", 0))
+    except ValueError:
+        return 0
+
+
+async def _close_all(clients: list["AsyncOpenAI"]) -> None:
+    for client in clients:
+        await client.close()
@@ -0,0 +1,275 @@
+"""
+Bulk accuracy and latency evaluation of answer models.
+
+Runs QuestionAnswerer for several models over the question pool (or a
+sample of it stratified by correct option, so position bias cannot skew
+accuracy) with a bounded number of concurrent LLM calls.
+
+Every result is appended to a JSONL checkpoint as soon as it arrives; a
+rerun with the same checkpoint skips the questions already answered and
+retries the ones that failed with an API error. Large runs can be split
+in shards (one process or machine each, own checkpoint) and the reports
+merged from all checkpoints.
+
+The report gives, per model: accuracy, parse-failure and error rates,
+tokens and latency percentiles, accuracy per correct option and the
+distribution of picked options.
+"""
+
+import asyncio
+import json
+import pathlib
+import random
+import time
+from collections import Counter, defaultdict
+from dataclasses import asdict, dataclass
+from typing import Callable, Dict, Iterable, List, Optional, Set, TextIO, Tuple
+
+from src.utils.data_models import Question
+from src.utils.latency import latency_percentiles
+from .client import collect_usage
+from .question_answerer import ANSWER_MODE_DEFAULT, OPTIONS, QuestionAnswerer
+from .scheduler import llm_work
+from .telemetry import CALL_TYPE_EVAL
+
+
+@dataclass
+class EvalConfig:
+    models: List[str]
+    concurrency: int = 32
+    answer_mode: str = ANSWER_MODE_DEFAULT
+    checkpoint_path: Optional[pathlib.Path] = None
+    num_shards: int = 1
+    shard_index: int = 0
+
+
+@dataclass
+class EvalResult:
+    model: str
+    question_id: str
+    correct_option: str
+    choice: Optional[str] = None
+    correct: bool = False
+    parse_failed: bool = False
+    constrained: bool = False
+    latency_seconds: float = 0.0
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    error: Optional[str] = None
+
+
+# ---------- question selection ----------
+
+def stratified_sample(questions: List[Question], n: int, seed: Optional[int] = None) -> List[Question]:
+    """
+    `n` questions with the same share of each correct option as the pool
+    (largest remainder), sorted by id.
+    """
+    if n >= len(questions):
+        return sorted(questions, key=lambda q: q.id)
+
+    rng = random.Random(seed)
+    strata: Dict[str, List[Question]] = defaultdict(list)
+    for q in questions:
+        strata[q.correct_option].append(q)
+
+    quotas = {key: n * len(group) / len(questions) for key, group in strata.items()}
+    counts = {key: int(quota) for key, quota in quotas.items()}
+    by_remainder = sorted(quotas, key=lambda key: quotas[key] - counts[key], reverse=True)
+    for key in by_remainder[:n - sum(counts.values())]:
+        counts[key] += 1
+
+    sample: List[Question] = []
+    for key in sorted(strata):
+        sample.extend(rng.sample(strata[key], counts[key]))
+
+    return sorted(sample, key=lambda q: q.id)
+
+
+def shard_questions(questions: List[Question], num_shards: int, shard_index: int) -> List[Question]:
+    """
+    Every `num_shards`-th question by id, starting at `shard_index`.
+    """
+    if not 0 <= shard_index < num_shards:
+        raise ValueError(f"Shard index {shard_index} out of range for {num_shards} shards")
+
+    return sorted(questions, key=lambda q: q.id)[shard_index::num_shards]
+
+
+# ---------- checkpoint ----------
+
+def load_checkpoint(paths: Iterable[pathlib.Path]) -> List[EvalResult]:
+    """
+    Results from one or more checkpoints. A truncated last line (a run
+    killed mid-write) is ignored.
+    """
+    results: List[EvalResult] = []
+
+    for path in paths:
+        if not path.exists():
+            continue
+
+        with path.open("r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    results.append(EvalResult(**json.loads(line)))
+                except (json.JSONDecodeError, TypeError):
+                    continue
+
+    return results
+
+
+def _done_keys(results: List[EvalResult]) -> Set[Tuple[str, str]]:
+    return {(r.model, r.question_id) for r in results if r.error is None}
+
+
+# ---------- running ----------
+
+async def _aanswer(qa: QuestionAnswerer, model: str, question: Question) -> EvalResult:
+    result = EvalResult(model=model, question_id=question.id, correct_option=question.correct_option)
+    t0 = time.perf_counter()
+
+    with collect_usage() as usage:
+        try:
+            answer = await qa.aanswer_question_detailed(question, call_type=CALL_TYPE_EVAL)
+        except ValueError:
+            # the model replied, but no option could be read from it
+            result.parse_failed = True
+        except Exception as e:
+            result.error = f"{type(e).__name__}: {e}"
+        else:
+            result.choice = answer.choice
+            result.correct = answer.choice == question.correct_option
+            result.constrained = answer.constrained
+
+    result.latency_seconds = time.perf_counter() - t0
+    result.prompt_tokens = usage.prompt_tokens
+    result.completion_tokens = usage.completion_tokens
+
+    return result
+
+
+async def aevaluate(
+        questions: List[Question],
+        config: EvalConfig,
+        done: Set[Tuple[str, str]],
+        checkpoint: Optional[TextIO] = None,
+        on_result: Optional[Callable[[EvalResult], None]] = None
+) -> List[EvalResult]:
+    """
+    Answer every (model, question) pair not in `done`, all models at once,
+    with at most `config.concurrency` calls in flight.
+    """
+    answerers = {model: QuestionAnswerer(model=model, answer_mode=config.answer_mode) for model in config.models}
+    semaphore = asyncio.Semaphore(config.concurrency)
+    results: List[EvalResult] = []
+
+    async def run_one(model: str, question: Question) -> None:
+        # eval calls are batch work; one fair-queueing flow per model
+        async with semaphore:
+            with llm_work(flow=f"eval:{model}"):
+                result = await _aanswer(answerers[model], model, question)
+
+        results.append(result)
+        if checkpoint is not None:
+            checkpoint.write(json.dumps(asdict(result), separators=(",", ":")) + "\n")
+            checkpoint.flush()
+        if on_result is not None:
+            on_result(result)
+
+    try:
+        await asyncio.gather(*(
+            run_one(model, q)
+            for q in questions
+            for model in config.models
+            if (model, q.id) not in done
+        ))
+    finally:
+        # on the loop: asyncio.run() closes it right after this returns
+        await asyncio.gather(*(qa.aclose() for qa in answerers.values()))
+
+    return results
+
+
+def run_evaluation(
+        questions: List[Question],
+        config: EvalConfig,
+        on_result: Optional[Callable[[EvalResult], None]] = None
+) -> Dict:
+    """
+    Evaluate this shard of `questions`, resuming from the checkpoint, and
+    return the report over all of the shard's checkpointed results.
+    """
+    questions = shard_questions(questions, config.num_shards, config.shard_index)
+    previous = load_checkpoint([config.checkpoint_path]) if config.checkpoint_path else []
+    done = _done_keys(previous)
+
+    t0 = time.perf_counter()
+
+    if config.checkpoint_path is None:
+        results = asyncio.run(aevaluate(questions, config, done, on_result=on_result))
+    else:
+        config.checkpoint_path.parent.mkdir(parents=True, exist_ok=True)
+        with config.checkpoint_path.open("a", encoding="utf-8") as checkpoint:
+            results = asyncio.run(aevaluate(questions, config, done, checkpoint, on_result))
+
+    wanted = {q.id for q in questions}
+    report = summarize_eval([r for r in previous + results if r.question_id in wanted and r.model in config.models])
+    report["wall_seconds"] = round(time.perf_counter() - t0, 3)
+    report["new_results"] = len(results)
+    report["resumed_results"] = len(done & {(m, qid) for m in config.models for qid in wanted})
+
+    return report
+
+
+# ---------- report ----------
+
+def summarize_eval(results: List[EvalResult]) -> Dict:
+    """
+    Per-model report. When a question was answered more than once (an API
+    error, then a retry on resume), the last successful result counts.
+    """
+    latest: Dict[Tuple[str, str], EvalResult] = {}
+    for r in results:
+        key = (r.model, r.question_id)
+        if r.error is None or key not in latest or latest[key].error is not None:
+            latest[key] = r
+
+    by_model: Dict[str, List[EvalResult]] = defaultdict(list)
+    for r in latest.values():
+        by_model[r.model].append(r)
+
+    models = {}
+    for model, rows in sorted(by_model.items()):
+        answered = [r for r in rows if r.error is None]
+        n = len(answered)
+        prompt_tokens = sum(r.prompt_tokens for r in answered)
+        completion_tokens = sum(r.completion_tokens for r in answered)
+
+        by_option: Dict[str, Dict[str, float]] = {}
+        for option in OPTIONS:
+            group = [r for r in answered if r.correct_option == option]
+            if group:
+                by_option[option] = {
+                    "questions": len(group),
+                    "accuracy": round(sum(r.correct for r in group) / len(group), 4),
+                }
+
+        choices = Counter(r.choice for r in answered if r.choice is not None)
+
+        models[model] = {
+            "questions": len(rows),
+            "answered": n,
+            "errors": len(rows) - n,
+            "accuracy": round(sum(r.correct for r in answered) / n, 4) if n else 0.0,
+            "parse_failure_rate": round(sum(r.parse_failed for r in answered) / n, 4) if n else 0.0,
+            "constrained_rate": round(sum(r.constrained for r in answered) / n, 4) if n else 0.0,
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "tokens_per_question": round((prompt_tokens + completion_tokens) / n, 2) if n else 0.0,
+            "latency": latency_percentiles([r.latency_seconds for r in answered]),
+            "accuracy_by_correct_option": by_option,
+            "choice_distribution": {option: choices.get(option, 0) for option in OPTIONS},
+        }
+
+    return {"models": models}
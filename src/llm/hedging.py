@@ -0,0 +1,307 @@
+"""
+Hedged LLM requests.
+
+When a call has not returned after the `percentile`-th percentile of the
+recent latencies of its call type, a duplicate is sent (to the same
+model, or to an alternate model and/or backend). The first successful
+response wins and the other request is cancelled (async) or discarded
+(sync, where a running HTTP call cannot be interrupted).
+
+Each request, the duplicate included, takes a slot of its own in the
+LLM scheduler (src/llm/scheduler.py), so hedging stays within its
+in-flight limit, and the hedge delay runs from when the primary request
+is sent: time spent waiting for a slot does not trigger hedges.
+
+Opt-in: set CHASER_HEDGE=1, or pass a HedgePolicy to OpenAIClient.
+"""
+
+import asyncio
+import contextvars
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Deque, Dict, Optional, Tuple
+
+from .scheduler import SCHEDULER, LLMScheduler
+from .telemetry import TELEMETRY
+
+HEDGE_WINDOW_SIZE = 200
+# result of a sync duplicate that was not sent: the call was answered first
+_SKIPPED = object()
+
+
+@dataclass
+class HedgePolicy:
+    # hedge after this percentile of the recent latencies of the call type
+    percentile: float = 95.0
+    min_delay_seconds: float = 0.05
+    max_delay_seconds: float = 5.0
+    # below this many samples the delay is max_delay_seconds
+    min_samples: int = 20
+    # where the duplicate goes; None means the primary model / backend
+    alternate_model: Optional[str] = None
+    alternate_base_url: Optional[str] = None
+
+    @classmethod
+    def from_env(cls) -> Optional["HedgePolicy"]:
+        if os.getenv("CHASER_HEDGE", "0") != "1":
+            return None
+
+        return cls(
+            percentile=float(os.getenv("CHASER_HEDGE_PERCENTILE", "95")),
+            min_delay_seconds=float(os.getenv("CHASER_HEDGE_MIN_DELAY_MS", "50")) / 1000.0,
+            max_delay_seconds=float(os.getenv("CHASER_HEDGE_MAX_DELAY_MS", "5000")) / 1000.0,
+            alternate_model=os.getenv("CHASER_HEDGE_MODEL") or None,
+            alternate_base_url=os.getenv("CHASER_HEDGE_BASE_URL") or None,
+        )
+
+
+class LatencyWindow:
+    """
+    Latest successful latencies per call type.
+    """
+
+    def __init__(self, size: int = HEDGE_WINDOW_SIZE):
+        self._lock = threading.Lock()
+        self._samples: Dict[str, Deque[float]] = {}
+        self.size = size
+
+    def add(self, call_type: str, seconds: float) -> None:
+        with self._lock:
+            samples = self._samples.get(call_type)
+            if samples is None:
+                samples = self._samples[call_type] = deque(maxlen=self.size)
+            samples.append(seconds)
+
+    def percentile(self, call_type: str, q: float) -> Tuple[Optional[float], int]:
+        with self._lock:
+            samples = sorted(self._samples.get(call_type, ()))
+
+        if not samples:
+            return None, 0
+
+        idx = min(len(samples) - 1, int(round(q / 100.0 * (len(samples) - 1))))
+        return samples[idx], len(samples)
+
+
+def _usage_tokens(raw) -> Tuple[int, int]:
+    try:
+        usage = raw.parse().usage
+    except Exception:
+        return 0, 0
+
+    if usage is None:
+        return 0, 0
+
+    return usage.prompt_tokens, usage.completion_tokens
+
+
+class Hedger:
+    """
+    Runs a request function against the primary target and, past the hedge
+    delay, against the alternate one. Targets are opaque to the hedger;
+    `create(target)` does the actual call and returns the raw response.
+    """
+
+    def __init__(self, policy: HedgePolicy, primary: Any, alternate: Any, scheduler: Optional[LLMScheduler] = None):
+        self.policy = policy
+        self.primary = primary
+        self.alternate = alternate
+        self.scheduler = scheduler or SCHEDULER
+        self.latencies = LatencyWindow()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._executor_lock = threading.Lock()
+
+    def delay(self, call_type: str) -> float:
+        value, n = self.latencies.percentile(call_type, self.policy.percentile)
+        if value is None or n < self.policy.min_samples:
+            return self.policy.max_delay_seconds
+
+        return min(max(value, self.policy.min_delay_seconds), self.policy.max_delay_seconds)
+
+    def _record(self, call_type: str, latency: float, hedged: bool, hedge_won: bool, winner, loser) -> None:
+        # the latency the caller saw: when the duplicate wins, this is a
+        # lower bound of the primary's, which keeps the window from
+        # drifting up while the backend is slow
+        self.latencies.add(call_type, latency)
+
+        if not hedged:
+            TELEMETRY.record_hedge(call_type, hedged=False)
+            return
+
+        # the losing request was sent with the same prompt, so its prompt
+        # tokens are billed even when it is cancelled before completing
+        extra_prompt, _ = _usage_tokens(winner)
+        extra_completion = 0
+        if loser is not None:
+            extra_prompt, extra_completion = _usage_tokens(loser)
+
+        TELEMETRY.record_hedge(
+            call_type,
+            hedged=True,
+            hedge_won=hedge_won,
+            extra_prompt_tokens=extra_prompt,
+            extra_completion_tokens=extra_completion,
+        )
+
+    # ---------- sync ----------
+
+    def run(
+            self,
+            create: Callable[[Any], Any],
+            call_type: str,
+            on_start: Optional[Callable[[], None]] = None
+    ) -> Tuple[Any, Any]:
+        """
+        Returns the raw response and the target that produced it.
+        `on_start` is called when the primary request is sent.
+        """
+        started = threading.Event()
+        settled = threading.Event()
+
+        def send(target: Any, start: Optional[Callable[[], None]] = None) -> Any:
+            def call() -> Any:
+                if settled.is_set():
+                    # a duplicate that got its slot after the call was answered
+                    return _SKIPPED
+                if start is not None:
+                    start()
+                raw = create(target)
+                # before the slot is released, and possibly granted to the duplicate
+                settled.set()
+                return raw
+
+            return self.scheduler.run(call_type, call)
+
+        def primary_started() -> None:
+            if on_start is not None:
+                on_start()
+            started.set()
+
+        executor = self._get_executor()
+        # in a copy of the caller's context: the scheduler flow and priority
+        primary = executor.submit(contextvars.copy_context().run, send, self.primary, primary_started)
+        primary.add_done_callback(lambda f: started.set())
+        started.wait()
+
+        t0 = time.perf_counter()
+        done, _ = wait([primary], timeout=self.delay(call_type))
+
+        if done:
+            raw = primary.result()
+            self._record(call_type, time.perf_counter() - t0, False, False, raw, None)
+            return raw, self.primary
+
+        hedge = executor.submit(contextvars.copy_context().run, send, self.alternate)
+        targets = {primary: self.primary, hedge: self.alternate}
+        pending = {primary, hedge}
+        error: Optional[BaseException] = None
+
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is not None:
+                    error = error or future.exception()
+                    continue
+
+                raw = future.result()
+                if raw is _SKIPPED:
+                    continue
+                latency = time.perf_counter() - t0
+                hedge_won = future is hedge
+
+                if not pending:
+                    # the other request already failed
+                    self._record(call_type, latency, True, hedge_won, raw, None)
+                    return raw, targets[future]
+
+                # a running sync request cannot be cancelled: its result is
+                # dropped, and its tokens counted once it completes
+                def record_loser(f) -> None:
+                    loser_raw = None if f.exception() else f.result()
+                    self._record(call_type, latency, True, hedge_won, raw, None if loser_raw is _SKIPPED else loser_raw)
+
+                pending.pop().add_done_callback(record_loser)
+                return raw, targets[future]
+
+        raise error
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            with self._executor_lock:
+                if self._executor is None:
+                    # a thread per slot for the primaries and one for the
+                    # duplicates: more would only wait for a slot
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=2 * self.scheduler.capacity, thread_name_prefix="llm-hedge"
+                    )
+        return self._executor
+
+    # ---------- async ----------
+
+    async def arun(
+            self,
+            acreate: Callable[[Any], Awaitable[Any]],
+            call_type: str,
+            on_start: Optional[Callable[[], None]] = None
+    ) -> Tuple[Any, Any]:
+        started = asyncio.Event()
+
+        async def send(target: Any, start: Optional[Callable[[], None]] = None) -> Any:
+            async def call() -> Any:
+                if start is not None:
+                    start()
+                return await acreate(target)
+
+            return await self.scheduler.arun(call_type, call)
+
+        def primary_started() -> None:
+            if on_start is not None:
+                on_start()
+            started.set()
+
+        primary = asyncio.ensure_future(send(self.primary, primary_started))
+        primary.add_done_callback(lambda t: started.set())
+        tasks = [primary]
+
+        try:
+            await started.wait()
+
+            t0 = time.perf_counter()
+            done, _ = await asyncio.wait({primary}, timeout=self.delay(call_type))
+            if done:
+                raw = primary.result()
+                self._record(call_type, time.perf_counter() - t0, False, False, raw, None)
+                return raw, self.primary
+
+            hedge = asyncio.ensure_future(send(self.alternate))
+            tasks.append(hedge)
+            targets = {primary: self.primary, hedge: self.alternate}
+            pending = {primary, hedge}
+            error: Optional[BaseException] = None
+
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is not None:
+                        error = error or task.exception()
+                        continue
+
+                    raw = task.result()
+                    self._record(call_type, time.perf_counter() - t0, True, task is hedge, raw, None)
+                    return raw, targets[task]
+
+            raise error
+        finally:
+            # the loser, or both requests when the caller itself is cancelled
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+
+    def close(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
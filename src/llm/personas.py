@@ -1,5 +1,5 @@
 from dataclasses import dataclass
-from typing import Dict, List
+from typing import Dict, List, Optional
 import random
 
 @dataclass
@@ -72,6 +72,6 @@ def get_all_personas() -> List[ChaserPersona]:
     return list(CHASER_PERSONAS.values())
 
 
-def get_random_persona() -> ChaserPersona:
+def get_random_persona(rng: Optional[random.Random] = None) -> ChaserPersona:
     personas = get_all_personas()
-    return random.choice(personas)
+    return (rng or random).choice(personas)
@@ -1,8 +1,17 @@
+import hashlib
+import json
+import os
 import re
-from typing import Tuple
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple
 
 from src.utils.data_models import Question
+from src.utils.tracing import traced
 from .client import OpenAIClient
+from .single_flight import SingleFlight
+from .telemetry import TELEMETRY, CALL_TYPE_ANSWER
 
 BASE_SYSTEM_PROMPT = (
     "You are a quiz player. You will always be given a multiple-choice "
@@ -11,7 +20,42 @@ BASE_SYSTEM_PROMPT = (
     "Always clearly indicate your choice in the format: 'Answer: X' where X is A, B, C, or D."
 )
 
-def build_question_prompt(question: Question) -> str:
+SINGLE_LETTER_SYSTEM_PROMPT = (
+    "You are a quiz player. You will always be given a multiple-choice "
+    "question with four options: A, B, C, and D.\n"
+    "Reply with the letter of the single best answer and nothing else."
+)
+
+OPTIONS = ["A", "B", "C", "D"]
+
+# "constrained": one output token restricted to A-D with a logit bias,
+# falling back to "free" (reply in text, then parse) when the backend
+# rejects one of these parameters or the reply is not a letter
+ANSWER_MODE_CONSTRAINED = "constrained"
+ANSWER_MODE_FREE = "free"
+ANSWER_MODE_DEFAULT = os.getenv("CHASER_ANSWER_MODE", ANSWER_MODE_CONSTRAINED)
+ANSWER_LOGPROBS_DEFAULT = os.getenv("CHASER_ANSWER_LOGPROBS", "0") == "1"
+
+# token ids of "A".."D" in the cl100k_base and o200k_base encodings (GPT-4 family)
+OPTION_TOKEN_IDS = {"A": 32, "B": 33, "C": 34, "D": 35}
+OPTION_LOGIT_BIAS = {str(token_id): 100 for token_id in OPTION_TOKEN_IDS.values()}
+# status codes of backends rejecting max_tokens / logit_bias / logprobs
+UNSUPPORTED_PARAMS_STATUS_CODES = (400, 422)
+CONSTRAINED_PARAMS = ("logit_bias", "max_tokens", "top_logprobs", "logprobs")
+# a model that rejected them answers in free mode for this long, then is retried
+UNSUPPORTED_PARAMS_RETRY_SECONDS = 600.0
+
+
+@dataclass
+class AnswerResult:
+    choice: str
+    raw: str
+    # log-probability of each option, when requested and returned
+    option_logprobs: Optional[Dict[str, float]] = None
+    constrained: bool = False
+
+@traced("qa.build_question_prompt")
+def build_question_prompt(question: Question, single_letter: bool = False) -> str:
     lines = [
         "Question:",
         question.question,
@@ -22,11 +66,12 @@ def build_question_prompt(question: Question) -> str:
         f"C) {question.options['C']}",
         f"D) {question.options['D']}",
         "",
-        "Please answer in the format: Answer: X",
+        "Reply with A, B, C or D." if single_letter else "Please answer in the format: Answer: X",
     ]
 
     return "\n".join(lines)
 
+@traced("qa.parse_llm_answer")
 def parse_llm_answer(raw_text: str) -> str:
     match = re.search(r"answer\s*:\s*([ABCD])", raw_text, re.IGNORECASE)
     if match:
@@ -38,18 +83,231 @@ def parse_llm_answer(raw_text: str) -> str:
     
     raise ValueError(f"Could not parse LLM answer from: {raw_text!r}")
 
+def read_constrained_answer(response) -> Optional[AnswerResult]:
+    """
+    Answer from a single-token completion: the letter itself, else the
+    most likely option among the returned logprobs, else whatever the
+    text parser finds. None if the reply holds no answer at all.
+    """
+    choice = response.choices[0]
+    raw = choice.message.content or ""
+
+    option_logprobs = None
+    if choice.logprobs is not None and choice.logprobs.content:
+        option_logprobs = {}
+        for candidate in choice.logprobs.content[0].top_logprobs:
+            option = candidate.token.strip().upper()
+            if option in OPTIONS and candidate.logprob > option_logprobs.get(option, float("-inf")):
+                option_logprobs[option] = candidate.logprob
+
+    letter = raw.strip().upper()
+    if letter in OPTIONS:
+        return AnswerResult(letter, raw, option_logprobs or None, constrained=True)
+
+    if option_logprobs:
+        best = max(option_logprobs, key=option_logprobs.get)
+        return AnswerResult(best, raw, option_logprobs, constrained=True)
+
+    try:
+        return AnswerResult(parse_llm_answer(raw), raw, None, constrained=True)
+    except ValueError:
+        return None
+
+def unsupported_param(error: Exception) -> Optional[str]:
+    """
+    The constrained-mode parameter a 400/422 error rejects, or None for
+    any other error (context length, content filter, bad prompt, ...).
+    """
+    if getattr(error, "status_code", None) not in UNSUPPORTED_PARAMS_STATUS_CODES:
+        return None
+
+    param = getattr(error, "param", None)
+    if param in CONSTRAINED_PARAMS:
+        return param
+
+    message = str(getattr(error, "message", None) or error)
+    for param in CONSTRAINED_PARAMS:
+        if param in message:
+            return param
+    return None
+
+
+def requested_model(error: Exception) -> Optional[str]:
+    """
+    The model of the request that failed (the router may have picked it).
+    """
+    request = getattr(error, "request", None)
+    try:
+        return json.loads(request.content)["model"]
+    except (AttributeError, TypeError, ValueError, KeyError):
+        return None
+
 
 
 class QuestionAnswerer:
-    def __init__(self, model: str = "gpt-4.1-mini"):
+    def __init__(
+            self,
+            model: str = "gpt-4.1-mini",
+            answer_mode: str = ANSWER_MODE_DEFAULT,
+            logprobs: bool = ANSWER_LOGPROBS_DEFAULT
+    ):
+        if answer_mode not in (ANSWER_MODE_CONSTRAINED, ANSWER_MODE_FREE):
+            raise ValueError(f"Unknown answer mode: {answer_mode!r}")
+
         self.client = OpenAIClient(model = model)
+        self.answer_mode = answer_mode
+        self.logprobs = logprobs
+        # model -> time until which it is asked in free mode (it rejected
+        # the constrained parameters)
+        self._free_until: Dict[str, float] = {}
+        self._free_lock = threading.Lock()
+        # concurrent identical questions (e.g. several games drawing the same
+        # question at once) share one LLM call
+        self.flights = SingleFlight()
+
+    def close(self) -> None:
+        self.client.close()
+
+    async def aclose(self) -> None:
+        await self.client.aclose()
+
+    def answer_question(
+            self,
+            question: Question,
+            call_type: str = CALL_TYPE_ANSWER,
+            persona: str = "none"
+    ) -> Tuple[str, str]:
+        result = self.answer_question_detailed(question, call_type=call_type, persona=persona)
+        return result.choice, result.raw
+
+    async def aanswer_question(
+            self,
+            question: Question,
+            call_type: str = CALL_TYPE_ANSWER,
+            persona: str = "none"
+    ) -> Tuple[str, str]:
+        result = await self.aanswer_question_detailed(question, call_type=call_type, persona=persona)
+        return result.choice, result.raw
+
+    @traced("qa.answer_question")
+    def answer_question_detailed(
+            self,
+            question: Question,
+            call_type: str = CALL_TYPE_ANSWER,
+            persona: str = "none"
+    ) -> AnswerResult:
+        return self.flights.do(
+            self._flight_key(question),
+            lambda: self._answer_question_detailed(question, call_type, persona),
+            on_join=lambda: TELEMETRY.record_coalesced(call_type)
+        )
+
+    @traced("qa.aanswer_question")
+    async def aanswer_question_detailed(
+            self,
+            question: Question,
+            call_type: str = CALL_TYPE_ANSWER,
+            persona: str = "none"
+    ) -> AnswerResult:
+        return await self.flights.ado(
+            self._flight_key(question),
+            lambda: self._aanswer_question_detailed(question, call_type, persona),
+            on_join=lambda: TELEMETRY.record_coalesced(call_type)
+        )
+
+    def constrained(self) -> bool:
+        """
+        Whether the next answer is asked in constrained mode.
+        """
+        if self.answer_mode != ANSWER_MODE_CONSTRAINED:
+            return False
+        until = self._free_until.get(self.client.model)
+        return until is None or time.monotonic() >= until
+
+    def _constrained_failed(self, error: Exception) -> None:
+        """
+        Re-raise `error` unless it rejects a constrained-mode parameter; in
+        that case the call goes on in free mode and the model is asked in
+        free mode for a while.
+        """
+        param = unsupported_param(error)
+        if param is None:
+            raise error
+
+        model = requested_model(error) or self.client.model
+        with self._free_lock:
+            self._free_until[model] = time.monotonic() + UNSUPPORTED_PARAMS_RETRY_SECONDS
+
+    def _flight_key(self, question: Question) -> str:
+        """
+        Hash of everything the request depends on: model, answer mode and
+        the full prompt.
+        """
+        constrained = self.constrained()
+        parts = [
+            self.client.model,
+            ANSWER_MODE_CONSTRAINED if constrained else ANSWER_MODE_FREE,
+            str(self.logprobs),
+            SINGLE_LETTER_SYSTEM_PROMPT if constrained else BASE_SYSTEM_PROMPT,
+            build_question_prompt(question, single_letter=constrained),
+        ]
+        return hashlib.blake2b("\x1f".join(parts).encode("utf-8"), digest_size=16).hexdigest()
+
+    def _answer_question_detailed(self, question: Question, call_type: str, persona: str) -> AnswerResult:
+        if self.constrained():
+            try:
+                response = self.client.complete(
+                    system_prompt = SINGLE_LETTER_SYSTEM_PROMPT,
+                    user_prompt = build_question_prompt(question, single_letter=True),
+                    call_type = call_type,
+                    persona = persona,
+                    **self._constrained_params()
+                )
+            except Exception as e:
+                self._constrained_failed(e)
+            else:
+                result = read_constrained_answer(response)
+                if result is not None:
+                    return result
 
-    def answer_question(self, question: Question) -> Tuple[str, str]:
-        user_prompt = build_question_prompt(question)
         raw = self.client.chat(
             system_prompt = BASE_SYSTEM_PROMPT,
-            user_prompt = user_prompt
+            user_prompt = build_question_prompt(question),
+            call_type = call_type,
+            persona = persona
         )
 
-        chosen = parse_llm_answer(raw)
-        return chosen, raw
\ No newline at end of file
+        return AnswerResult(parse_llm_answer(raw), raw)
+
+    async def _aanswer_question_detailed(self, question: Question, call_type: str, persona: str) -> AnswerResult:
+        if self.constrained():
+            try:
+                response = await self.client.acomplete(
+                    system_prompt = SINGLE_LETTER_SYSTEM_PROMPT,
+                    user_prompt = build_question_prompt(question, single_letter=True),
+                    call_type = call_type,
+                    persona = persona,
+                    **self._constrained_params()
+                )
+            except Exception as e:
+                self._constrained_failed(e)
+            else:
+                result = read_constrained_answer(response)
+                if result is not None:
+                    return result
+
+        raw = await self.client.achat(
+            system_prompt = BASE_SYSTEM_PROMPT,
+            user_prompt = build_question_prompt(question),
+            call_type = call_type,
+            persona = persona
+        )
+
+        return AnswerResult(parse_llm_answer(raw), raw)
+
+    def _constrained_params(self) -> dict:
+        params = {"max_tokens": 1, "logit_bias": OPTION_LOGIT_BIAS}
+        if self.logprobs:
+            params["logprobs"] = True
+            params["top_logprobs"] = len(OPTIONS)
+        return params
@@ -0,0 +1,300 @@
+"""
+Latency-aware model routing.
+
+Every LLM call asks the router which model to use for its call type and
+chaser persona. A route has a primary model (by default the client's own),
+a faster fallback model and a latency budget. The router follows the
+latencies recorded in the LLM telemetry: while the rolling p95 of the
+primary breaches the budget, calls go to the fallback, except one in
+`probe_every` that keeps measuring the primary so the route can recover.
+
+Failed calls do not count as latencies (a model that fails at once is not
+fast): they feed an error rate per model instead, and a model whose error
+rate is above `max_error_rate` is avoided, as a fallback or as a primary.
+Samples age out after `window_seconds`, and a probe that comes back under
+budget clears the primary's old samples, so a route recovers in seconds.
+
+Decisions are counted per call type, model and reason, and exported with
+the other Prometheus metrics.
+
+Set CHASER_ROUTER=0 to always use the client's model. Budgets per call
+type can be set with CHASER_LATENCY_BUDGET_MS_<CALL_TYPE> (e.g.
+CHASER_LATENCY_BUDGET_MS_COMMENT=3000), the fallback model with
+CHASER_FALLBACK_MODEL.
+"""
+
+import os
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+
+from .telemetry import (
+    TELEMETRY,
+    CALL_TYPE_ANSWER,
+    CALL_TYPE_COMMENT,
+    CALL_TYPE_CONTESTANT,
+    CALL_TYPE_FINAL_CHASE,
+    LLMCallRecord,
+)
+
+FALLBACK_MODEL_DEFAULT = "gpt-4.1-nano"
+# latest latencies per (model, call type) behind the rolling p95
+ROUTE_WINDOW_SIZE = 100
+ROUTE_MIN_SAMPLES = 20
+ROUTE_PROBE_EVERY = 20
+ROUTE_WINDOW_SECONDS = 60.0
+# error rate over the window above which a model is not routed to
+ROUTE_MAX_ERROR_RATE = 0.2
+ROUTE_MIN_ERROR_SAMPLES = 5
+ANY_PERSONA = "*"
+
+ROUTE_REASON_PRIMARY = "primary"
+ROUTE_REASON_FALLBACK = "fallback"
+ROUTE_REASON_PROBE = "probe"
+
+# the chase waits on answers and final chase answers; comments are shown
+# after the answer, so they can take a little longer
+LATENCY_BUDGETS_DEFAULT = {
+    CALL_TYPE_ANSWER: 2.0,
+    CALL_TYPE_FINAL_CHASE: 3.0,
+    CALL_TYPE_COMMENT: 4.0,
+    CALL_TYPE_CONTESTANT: 4.0,
+}
+
+
+@dataclass
+class Route:
+    call_type: str
+    budget_seconds: float
+    fallback_model: Optional[str] = FALLBACK_MODEL_DEFAULT
+    # None means the model of the client making the call
+    primary_model: Optional[str] = None
+    persona: str = ANY_PERSONA
+
+
+class ModelRouter:
+    def __init__(
+            self,
+            routes: Optional[List[Route]] = None,
+            enabled: bool = True,
+            window_size: int = ROUTE_WINDOW_SIZE,
+            min_samples: int = ROUTE_MIN_SAMPLES,
+            probe_every: int = ROUTE_PROBE_EVERY,
+            window_seconds: float = ROUTE_WINDOW_SECONDS,
+            max_error_rate: float = ROUTE_MAX_ERROR_RATE,
+            min_error_samples: int = ROUTE_MIN_ERROR_SAMPLES,
+            clock: Callable[[], float] = time.monotonic
+    ):
+        self.enabled = enabled
+        self.window_size = window_size
+        self.min_samples = min_samples
+        self.probe_every = probe_every
+        self.window_seconds = window_seconds
+        self.max_error_rate = max_error_rate
+        self.min_error_samples = min_error_samples
+        self.clock = clock
+
+        self._routes: Dict[Tuple[str, str], Route] = {}
+        for route in routes or []:
+            self.add_route(route)
+
+        self._lock = threading.Lock()
+        # (time, latency) of the latest successful calls per (model, call type)
+        self._latencies: Dict[Tuple[str, str], Deque[Tuple[float, float]]] = {}
+        # (time, failed) of the latest calls per (model, call type)
+        self._outcomes: Dict[Tuple[str, str], Deque[Tuple[float, bool]]] = {}
+        # p95 and error rate per (model, call type), recomputed when the samples change
+        self._p95: Dict[Tuple[str, str], Optional[float]] = {}
+        self._error_rate: Dict[Tuple[str, str], Optional[float]] = {}
+        self._calls: Dict[Tuple[str, str], int] = {}
+        # probes sent to a primary and not observed yet
+        self._probes: Dict[Tuple[str, str], int] = {}
+        self._decisions: Dict[Tuple[str, str, str], int] = {}
+
+    @classmethod
+    def from_env(cls) -> "ModelRouter":
+        fallback = os.getenv("CHASER_FALLBACK_MODEL", FALLBACK_MODEL_DEFAULT)
+        routes = []
+        for call_type, budget in LATENCY_BUDGETS_DEFAULT.items():
+            budget_ms = os.getenv(f"CHASER_LATENCY_BUDGET_MS_{call_type.upper()}")
+            if budget_ms:
+                budget = float(budget_ms) / 1000.0
+            routes.append(Route(call_type=call_type, budget_seconds=budget, fallback_model=fallback))
+
+        return cls(routes, enabled=os.getenv("CHASER_ROUTER", "1") != "0")
+
+    def add_route(self, route: Route) -> None:
+        """
+        A route for one persona takes precedence over the call type's route.
+        """
+        self._routes[(route.call_type, route.persona)] = route
+
+    def route_for(self, call_type: str, persona: str) -> Optional[Route]:
+        return self._routes.get((call_type, persona)) or self._routes.get((call_type, ANY_PERSONA))
+
+    # ---------- decisions ----------
+
+    def _failing(self, key: Tuple[str, str]) -> bool:
+        error_rate = self._error_rate.get(key)
+        return error_rate is not None and error_rate > self.max_error_rate
+
+    def choose(self, call_type: str, persona: str, default_model: str) -> str:
+        route = self.route_for(call_type, persona) if self.enabled else None
+        if route is None:
+            return default_model
+
+        primary = route.primary_model or default_model
+        fallback = route.fallback_model
+
+        with self._lock:
+            primary_key = (primary, call_type)
+            fallback_key = (fallback, call_type)
+            self._expire(primary_key)
+            reason = ROUTE_REASON_PRIMARY
+
+            if fallback and fallback != primary:
+                self._expire(fallback_key)
+                primary_p95 = self._p95.get(primary_key)
+                slow = primary_p95 is not None and primary_p95 > route.budget_seconds
+                fallback_p95 = self._p95.get(fallback_key)
+                # no use moving to a fallback that fails or is slower still
+                fallback_ok = not self._failing(fallback_key) and (
+                    fallback_p95 is None or primary_p95 is None or fallback_p95 < primary_p95
+                )
+
+                if (slow or self._failing(primary_key)) and fallback_ok:
+                    key = (call_type, persona)
+                    n = self._calls.get(key, 0) + 1
+                    self._calls[key] = n
+                    reason = ROUTE_REASON_PROBE if n % self.probe_every == 0 else ROUTE_REASON_FALLBACK
+
+            if reason == ROUTE_REASON_PROBE:
+                self._probes[primary_key] = self._probes.get(primary_key, 0) + 1
+
+            model = fallback if reason == ROUTE_REASON_FALLBACK else primary
+            decision = (call_type, model, reason)
+            self._decisions[decision] = self._decisions.get(decision, 0) + 1
+
+        return model
+
+    def observe(self, record: LLMCallRecord) -> None:
+        """
+        Telemetry listener: a finished call updates its model's error rate
+        and, if it succeeded, its rolling p95.
+        """
+        key = (record.model, record.call_type)
+        now = self.clock()
+        with self._lock:
+            outcomes = self._outcomes.get(key)
+            if outcomes is None:
+                outcomes = self._outcomes[key] = deque(maxlen=self.window_size)
+            latencies = self._latencies.get(key)
+            if latencies is None:
+                latencies = self._latencies[key] = deque(maxlen=self.window_size)
+
+            if self._probes.get(key):
+                self._probes[key] -= 1
+                route = self.route_for(record.call_type, record.persona)
+                if not record.error and route is not None and record.latency_seconds <= route.budget_seconds:
+                    # the primary is back under budget: forget how slow it was
+                    latencies.clear()
+                    outcomes.clear()
+
+            outcomes.append((now, record.error))
+            if not record.error:
+                latencies.append((now, record.latency_seconds))
+
+            self._expire(key, now)
+            self._refresh(key)
+
+    def _expire(self, key: Tuple[str, str], now: Optional[float] = None) -> None:
+        """
+        Drop the samples older than the window (call with the lock held).
+        """
+        cutoff = (self.clock() if now is None else now) - self.window_seconds
+        expired = False
+        for samples in (self._latencies.get(key), self._outcomes.get(key)):
+            while samples and samples[0][0] < cutoff:
+                samples.popleft()
+                expired = True
+        if expired:
+            self._refresh(key)
+
+    def _refresh(self, key: Tuple[str, str]) -> None:
+        latencies = self._latencies.get(key) or ()
+        if len(latencies) < self.min_samples:
+            self._p95[key] = None
+        else:
+            ordered = sorted(latency for _, latency in latencies)
+            self._p95[key] = ordered[min(len(ordered) - 1, int(0.95 * len(ordered)))]
+
+        outcomes = self._outcomes.get(key) or ()
+        if len(outcomes) < self.min_error_samples:
+            self._error_rate[key] = None
+        else:
+            self._error_rate[key] = sum(failed for _, failed in outcomes) / len(outcomes)
+
+    # ---------- reporting ----------
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "enabled": self.enabled,
+                "routes": [
+                    {
+                        "call_type": route.call_type,
+                        "persona": route.persona,
+                        "primary_model": route.primary_model,
+                        "fallback_model": route.fallback_model,
+                        "budget_seconds": route.budget_seconds,
+                    }
+                    for route in self._routes.values()
+                ],
+                "p95_seconds": [
+                    {"model": model, "call_type": call_type, "p95_seconds": round(p95, 4)}
+                    for (model, call_type), p95 in sorted(self._p95.items())
+                    if p95 is not None
+                ],
+                "error_rates": [
+                    {"model": model, "call_type": call_type, "error_rate": round(rate, 4)}
+                    for (model, call_type), rate in sorted(self._error_rate.items())
+                    if rate is not None
+                ],
+                "decisions": [
+                    {"call_type": call_type, "model": model, "reason": reason, "calls": n}
+                    for (call_type, model, reason), n in sorted(self._decisions.items())
+                ],
+            }
+
+    def metrics(self) -> Dict[str, float]:
+        """
+        Routing decisions and rolling p95 as Prometheus gauges.
+        """
+        out: Dict[str, float] = {}
+        with self._lock:
+            for (call_type, model, reason), n in sorted(self._decisions.items()):
+                out[f'chaser_llm_route_decisions{{call_type="{call_type}",model="{model}",reason="{reason}"}}'] = n
+            for (model, call_type), p95 in sorted(self._p95.items()):
+                if p95 is not None:
+                    out[f'chaser_llm_route_p95_seconds{{call_type="{call_type}",model="{model}"}}'] = round(p95, 6)
+            for (model, call_type), rate in sorted(self._error_rate.items()):
+                if rate is not None:
+                    out[f'chaser_llm_route_error_rate{{call_type="{call_type}",model="{model}"}}'] = round(rate, 6)
+        return out
+
+    def reset(self) -> None:
+        with self._lock:
+            self._latencies.clear()
+            self._outcomes.clear()
+            self._p95.clear()
+            self._error_rate.clear()
+            self._calls.clear()
+            self._probes.clear()
+            self._decisions.clear()
+
+
+# process-wide: every OpenAIClient asks it, fed by the process-wide telemetry
+ROUTER = ModelRouter.from_env()
+TELEMETRY.add_listener(ROUTER.observe)
@@ -0,0 +1,404 @@
+"""
+Priority scheduler for LLM calls.
+
+Every LLM call of the process takes one of `capacity` slots before it is
+sent. Calls belong to a priority class:
+
+- live_step: the chaser's answer in a chase step or final chase (and the
+  bot contestant's, whose turn it is part of)
+- live_comment: the chaser's comment of a live step
+- prefetch: work done ahead of a player's need
+- batch: precomputation and evaluation (comment bank, model evaluation)
+
+Free slots go to the highest class with waiting calls. Within a class,
+calls are served by weighted fair queueing across flows (a flow is a game
+session, or a batch job): each call gets a virtual finish time of
+max(class virtual time, the flow's last finish) + 1 / weight, and the
+smallest goes first, so one busy game cannot starve the others.
+
+Background classes (prefetch, batch) never hold more than
+`background_share` of the slots, so a live call always finds headroom
+quickly. When a live call still has to wait, the latest async background
+call is cancelled (preempted) and put back in the queue with its original
+finish time; it is sent again once capacity frees up. Background work
+therefore soaks up the spare capacity and defers to live turns.
+
+The class comes from the call type, unless the caller sets it with
+`llm_work(priority=...)`; the flow comes from `llm_work(flow=...)`.
+
+Set CHASER_LLM_SCHEDULER=0 to send every call right away. The slots can
+be set with CHASER_LLM_MAX_IN_FLIGHT, the background share with
+CHASER_LLM_BACKGROUND_SHARE, and CHASER_LLM_PREEMPT=0 turns preemption off.
+"""
+
+import asyncio
+import contextvars
+import heapq
+import itertools
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Deque, Dict, Iterator, List, Optional, Tuple
+
+from .telemetry import (
+    CALL_TYPE_ANSWER,
+    CALL_TYPE_COMMENT,
+    CALL_TYPE_CONTESTANT,
+    CALL_TYPE_EVAL,
+    CALL_TYPE_FINAL_CHASE,
+)
+
+PRIORITY_LIVE_STEP = 0
+PRIORITY_LIVE_COMMENT = 1
+PRIORITY_PREFETCH = 2
+PRIORITY_BATCH = 3
+PRIORITY_NAMES = {
+    PRIORITY_LIVE_STEP: "live_step",
+    PRIORITY_LIVE_COMMENT: "live_comment",
+    PRIORITY_PREFETCH: "prefetch",
+    PRIORITY_BATCH: "batch",
+}
+# classes from this one on are background work
+BACKGROUND_PRIORITY = PRIORITY_PREFETCH
+
+CALL_TYPE_PRIORITIES = {
+    CALL_TYPE_ANSWER: PRIORITY_LIVE_STEP,
+    CALL_TYPE_FINAL_CHASE: PRIORITY_LIVE_STEP,
+    CALL_TYPE_CONTESTANT: PRIORITY_LIVE_STEP,
+    CALL_TYPE_COMMENT: PRIORITY_LIVE_COMMENT,
+    CALL_TYPE_EVAL: PRIORITY_BATCH,
+}
+
+MAX_IN_FLIGHT_DEFAULT = 256
+BACKGROUND_SHARE_DEFAULT = 0.5
+DEFAULT_FLOW = "default"
+# latest queue waits per class behind the p99
+WAIT_WINDOW_SIZE = 1000
+# finish times of idle flows are dropped past this many flows
+MAX_TRACKED_FLOWS = 4096
+
+
+@dataclass
+class WorkContext:
+    priority: Optional[int] = None
+    flow: Optional[str] = None
+    weight: float = 1.0
+
+
+_work_context: contextvars.ContextVar[WorkContext] = contextvars.ContextVar("llm_work", default=WorkContext())
+
+
+@contextmanager
+def llm_work(priority: Optional[int] = None, flow: Optional[str] = None, weight: float = 1.0) -> Iterator[None]:
+    """
+    Label the LLM calls of the block (including tasks started from it):
+    their priority class (None: from the call type), their flow and the
+    flow's weight in fair queueing.
+    """
+    outer = _work_context.get()
+    token = _work_context.set(WorkContext(
+        priority=priority if priority is not None else outer.priority,
+        flow=flow if flow is not None else outer.flow,
+        weight=weight
+    ))
+    try:
+        yield
+    finally:
+        _work_context.reset(token)
+
+
+@dataclass
+class _Ticket:
+    priority: int
+    flow: str
+    finish: float
+    seq: int
+    enqueued_at: float = 0.0
+    granted: bool = False
+    cancelled: bool = False
+    preempted: bool = False
+    # wakes the waiter once granted (threading.Event.set or a future's callback)
+    wake: Optional[Callable[[], None]] = None
+    # running background call that a live call may preempt
+    task: Optional[asyncio.Task] = field(default=None, repr=False)
+
+
+class LLMScheduler:
+    def __init__(
+            self,
+            capacity: int = MAX_IN_FLIGHT_DEFAULT,
+            background_share: float = BACKGROUND_SHARE_DEFAULT,
+            preempt: bool = True,
+            enabled: bool = True
+    ):
+        self.enabled = enabled
+        self.capacity = capacity
+        self.background_capacity = max(1, int(capacity * background_share))
+        self.preempt = preempt
+
+        self._lock = threading.Lock()
+        self._seq = itertools.count()
+        self._queues: Dict[int, List[Tuple[float, int, _Ticket]]] = {p: [] for p in PRIORITY_NAMES}
+        self._virtual_time: Dict[int, float] = {p: 0.0 for p in PRIORITY_NAMES}
+        self._last_finish: Dict[Tuple[int, str], float] = {}
+        self._running: Dict[int, int] = {p: 0 for p in PRIORITY_NAMES}
+        # granted background tickets with a task, latest last
+        self._preemptible: List[_Ticket] = []
+
+        self._granted: Dict[int, int] = {p: 0 for p in PRIORITY_NAMES}
+        self._preempted: Dict[int, int] = {p: 0 for p in PRIORITY_NAMES}
+        self._waits: Dict[int, Deque[float]] = {p: deque(maxlen=WAIT_WINDOW_SIZE) for p in PRIORITY_NAMES}
+
+    @classmethod
+    def from_env(cls) -> "LLMScheduler":
+        capacity = os.getenv("CHASER_LLM_MAX_IN_FLIGHT")
+        share = os.getenv("CHASER_LLM_BACKGROUND_SHARE")
+
+        return cls(
+            capacity=int(capacity) if capacity else MAX_IN_FLIGHT_DEFAULT,
+            background_share=float(share) if share else BACKGROUND_SHARE_DEFAULT,
+            preempt=os.getenv("CHASER_LLM_PREEMPT", "1") != "0",
+            enabled=os.getenv("CHASER_LLM_SCHEDULER", "1") != "0"
+        )
+
+    # ---------- running calls ----------
+
+    def run(self, call_type: str, fn: Callable[[], Any]) -> Any:
+        """
+        Run a blocking call in a slot. Blocking calls cannot be preempted.
+        """
+        if not self.enabled:
+            return fn()
+
+        ticket = self._new_ticket(call_type)
+        event = None
+        with self._lock:
+            self._enqueue(ticket)
+            self._dispatch()
+            if not ticket.granted:
+                event = threading.Event()
+                ticket.wake = event.set
+                self._preempt_for(ticket)
+
+        if event is not None:
+            event.wait()
+
+        try:
+            return fn()
+        finally:
+            self._release(ticket)
+
+    async def arun(self, call_type: str, coro_fn: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Await `coro_fn()` in a slot. A preempted background call is sent
+        again (with a new `coro_fn()`) once it gets a slot back.
+        """
+        if not self.enabled:
+            return await coro_fn()
+
+        ticket = self._new_ticket(call_type)
+        while True:
+            await self._acquire(ticket)
+
+            inner = asyncio.ensure_future(coro_fn())
+            if ticket.priority >= BACKGROUND_PRIORITY:
+                with self._lock:
+                    ticket.task = inner
+                    self._preemptible.append(ticket)
+
+            try:
+                return await inner
+            except asyncio.CancelledError:
+                if not ticket.preempted:
+                    inner.cancel()
+                    raise
+            finally:
+                self._release(ticket)
+
+            # preempted: back in the queue with its original finish time
+            ticket.preempted = False
+
+    async def _acquire(self, ticket: _Ticket) -> None:
+        loop = asyncio.get_running_loop()
+        future: Optional[asyncio.Future] = None
+
+        with self._lock:
+            self._enqueue(ticket)
+            self._dispatch()
+            if not ticket.granted:
+                future = loop.create_future()
+
+                def wake() -> None:
+                    loop.call_soon_threadsafe(_resolve, future)
+
+                ticket.wake = wake
+                self._preempt_for(ticket)
+
+        if future is None:
+            return
+
+        try:
+            await future
+        except asyncio.CancelledError:
+            with self._lock:
+                ticket.cancelled = True
+                granted = ticket.granted
+            if granted:
+                # granted while being cancelled: give the slot back
+                self._release(ticket)
+            raise
+
+    # ---------- queueing ----------
+
+    def _new_ticket(self, call_type: str) -> _Ticket:
+        context = _work_context.get()
+        priority = context.priority
+        if priority is None:
+            priority = CALL_TYPE_PRIORITIES.get(call_type, PRIORITY_LIVE_COMMENT)
+
+        ticket = _Ticket(priority=priority, flow=context.flow or DEFAULT_FLOW, finish=0.0, seq=next(self._seq))
+        ticket.finish = self._finish_time(ticket, context.weight)
+        return ticket
+
+    def _finish_time(self, ticket: _Ticket, weight: float) -> float:
+        with self._lock:
+            key = (ticket.priority, ticket.flow)
+            start = max(self._virtual_time[ticket.priority], self._last_finish.get(key, 0.0))
+            finish = start + 1.0 / max(weight, 1e-6)
+            self._last_finish[key] = finish
+
+            if len(self._last_finish) > MAX_TRACKED_FLOWS:
+                # a flow whose last finish is behind the virtual time starts from it anyway
+                for stale in [k for k, f in self._last_finish.items() if f <= self._virtual_time[k[0]]]:
+                    del self._last_finish[stale]
+
+            return finish
+
+    def _enqueue(self, ticket: _Ticket) -> None:
+        ticket.granted = False
+        ticket.wake = None
+        ticket.task = None
+        ticket.enqueued_at = time.perf_counter()
+        heapq.heappush(self._queues[ticket.priority], (ticket.finish, ticket.seq, ticket))
+
+    def _in_flight(self) -> int:
+        return sum(self._running.values())
+
+    def _background_in_flight(self) -> int:
+        return sum(n for p, n in self._running.items() if p >= BACKGROUND_PRIORITY)
+
+    def _dispatch(self) -> None:
+        """
+        Grant free slots, highest class first. Called with the lock held.
+        """
+        while self._in_flight() < self.capacity:
+            ticket = self._pop_next()
+            if ticket is None:
+                return
+
+            ticket.granted = True
+            self._running[ticket.priority] += 1
+            self._granted[ticket.priority] += 1
+            self._virtual_time[ticket.priority] = max(self._virtual_time[ticket.priority], ticket.finish)
+            self._waits[ticket.priority].append(time.perf_counter() - ticket.enqueued_at)
+            if ticket.wake is not None:
+                ticket.wake()
+
+    def _pop_next(self) -> Optional[_Ticket]:
+        for priority in sorted(self._queues):
+            if priority >= BACKGROUND_PRIORITY and self._background_in_flight() >= self.background_capacity:
+                return None
+
+            queue = self._queues[priority]
+            while queue:
+                _, _, ticket = heapq.heappop(queue)
+                if not ticket.cancelled:
+                    return ticket
+        return None
+
+    def _preempt_for(self, ticket: _Ticket) -> None:
+        """
+        A live call has to wait: cancel the latest background call, if any.
+        Called with the lock held.
+        """
+        if not self.preempt or ticket.priority >= BACKGROUND_PRIORITY:
+            return
+
+        while self._preemptible:
+            victim = self._preemptible.pop()
+            task = victim.task
+            if task is None or task.done() or victim.preempted:
+                continue
+
+            victim.preempted = True
+            self._preempted[victim.priority] += 1
+            task.get_loop().call_soon_threadsafe(task.cancel)
+            return
+
+    def _release(self, ticket: _Ticket) -> None:
+        with self._lock:
+            if not ticket.granted:
+                return
+            ticket.granted = False
+            self._running[ticket.priority] -= 1
+            if ticket.task is not None:
+                if ticket in self._preemptible:
+                    self._preemptible.remove(ticket)
+                ticket.task = None
+            self._dispatch()
+
+    # ---------- reporting ----------
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "enabled": self.enabled,
+                "capacity": self.capacity,
+                "background_capacity": self.background_capacity,
+                "classes": [
+                    {
+                        "priority": name,
+                        "queued": len(self._queues[p]),
+                        "running": self._running[p],
+                        "granted": self._granted[p],
+                        "preempted": self._preempted[p],
+                        "wait_p99_seconds": round(_p99(self._waits[p]), 6),
+                    }
+                    for p, name in PRIORITY_NAMES.items()
+                ],
+            }
+
+    def metrics(self) -> Dict[str, float]:
+        """
+        Queued, running, granted and preempted calls and the p99 queue wait
+        per priority class, as Prometheus gauges.
+        """
+        out: Dict[str, float] = {}
+        with self._lock:
+            for p, name in PRIORITY_NAMES.items():
+                label = f'{{priority="{name}"}}'
+                out[f"chaser_llm_sched_queued{label}"] = len(self._queues[p])
+                out[f"chaser_llm_sched_running{label}"] = self._running[p]
+                out[f"chaser_llm_sched_granted{label}"] = self._granted[p]
+                out[f"chaser_llm_sched_preempted{label}"] = self._preempted[p]
+                out[f"chaser_llm_sched_wait_p99_seconds{label}"] = round(_p99(self._waits[p]), 6)
+        return out
+
+
+def _resolve(future: asyncio.Future) -> None:
+    if not future.done():
+        future.set_result(None)
+
+
+def _p99(samples: Deque[float]) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(0.99 * len(ordered)))]
+
+
+# process-wide: every OpenAIClient call takes its slot here
+SCHEDULER = LLMScheduler.from_env()
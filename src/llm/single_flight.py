@@ -0,0 +1,118 @@
+"""
+Single-flight request coalescing.
+
+Concurrent calls with the same key share one execution: the first caller
+(the leader) runs the function, the others wait for its result (or its
+exception). Nothing is cached: once the call is done, the next caller
+with that key starts a new one.
+"""
+
+import asyncio
+import threading
+from concurrent.futures import Future
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+
+class SingleFlight:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[str, Future] = {}
+        self._acalls: Dict[str, asyncio.Task] = {}
+        # callers still waiting on each async call
+        self._awaiters: Dict[asyncio.Task, int] = {}
+        self.leaders = 0
+        self.coalesced = 0
+
+    def do(self, key: str, fn: Callable[[], Any], on_join: Optional[Callable[[], None]] = None) -> Any:
+        with self._lock:
+            future = self._calls.get(key)
+            leader = future is None
+            if leader:
+                future = self._calls[key] = Future()
+                self.leaders += 1
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            if on_join is not None:
+                on_join()
+            return future.result()
+
+        try:
+            result = fn()
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+
+    async def ado(
+            self,
+            key: str,
+            coro_fn: Callable[[], Awaitable[Any]],
+            on_join: Optional[Callable[[], None]] = None
+    ) -> Any:
+        """
+        Async version of do(). The call runs as a task of its own, so a
+        cancelled caller (leader or not) does not cancel it for the others;
+        once every caller waiting on it is cancelled, it is cancelled too.
+        """
+        loop = asyncio.get_running_loop()
+
+        with self._lock:
+            task = self._acalls.get(key)
+            # tasks are bound to their loop: never share across loops
+            leader = task is None or task.get_loop() is not loop
+            if leader:
+                task = self._acalls[key] = loop.create_task(coro_fn())
+                task.add_done_callback(lambda t: self._adone(key, t))
+                self._awaiters[task] = 0
+                self.leaders += 1
+            else:
+                self.coalesced += 1
+            self._awaiters[task] += 1
+
+        if not leader and on_join is not None:
+            on_join()
+
+        try:
+            return await asyncio.shield(task)
+        finally:
+            with self._lock:
+                abandoned = self._leave(task)
+                if abandoned and self._acalls.get(key) is task:
+                    # a new caller starts a new call instead of joining this one
+                    del self._acalls[key]
+            if abandoned:
+                task.cancel()
+
+    def _leave(self, task: asyncio.Task) -> bool:
+        """
+        One caller stopped waiting on `task`: whether it was the last one
+        and the call is still running (every caller was cancelled). Called
+        with the lock held.
+        """
+        waiters = self._awaiters.get(task)
+        if waiters is None:
+            return False
+        if waiters > 1:
+            self._awaiters[task] = waiters - 1
+            return False
+        del self._awaiters[task]
+        return not task.done()
+
+    def _adone(self, key: str, task: asyncio.Task) -> None:
+        with self._lock:
+            if self._acalls.get(key) is task:
+                del self._acalls[key]
+
+        # mark the exception as retrieved when every caller was cancelled
+        if not task.cancelled():
+            task.exception()
+
+    def stats(self) -> Dict[str, int]:
+        return {"leaders": self.leaders, "coalesced": self.coalesced}
@@ -0,0 +1,83 @@
+"""
+Local stub of the OpenAI chat completions endpoint for load tests.
+
+Answers "Answer: X" prompts with a random option, single-token requests
+(max_tokens=1 with a logit_bias) with a bare letter and optional logprobs,
+and anything else with a canned comment, after a configurable latency. Point the app at it with
+OPENAI_BASE_URL=http://host:port/v1 (the OpenAI SDK reads it directly).
+"""
+
+import asyncio
+import json
+import random
+import time
+import uuid
+from dataclasses import dataclass
+
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse, Response
+from starlette.routing import Route
+
+STUB_COMMENT = "A bold attempt, but the facts are on my side. The correct answer stands."
+
+
+@dataclass
+class StubConfig:
+    latency_ms: float = 300.0
+    jitter_ms: float = 100.0
+    error_rate: float = 0.0
+
+
+def create_stub_app(config: StubConfig, seed: int | None = None) -> Starlette:
+    rng = random.Random(seed)
+
+    async def chat_completions(request: Request) -> Response:
+        body = json.loads(await request.body())
+        messages = body.get("messages", [])
+        user_prompt = messages[-1]["content"] if messages else ""
+
+        delay = max(0.0, rng.gauss(config.latency_ms, config.jitter_ms)) / 1000.0
+        await asyncio.sleep(delay)
+
+        if rng.random() < config.error_rate:
+            return JSONResponse(
+                {"error": {"message": "stub error", "type": "server_error"}},
+                status_code=500,
+            )
+
+        logprobs = None
+        if body.get("max_tokens") == 1 and body.get("logit_bias"):
+            content = rng.choice(["A", "B", "C", "D"])
+            if body.get("logprobs"):
+                top = [{"token": opt, "logprob": 0.0 if opt == content else -3.0, "bytes": None} for opt in "ABCD"]
+                logprobs = {"content": [{"token": content, "logprob": 0.0, "bytes": None, "top_logprobs": top}]}
+        elif "Answer: X" in user_prompt:
+            content = f"Answer: {rng.choice(['A', 'B', 'C', 'D'])}"
+        else:
+            content = STUB_COMMENT
+
+        prompt_tokens = sum(len(m.get("content", "")) for m in messages) // 4
+        completion_tokens = max(1, len(content) // 4)
+
+        return JSONResponse({
+            "id": f"chatcmpl-stub-{uuid.uuid4().hex[:12]}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": body.get("model", "stub"),
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": content},
+                "logprobs": logprobs,
+                "finish_reason": "length" if logprobs is not None or len(content) == 1 else "stop",
+            }],
+            "usage": {
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": completion_tokens,
+                "total_tokens": prompt_tokens + completion_tokens,
+            },
+        })
+
+    return Starlette(routes=[
+        Route("/v1/chat/completions", chat_completions, methods=["POST"]),
+    ])
@@ -0,0 +1,273 @@
+"""
+Per-call LLM telemetry.
+
+Every chat completion is recorded with its model, chaser persona and call
+type (answer, comment, final_chase, contestant, eval), token usage, latency,
+time-to-first-token, SDK retries and prompt-cache hit or miss. Records are
+aggregated in memory per (model, persona, call type) and periodically
+dumped as one compact JSON file, to see which persona and call type
+dominate token spend and tail latency. Hedged calls (src/llm/hedging.py)
+also count how often a duplicate was sent, how often it won and the
+tokens it cost, and requests coalesced into an identical one in flight
+are counted per call type.
+
+Completions are not streamed, so the first token reaches the caller with
+the whole response: time-to-first-token equals the call latency for now.
+"""
+
+import json
+import os
+import pathlib
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+
+from src.utils.latency import latency_percentiles
+
+DUMP_INTERVAL_SECONDS_DEFAULT = 60
+# latest latencies kept per key for the percentiles
+LATENCY_SAMPLES_MAX = 5000
+
+CALL_TYPE_ANSWER = "answer"
+CALL_TYPE_COMMENT = "comment"
+CALL_TYPE_FINAL_CHASE = "final_chase"
+CALL_TYPE_CONTESTANT = "contestant"
+CALL_TYPE_EVAL = "eval"
+CALL_TYPE_OTHER = "other"
+
+
+@dataclass
+class LLMCallRecord:
+    model: str
+    persona: str
+    call_type: str
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    cached_tokens: int = 0
+    latency_seconds: float = 0.0
+    ttft_seconds: Optional[float] = None
+    retries: int = 0
+    error: bool = False
+
+    @property
+    def cache_hit(self) -> bool:
+        return self.cached_tokens > 0
+
+
+@dataclass
+class LLMCallAggregate:
+    calls: int = 0
+    errors: int = 0
+    retries: int = 0
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    cached_tokens: int = 0
+    cache_hits: int = 0
+    latency_seconds_total: float = 0.0
+    latencies: Deque[float] = field(default_factory=lambda: deque(maxlen=LATENCY_SAMPLES_MAX))
+    ttfts: Deque[float] = field(default_factory=lambda: deque(maxlen=LATENCY_SAMPLES_MAX))
+
+    def add(self, record: LLMCallRecord) -> None:
+        self.calls += 1
+        self.errors += int(record.error)
+        self.retries += record.retries
+        self.prompt_tokens += record.prompt_tokens
+        self.completion_tokens += record.completion_tokens
+        self.cached_tokens += record.cached_tokens
+        self.cache_hits += int(record.cache_hit)
+        self.latency_seconds_total += record.latency_seconds
+        self.latencies.append(record.latency_seconds)
+        if record.ttft_seconds is not None:
+            self.ttfts.append(record.ttft_seconds)
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "retries": self.retries,
+            "prompt_tokens": self.prompt_tokens,
+            "completion_tokens": self.completion_tokens,
+            "cached_tokens": self.cached_tokens,
+            "cache_hit_rate": round(self.cache_hits / self.calls, 4) if self.calls else 0.0,
+            "latency_seconds_total": round(self.latency_seconds_total, 3),
+            "latency": latency_percentiles(list(self.latencies)),
+            "ttft": latency_percentiles(list(self.ttfts)),
+        }
+
+
+@dataclass
+class HedgeAggregate:
+    calls: int = 0
+    hedged: int = 0
+    hedge_wins: int = 0
+    extra_prompt_tokens: int = 0
+    extra_completion_tokens: int = 0
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "calls": self.calls,
+            "hedged": self.hedged,
+            "hedge_wins": self.hedge_wins,
+            "hedge_rate": round(self.hedged / self.calls, 4) if self.calls else 0.0,
+            "win_rate": round(self.hedge_wins / self.hedged, 4) if self.hedged else 0.0,
+            "extra_prompt_tokens": self.extra_prompt_tokens,
+            "extra_completion_tokens": self.extra_completion_tokens,
+        }
+
+
+class LLMTelemetry:
+    def __init__(self, path: Optional[pathlib.Path] = None):
+        self.path = path
+        self._lock = threading.Lock()
+        self._aggregates: Dict[Tuple[str, str, str], LLMCallAggregate] = {}
+        self._hedges: Dict[str, HedgeAggregate] = {}
+        # requests served by another identical request in flight, per call type
+        self._coalesced: Dict[str, int] = {}
+        self._listeners: List[Callable[[LLMCallRecord], None]] = []
+        self._started_at = time.time()
+        self._dirty = False
+
+        self._dumper: Optional[threading.Thread] = None
+        self._stop_dumper = threading.Event()
+
+    def record(self, record: LLMCallRecord) -> None:
+        key = (record.model, record.persona, record.call_type)
+        with self._lock:
+            aggregate = self._aggregates.get(key)
+            if aggregate is None:
+                aggregate = self._aggregates[key] = LLMCallAggregate()
+            aggregate.add(record)
+            self._dirty = True
+
+        for listener in self._listeners:
+            listener(record)
+
+    def add_listener(self, listener: Callable[[LLMCallRecord], None]) -> None:
+        """
+        Call `listener` with every record, e.g. to follow live latencies.
+        """
+        self._listeners.append(listener)
+
+    def record_hedge(
+            self,
+            call_type: str,
+            hedged: bool,
+            hedge_won: bool = False,
+            extra_prompt_tokens: int = 0,
+            extra_completion_tokens: int = 0
+    ) -> None:
+        """
+        One call made with hedging on; the extra tokens are those of the
+        request that lost the race.
+        """
+        with self._lock:
+            aggregate = self._hedges.get(call_type)
+            if aggregate is None:
+                aggregate = self._hedges[call_type] = HedgeAggregate()
+            aggregate.calls += 1
+            aggregate.hedged += int(hedged)
+            aggregate.hedge_wins += int(hedge_won)
+            aggregate.extra_prompt_tokens += extra_prompt_tokens
+            aggregate.extra_completion_tokens += extra_completion_tokens
+            self._dirty = True
+
+    def record_coalesced(self, call_type: str) -> None:
+        with self._lock:
+            self._coalesced[call_type] = self._coalesced.get(call_type, 0) + 1
+            self._dirty = True
+
+    def metrics(self) -> Dict[str, int]:
+        """
+        Coalesced requests as Prometheus gauges.
+        """
+        with self._lock:
+            return {
+                f'chaser_llm_coalesced_requests{{call_type="{call_type}"}}': n
+                for call_type, n in sorted(self._coalesced.items())
+            }
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Aggregates per (model, persona, call type), plus totals per call
+        type and per persona, and hedging stats per call type.
+        """
+        with self._lock:
+            rows = [
+                {"model": model, "persona": persona, "call_type": call_type, **aggregate.summary()}
+                for (model, persona, call_type), aggregate in sorted(self._aggregates.items())
+            ]
+            hedging = {call_type: aggregate.summary() for call_type, aggregate in sorted(self._hedges.items())}
+            coalesced = dict(sorted(self._coalesced.items()))
+
+        def totals(column: str) -> Dict[str, Dict[str, int]]:
+            out: Dict[str, Dict[str, int]] = {}
+            for row in rows:
+                t = out.setdefault(row[column], {"calls": 0, "prompt_tokens": 0, "completion_tokens": 0})
+                t["calls"] += row["calls"]
+                t["prompt_tokens"] += row["prompt_tokens"]
+                t["completion_tokens"] += row["completion_tokens"]
+            return out
+
+        return {
+            "started_at": round(self._started_at, 3),
+            "updated_at": round(time.time(), 3),
+            "by_call_type": totals("call_type"),
+            "by_persona": totals("persona"),
+            "hedging": hedging,
+            "coalesced": coalesced,
+            "rows": rows,
+        }
+
+    def reset(self) -> None:
+        with self._lock:
+            self._aggregates.clear()
+            self._hedges.clear()
+            self._coalesced.clear()
+            self._started_at = time.time()
+            self._dirty = False
+
+    # ---------- persistence ----------
+
+    def dump(self, path: Optional[pathlib.Path] = None) -> bool:
+        """
+        Write the snapshot to disk if anything was recorded since the last
+        dump. The file is replaced atomically.
+        """
+        path = path or self.path
+        if path is None:
+            return False
+
+        with self._lock:
+            if not self._dirty:
+                return False
+            self._dirty = False
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(path.name + ".tmp")
+        tmp_path.write_text(json.dumps(self.snapshot(), separators=(",", ":")), encoding="utf-8")
+        os.replace(tmp_path, path)
+
+        return True
+
+    def start_dumper(self, interval_seconds: float = DUMP_INTERVAL_SECONDS_DEFAULT) -> None:
+        if self._dumper is not None and self._dumper.is_alive():
+            return
+
+        self._stop_dumper.clear()
+
+        def loop() -> None:
+            while not self._stop_dumper.wait(interval_seconds):
+                self.dump()
+
+        self._dumper = threading.Thread(target=loop, name="llm-telemetry-dumper", daemon=True)
+        self._dumper.start()
+
+    def stop_dumper(self) -> None:
+        self._stop_dumper.set()
+        self.dump()
+
+
+# process-wide: every OpenAIClient records here
+TELEMETRY = LLMTelemetry()
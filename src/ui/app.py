@@ -1,33 +1,138 @@
+import asyncio
 import pathlib
+from typing import TYPE_CHECKING, List
+
 import gradio as gr
 
 from src.game.game_runner import (
-    initialize_game,
+    ainitialize_game,
+    initialize_game_from_pool,
+    load_default_comment_bank,
+    load_default_draw_index,
+    load_default_question_stats,
+    start_default_llm_telemetry,
     get_cash_builder_question,
     advence_cash_builder,
     prepare_chase_offers,
     choose_chase_offer,
     get_next_chase_question_for_state,
-    run_chase_step_with_chaser,
+    arun_chase_step_with_chaser,
     start_final_chase_default,
     advence_final_chase_player,
     advence_final_chase_chaser,
-    get_final_chase_player_question
+    get_final_chase_player_question,
+    arun_final_chase_chaser_round
 )
 from src.game.state import GameState, GamePhase
-from src.game.chaser_logic import ChaserLogic
+from src.game.chaser_pool import ChaserPool
+from src.game.session_manager import GameSession, SessionManager
+from src.llm.scheduler import llm_work
+from src.ui.minimal_updates import PayloadStats, minimal_updates
+from src.utils.data_models import Question
+from src.utils.tracing import summarize_spans
+from src.config.serving import (
+    LLM_EVENT_CONCURRENCY,
+    FAST_EVENT_CONCURRENCY,
+    NEW_GAME_CONCURRENCY,
+    QUEUE_MAX_SIZE
+)
+
+if TYPE_CHECKING:
+    from src.game.question_stats import QuestionStats
+
+
+QUESTION_MD_CACHE_MAX = 50_000
+_question_md_cache: dict[str, str] = {}
+
+
+def format_question_md(q: Question) -> str:
+    """
+    Markdown for a question, rendered once per question id.
+    """
+    md = _question_md_cache.get(q.id)
+    if md is None:
+        md = (
+            f"**Question:** {q.question}\n\n"
+            f"A) {q.options['A']}\n"
+            f"B) {q.options['B']}\n"
+            f"C) {q.options['C']}\n"
+            f"D) {q.options['D']}"
+        )
+        if len(_question_md_cache) < QUESTION_MD_CACHE_MAX:
+            _question_md_cache[q.id] = md
 
+    return md
 
-def create_app(root_dir: pathlib.Path) -> gr.Blocks:
+
+def format_session_stats(sessions: SessionManager) -> str:
+    stats = sessions.stats()
+    return (
+        f"_Live sessions: {stats['live_sessions']} · "
+        f"sessions memory: {stats['sessions_memory_bytes'] / 1e6:.1f} MB · "
+        f"process RSS: {stats['process_rss_bytes'] / 1e6:.1f} MB · "
+        f"evicted (ttl/memory): {stats['evicted_ttl']}/{stats['evicted_memory']}_"
+    )
+
+
+def format_session_spans(session: GameSession | None) -> str:
+    """
+    Per-call latencies traced for one game, slowest calls first.
+    """
+    if session is None or not session.spans:
+        return "_No traced calls for this game yet._"
+
+    summary = summarize_spans(list(session.spans))
+    rows = [
+        f"| {name} | {s['calls']} | {s['last_ms']:.2f} | {s['avg_ms']:.2f} | {s['max_ms']:.2f} |"
+        for name, s in sorted(summary.items(), key=lambda kv: kv[1]["avg_ms"], reverse=True)
+    ]
+    header = (
+        "| call | calls | last ms | avg ms | max ms |\n"
+        "|---|---|---|---|---|"
+    )
+    return header + "\n" + "\n".join(rows)
+
+
+def create_app(
+    root_dir: pathlib.Path,
+    sessions: SessionManager | None = None,
+    question_stats: "QuestionStats | None" = None,
+    payload_stats: PayloadStats | None = None,
+    chaser_pool: ChaserPool | None = None,
+    questions: List[Question] | None = None,
+) -> gr.Blocks:
     """
     Create and return the Gradio Blocks app for The Chaser.
+
+    Games live in a SessionManager; the browser only holds a session id,
+    so idle or abandoned games can be evicted. Chasers come from a shared,
+    pre-warmed ChaserPool instead of being built per game.
+
+    Without `questions`, every new game reads the question pool from disk;
+    a multi-process launch passes the pool loaded once before forking.
     """
+    if sessions is None:
+        sessions = SessionManager()
+    sessions.start_sweeper()
+
+    if question_stats is None:
+        question_stats = load_default_question_stats(root_dir)
+    question_stats.start_flusher()
+    start_default_llm_telemetry(root_dir)
+
+    if payload_stats is None:
+        payload_stats = PayloadStats()
+
+    question_index = load_default_draw_index(root_dir) if questions is not None else None
+
+    if chaser_pool is None:
+        chaser_pool = ChaserPool(comment_bank=load_default_comment_bank(root_dir))
+    chaser_pool.start_warmup()
 
     with gr.Blocks(title="The Chaser – LLM Edition") as demo:
         # ---------- Hidden / internal state ----------
         root_dir_state = gr.State(str(root_dir))
-        game_state = gr.State()          # will hold GameState
-        chaser_logic_state = gr.State()  # will hold ChaserLogic instance
+        session_id_state = gr.State()    # will hold the session id of the GameState + ChaserLogic
 
         # ---------- Header ----------
         gr.Markdown("# The Chaser – LLM Edition")
@@ -107,28 +212,63 @@ def create_app(root_dir: pathlib.Path) -> gr.Blocks:
                 final_feedback_md = gr.Markdown("Final chase feedback will appear here")
                 final_progress_md = gr.Markdown("Final chase progress: 0 correct")
 
+                final_chaser_btn = gr.Button("Run chaser's final chase")
+                final_chaser_progress_md = gr.Markdown("Chaser final chase progress will appear here")
+
         # ---------- Footer / debug ----------
         gr.Markdown(
             "-----\n"
             "_Debug info and advanced controls may be added here later._"
         )
+        session_stats_md = gr.Markdown(format_session_stats(sessions))
+
+        with gr.Accordion("UI payload per interaction", open=False):
+            payload_stats_md = gr.Markdown(payload_stats.format_markdown())
+
+        with gr.Accordion("Per-call latency (this game)", open=False):
+            session_spans_md = gr.Markdown(format_session_spans(None))
+
+        refresh_debug_btn = gr.Button("Refresh debug info", size="sm")
 
         # ---------- Callbacks ----------
+        # Every callback returns the session id followed by its outputs;
+        # on_click wraps it so that only changed components are sent.
+
+        def on_click(button: gr.Button, fn, inputs, outputs, **kwargs) -> None:
+            button.click(
+                minimal_updates(fn, outputs, sessions, payload_stats),
+                inputs=inputs,
+                outputs=outputs,
+                **kwargs,
+            )
+
+        refresh_debug_btn.click(
+            lambda session_id: (
+                format_session_stats(sessions),
+                payload_stats.format_markdown(),
+                format_session_spans(sessions.get(session_id)),
+            ),
+            inputs=[session_id_state],
+            outputs=[session_stats_md, payload_stats_md, session_spans_md],
+        )
 
-        def start_new_game_cb(root_dir_str: str):
+
+        async def start_new_game_cb(root_dir_str: str, old_session_id: str):
             root_dir_path = pathlib.Path(root_dir_str)
 
+            # 0) Drop the previous game of this tab, if any
+            sessions.remove(old_session_id)
+
             # 1) Initialize game state (loads questions + starts Cash Builder)
-            state: GameState = initialize_game(root_dir_path)
+            if questions is None:
+                state: GameState = await ainitialize_game(root_dir_path, stats=question_stats)
+            else:
+                state = initialize_game_from_pool(questions, stats=question_stats, question_index=question_index)
 
-            # 2) Create ChaserLogic with the chosen persona for this game
+            # 2) Take the shared ChaserLogic for the chosen persona (built at startup)
             persona = state.persona
             persona_name = persona.name if persona else "Unknown chaser"
-            chaser = ChaserLogic(
-                model="gpt-4.1-mini",
-                p_correct=0.75,
-                persona=persona,
-            )
+            chaser = await asyncio.to_thread(chaser_pool.get, persona)
 
             # 3) Top-level status texts
             phase_text = f"**Phase:** {state.phase.name}"
@@ -138,13 +278,7 @@ def create_app(root_dir: pathlib.Path) -> gr.Blocks:
             # 4) First Cash Builder question
             q = get_cash_builder_question(state)
             if q is not None:
-                cb_q_md = (
-                    f"**Question:** {q.question}\n\n"
-                    f"A) {q.options['A']}\n"
-                    f"B) {q.options['B']}\n"
-                    f"C) {q.options['C']}\n"
-                    f"D) {q.options['D']}"
-                )
+                cb_q_md = format_question_md(q)
             else:
                 cb_q_md = "No Cash Builder questions available."
 
@@ -159,9 +293,10 @@ def create_app(root_dir: pathlib.Path) -> gr.Blocks:
             chaser_comment_text = "_Chaser comment will appear here._"
             chase_status_text = "Chase status will appear here."
 
+            session = sessions.create(state, chaser, owns_chaser=False)
+
             return (
-                state,                 # game_state
-                chaser,                # chaser_logic_state
+                session.session_id,    # session_id_state
                 phase_text,            # current_phase_md
                 persona_text,          # current_persona_md
                 secured_text,          # secured_cash_md
@@ -174,14 +309,15 @@ def create_app(root_dir: pathlib.Path) -> gr.Blocks:
                 chaser_correct_text,   # chaser_correct_md
                 chaser_comment_text,   # chaser_comment_md
                 chase_status_text,     # chase_status_md
+                f"{format_session_stats(sessions)}\n\n_Game seed: {state.rng.seed}_",  # session_stats_md
             )
 
-        start_new_game_btn.click(
+        on_click(
+            start_new_game_btn,
             start_new_game_cb,
-            inputs=[root_dir_state],
+            inputs=[root_dir_state, session_id_state],
             outputs=[
-                game_state,
-                chaser_logic_state,
+                session_id_state,
                 current_phase_md,
                 current_persona_md,
                 secured_cash_md,
@@ -194,20 +330,25 @@ def create_app(root_dir: pathlib.Path) -> gr.Blocks:
                 chaser_correct_md,
                 chaser_comment_md,
                 chase_status_md,
+                session_stats_md,
             ],
+            concurrency_limit=NEW_GAME_CONCURRENCY,
+            concurrency_id="new_game",
         )
 
         def cash_builder_submit_cb(
-            state: GameState,
-            chaser_logic: ChaserLogic,
+            session_id: str,
             player_choice: str,
         ):
             """
             Handle a Cash Builder answer.
             """
+            session = sessions.get(session_id)
+            state = session.state if session else None
+
             if state is None:
                 return (
-                    state,
+                    session_id,
                     "Game not started.",
                     "Correct answers: 0",
                     "**Phase:** –",
@@ -241,17 +382,11 @@ def create_app(root_dir: pathlib.Path) -> gr.Blocks:
             if state.phase == GamePhase.CASH_BUILDER:
                 q = get_cash_builder_question(state)
                 if q is not None:
-                    q_md = (
-                        f"**Question:** {q.question}\n\n"
-                        f"A) {q.options['A']}\n"
-                        f"B) {q.options['B']}\n"
-                        f"C) {q.options['C']}\n"
-                        f"D) {q.options['D']}"
-                    )
+                    q_md = format_question_md(q)
                 else:
                     q_md = "No more questions."
                 return (
-                    state,
+                    session_id,
                     feedback,
                     progress_text,
                     phase_text,
@@ -276,7 +411,7 @@ def create_app(root_dir: pathlib.Path) -> gr.Blocks:
                 )
 
                 return (
-                    state,
+                    session_id,
                     feedback,
                     progress_text,
                     phase_text,
@@ -287,7 +422,7 @@ def create_app(root_dir: pathlib.Path) -> gr.Blocks:
 
             # Otherwise (should not happen)
             return (
-                state,
+                session_id,
                 feedback,
                 progress_text,
                 phase_text,
@@ -296,11 +431,12 @@ def create_app(root_dir: pathlib.Path) -> gr.Blocks:
                 "Unexpected state.",
             )
 
-        cash_builder_submit_btn.click(
+        on_click(
+            cash_builder_submit_btn,
             cash_builder_submit_cb,
-            inputs=[game_state, chaser_logic_state, cash_builder_options],
+            inputs=[session_id_state, cash_builder_options],
             outputs=[
-                game_state,
+                session_id_state,
                 cash_builder_feedback_md,
                 cash_builder_progress_md,
                 current_phase_md,
@@ -308,12 +444,17 @@ def create_app(root_dir: pathlib.Path) -> gr.Blocks:
                 secured_cash_md,
                 cash_builder_question_md,
             ],
+            concurrency_limit=FAST_EVENT_CONCURRENCY,
+            concurrency_id="fast",
         )
 
-        def choose_offer_cb(state: GameState, choice: str):
+        def choose_offer_cb(session_id: str, choice: str):
+            session = sessions.get(session_id)
+            state = session.state if session else None
+
             if state is None:
                 return(
-                    state,
+                    session_id,
                     "**Phase:** -",
                     "**Secured cash:** 0",
                     "No game in progress",
@@ -323,7 +464,7 @@ def create_app(root_dir: pathlib.Path) -> gr.Blocks:
             
             if state.phase != GamePhase.CHASE:
                 return (
-                    state,
+                    session_id,
                     f"**Phase:** {state.phase.name}",
                     f"**Secured cash:** {state.player.secured_cash}",
                     "Board: Offer selection is only available after cash builder",
@@ -335,7 +476,7 @@ def create_app(root_dir: pathlib.Path) -> gr.Blocks:
             if choice not in ["low", "mid", "high"]:
                 feedback = "Please select an offer before confirming"
                 return(
-                    state,
+                    session_id,
                     f"**Phase:** {state.phase.name}",
                     f"Secured cash:** {state.player.secured_cash}",
                     "Board: Offer not chosen",
@@ -348,13 +489,7 @@ def create_app(root_dir: pathlib.Path) -> gr.Blocks:
 
             q = get_next_chase_question_for_state(state)
             if q is not None:
-                chase_q_md = (
-                    f"**Question:** {q.question}\n\n"
-                    f"A) {q.options['A']}\n"
-                    f"B) {q.options['B']}\n"
-                    f"C) {q.options['C']}\n"
-                    f"D) {q.options['D']}"
-                )
+                chase_q_md = format_question_md(q)
             
             else:
                 chase_q_md = "No chase question available"
@@ -374,7 +509,7 @@ def create_app(root_dir: pathlib.Path) -> gr.Blocks:
             )
 
             return (
-                state,
+                session_id,
                 phase_text,
                 secured_text,
                 board_status,
@@ -382,23 +517,30 @@ def create_app(root_dir: pathlib.Path) -> gr.Blocks:
                 cb_feedback
             )
         
-        offer_confirm_btn.click(
+        on_click(
+            offer_confirm_btn,
             choose_offer_cb,
-            inputs=[game_state, offer_choice_radio],
+            inputs=[session_id_state, offer_choice_radio],
             outputs=[
-                game_state,
+                session_id_state,
                 current_phase_md,
                 secured_cash_md,
                 board_status_md,
                 chase_question_md,
                 cash_builder_feedback_md
             ],
+            concurrency_limit=FAST_EVENT_CONCURRENCY,
+            concurrency_id="fast",
         )
 
-        def chase_submit_cb(state: GameState, chaser_logic: ChaserLogic, player_choice: str):
+        async def chase_submit_cb(session_id: str, player_choice: str):
+            session = sessions.get(session_id)
+            state = session.state if session else None
+            chaser_logic = session.chaser if session else None
+
             if state is None or chaser_logic is None:
                 return(
-                    state,
+                    session_id,
                     "**Phase:** -",
                     "**Secured cash:** 0",
                     "Board: No active game",
@@ -411,7 +553,7 @@ def create_app(root_dir: pathlib.Path) -> gr.Blocks:
             
             if state.phase != GamePhase.CHASE:
                 return(
-                    state,
+                    session_id,
                     f"**Phase:** {state.phase.name}",
                     f"**Secured cash:** {state.player.secured_cash}",
                     "Board: Not in chase phase",
@@ -429,7 +571,8 @@ def create_app(root_dir: pathlib.Path) -> gr.Blocks:
                 q = get_next_chase_question_for_state(state)
                 state.current_question = q
 
-            state, chaser_answer, comment = run_chase_step_with_chaser(state, player_choice, chaser_logic)
+            with llm_work(flow=session_id):
+                state, chaser_answer, comment = await arun_chase_step_with_chaser(state, player_choice, chaser_logic)
 
             board_status = (
                 f"Board: Player at {state.player.board_position}, "
@@ -447,13 +590,7 @@ def create_app(root_dir: pathlib.Path) -> gr.Blocks:
             if state.phase == GamePhase.CHASE:
                 q_next = get_next_chase_question_for_state(state)
                 if q_next is not None:
-                    q_md = (
-                        f"**Question:** {q_next.question}\n\n"
-                        f"A) {q_next.options['A']}\n"
-                        f"B) {q_next.options['B']}\n"
-                        f"C) {q_next.options['C']}\n"
-                        f"D) {q_next.options['D']}"
-                    )
+                    q_md = format_question_md(q_next)
 
                 else:
                     q_md = "No more chase questions"
@@ -467,7 +604,7 @@ def create_app(root_dir: pathlib.Path) -> gr.Blocks:
                 q_md = "Chase phase is over"
 
             return (
-                state,
+                session_id,
                 phase_text,
                 secured_text,
                 board_status,
@@ -478,11 +615,12 @@ def create_app(root_dir: pathlib.Path) -> gr.Blocks:
                 chase_status
             )
         
-        chase_submit_btn.click(
+        on_click(
+                chase_submit_btn,
                 chase_submit_cb,
-                inputs=[game_state, chaser_logic_state, chase_options],
+                inputs=[session_id_state, chase_options],
                 outputs=[
-                    game_state,
+                    session_id_state,
                     current_phase_md,
                     secured_cash_md,
                     board_status_md,
@@ -491,13 +629,18 @@ def create_app(root_dir: pathlib.Path) -> gr.Blocks:
                     chaser_correct_md,
                     chaser_comment_md,
                     chase_status_md
-                ]
+                ],
+                concurrency_limit=LLM_EVENT_CONCURRENCY,
+                concurrency_id="llm",
             )
         
-        def final_start_cb(state: GameState):
+        def final_start_cb(session_id: str):
+            session = sessions.get(session_id)
+            state = session.state if session else None
+
             if state is None:
                 return (
-                    state,
+                    session_id,
                     "**Phase:** -",
                     "**Secured cash:** 0",
                     "No active game",
@@ -511,13 +654,7 @@ def create_app(root_dir: pathlib.Path) -> gr.Blocks:
 
             q = get_final_chase_player_question(state)
             if q is not None:
-                q_md = (
-                    f"**Question:** {q.question}\n\n"
-                    f"A) {q.options['A']}\n"
-                    f"B) {q.options['B']}\n"
-                    f"C) {q.options['C']}\n"
-                    f"D) {q.options['D']}"
-                )
+                q_md = format_question_md(q)
 
             else:
                 q_md = "No final chase question available"
@@ -525,29 +662,35 @@ def create_app(root_dir: pathlib.Path) -> gr.Blocks:
             progress = "Final chase progress: 0 correct"
 
             return (
-                state,
+                session_id,
                 phase_text,
                 secured_text,
                 q_md,
                 progress
             )
         
-        final_start_btn.click(
+        on_click(
+            final_start_btn,
             final_start_cb,
-            inputs=[game_state],
+            inputs=[session_id_state],
             outputs=[
-                game_state,
+                session_id_state,
                 current_phase_md,
                 secured_cash_md,
                 final_question_md,
                 final_progress_md
-            ]
+            ],
+            concurrency_limit=FAST_EVENT_CONCURRENCY,
+            concurrency_id="fast",
         )
 
-        def final_submit_cb(state:GameState, player_choice: str):
+        def final_submit_cb(session_id: str, player_choice: str):
+            session = sessions.get(session_id)
+            state = session.state if session else None
+
             if state is None:
                 return(
-                    state,
+                    session_id,
                     "**Phase:** -",
                     "**Secured cash:** 0",
                     "No active game",
@@ -556,9 +699,9 @@ def create_app(root_dir: pathlib.Path) -> gr.Blocks:
             
             if state.phase != GamePhase.FINAL_CHASE:
                 return(
-                    state,
+                    session_id,
                     f"**Phase:** {state.phase.name}",
-                    f"**Secured cash:** {state.player.secured_cash}"
+                    f"**Secured cash:** {state.player.secured_cash}",
                     "Not in final chase phase",
                     "Final chase progress: 0 correct"
                 )
@@ -566,15 +709,11 @@ def create_app(root_dir: pathlib.Path) -> gr.Blocks:
             if player_choice not in ["A", "B", "C", "D"]:
                 player_choice = "X"
 
-            before_correct = state.final_chase.player_current_index if hasattr(
-                state.final_chase, "player_correct"
-            ) else 0
+            before_correct = state.player.final_chase_score
 
             state = advence_final_chase_player(state, player_choice)
 
-            after_correct = state.final_chase.player_current_index if hasattr(
-                state.final_chase, "player_correct"
-            ) else before_correct
+            after_correct = state.player.final_chase_score
 
             gained = after_correct - before_correct
             if gained > 0:
@@ -589,16 +728,13 @@ def create_app(root_dir: pathlib.Path) -> gr.Blocks:
             if state.phase == GamePhase.FINAL_CHASE:
                 q = get_final_chase_player_question(state)
                 if q is not None:
-                    q_md = (
-                        f"**Question:** {q.question}\n\n"
-                        f"A) {q.options['A']}\n"
-                        f"B) {q.options['B']}\n"
-                        f"C) {q.options['C']}\n"
-                        f"D) {q.options['D']}"
-                    )
+                    q_md = format_question_md(q)
 
                 else:
-                    q_md = "No more final chase questions"
+                    q_md = (
+                        "No more final chase questions.\n\n"
+                        "Click **Run chaser's final chase** to see if the chaser catches you."
+                    )
 
                 full_feedback = feedback
 
@@ -610,7 +746,7 @@ def create_app(root_dir: pathlib.Path) -> gr.Blocks:
                 q_md = "Final chase is over"
 
             return(
-                state,
+                session_id,
                 phase_text,
                 secured_text,
                 full_feedback,
@@ -618,17 +754,96 @@ def create_app(root_dir: pathlib.Path) -> gr.Blocks:
                 q_md
             )
         
-        final_submit_btn.click(
+        on_click(
+            final_submit_btn,
             final_submit_cb,
-            inputs=[game_state, final_options],
+            inputs=[session_id_state, final_options],
             outputs=[
-                game_state,
+                session_id_state,
                 current_phase_md,
                 secured_cash_md,
                 final_feedback_md,
                 final_progress_md,
                 final_question_md
-            ]
+            ],
+            concurrency_limit=FAST_EVENT_CONCURRENCY,
+            concurrency_id="fast",
+        )
+
+        async def final_chaser_cb(session_id: str):
+            session = sessions.get(session_id)
+            state = session.state if session else None
+            chaser_logic = session.chaser if session else None
+
+            if state is None or chaser_logic is None:
+                yield (
+                    session_id,
+                    "**Phase:** -",
+                    "Start a new game first",
+                    "Chaser final chase progress: -"
+                )
+                return
+
+            if state.phase != GamePhase.FINAL_CHASE or get_final_chase_player_question(state) is not None:
+                yield (
+                    session_id,
+                    f"**Phase:** {state.phase.name}",
+                    "Finish your final chase questions first",
+                    "Chaser final chase progress: -"
+                )
+                return
+
+            target = state.player.final_chase_score
+            total = len(state.final_chase.chaser_questions)
+            marks = ["…"] * total
+
+            yield (
+                session_id,
+                f"**Phase:** {state.phase.name}",
+                f"The chaser needs {target} correct answers to beat you (a tie goes to the chaser)...",
+                f"Chaser final chase progress: 0/{total} answered"
+            )
+
+            async for state, idx, chaser_answer in arun_final_chase_chaser_round(state, chaser_logic, flow=session_id):
+                marks[idx] = "✔" if chaser_answer.is_correct else "✘"
+                answered = state.final_chase.chaser_current_index
+
+                progress = (
+                    f"Chaser final chase progress: {answered}/{total} answered, "
+                    f"{state.chaser.final_chase_score} correct\n\n"
+                    + " ".join(marks)
+                )
+
+                if state.phase == GamePhase.COMPLETED:
+                    feedback = (
+                        f"{state.outcome_message}\n\n"
+                        f"Player: {state.player.final_chase_score}, "
+                        f"Chaser: {state.chaser.final_chase_score}"
+                    )
+                else:
+                    feedback = f"The chaser needs {target} correct answers to beat you (a tie goes to the chaser)..."
+
+                yield (
+                    session_id,
+                    f"**Phase:** {state.phase.name}",
+                    feedback,
+                    progress
+                )
+
+        on_click(
+            final_chaser_btn,
+            final_chaser_cb,
+            inputs=[session_id_state],
+            outputs=[
+                session_id_state,
+                current_phase_md,
+                final_feedback_md,
+                final_chaser_progress_md
+            ],
+            concurrency_limit=LLM_EVENT_CONCURRENCY,
+            concurrency_id="llm",
         )
 
+    demo.queue(max_size=QUEUE_MAX_SIZE)
+
     return demo
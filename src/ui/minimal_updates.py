@@ -0,0 +1,191 @@
+"""
+Send only the components that changed.
+
+Every callback returns the session id first, followed by the values for its
+outputs. The wrapper below remembers, per session, the last value sent to
+each component and replaces unchanged values with gr.skip(), so an
+interaction only ships what actually changed. It also records, per
+callback, the payload size with and without the diff and the server time,
+and keeps the spans traced during each call on the session.
+"""
+
+import functools
+import inspect
+import json
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import gradio as gr
+
+from src.game.session_manager import GameSession, SessionManager
+from src.utils.tracing import collect_spans, is_enabled, record
+
+SKIP_BYTES = len(json.dumps(gr.skip()))
+RENDER_SPAN = "ui.render_updates"
+
+
+@dataclass
+class CallbackPayloadStats:
+    calls: int = 0
+    full_bytes: int = 0
+    sent_bytes: int = 0
+    server_seconds: float = 0.0
+
+
+class PayloadStats:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.by_callback: Dict[str, CallbackPayloadStats] = {}
+
+    def record(self, name: str, full_bytes: int, sent_bytes: int, server_seconds: float) -> None:
+        with self._lock:
+            stats = self.by_callback.setdefault(name, CallbackPayloadStats())
+            stats.calls += 1
+            stats.full_bytes += full_bytes
+            stats.sent_bytes += sent_bytes
+            stats.server_seconds += server_seconds
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        with self._lock:
+            return {
+                name: {
+                    "calls": s.calls,
+                    "avg_full_bytes": round(s.full_bytes / s.calls, 1),
+                    "avg_sent_bytes": round(s.sent_bytes / s.calls, 1),
+                    "avg_server_ms": round(s.server_seconds / s.calls * 1000, 3),
+                }
+                for name, s in self.by_callback.items() if s.calls
+            }
+
+    def format_markdown(self) -> str:
+        rows = [
+            f"| {name} | {s['calls']} | {s['avg_full_bytes']:.0f} | {s['avg_sent_bytes']:.0f} | {s['avg_server_ms']:.1f} |"
+            for name, s in self.summary().items()
+        ]
+        if not rows:
+            return "_No interactions yet._"
+
+        header = (
+            "| callback | calls | avg bytes (full) | avg bytes (sent) | avg server ms |\n"
+            "|---|---|---|---|---|"
+        )
+        return header + "\n" + "\n".join(rows)
+
+
+def _value_bytes(value: Any) -> int:
+    return len(json.dumps(value, default=str, ensure_ascii=False).encode("utf-8"))
+
+
+def _diff(
+    result: Tuple,
+    outputs: Sequence[gr.components.Component],
+    session: Optional[GameSession],
+) -> Tuple[Tuple, int, int]:
+    cache = session.ui_cache if session is not None else {}
+
+    sent: List[Any] = []
+    full_bytes = 0
+    sent_bytes = 0
+
+    for component, value in zip(outputs, result):
+        # gr.State never leaves the server
+        is_state = isinstance(component, gr.State)
+        size = 0 if is_state else _value_bytes(value)
+        full_bytes += size
+
+        key = component._id
+        # a skip marker is not free, so tiny unchanged values are re-sent as is
+        if key in cache and cache[key] == value and (is_state or size > SKIP_BYTES):
+            sent.append(gr.skip())
+            sent_bytes += 0 if is_state else SKIP_BYTES
+        else:
+            cache[key] = value
+            sent.append(value)
+            sent_bytes += size
+
+    return tuple(sent), full_bytes, sent_bytes
+
+
+def minimal_updates(
+    fn: Callable,
+    outputs: Sequence[gr.components.Component],
+    sessions: SessionManager,
+    stats: PayloadStats,
+) -> Callable:
+    """
+    Wrap a callback (sync, async or a generator of either kind) so that
+    unchanged outputs are replaced with gr.skip().
+    """
+    name = fn.__name__
+    span_name = f"ui.{name}"
+
+    def finish(result: Tuple, t0: float, spans: List[Tuple[str, float]]) -> Tuple:
+        session = sessions.get(result[0])
+        t_render = time.perf_counter()
+        sent, full_bytes, sent_bytes = _diff(result, outputs, session)
+        t_end = time.perf_counter()
+
+        stats.record(name, full_bytes, sent_bytes, t_end - t0)
+
+        if is_enabled():
+            for traced_name, seconds in ((RENDER_SPAN, t_end - t_render), (span_name, t_end - t0)):
+                record(traced_name, seconds)
+                spans.append((traced_name, seconds))
+            if session is not None:
+                session.spans.extend(spans)
+
+        return sent
+
+    # each step runs inside its own collector: gradio may drive the steps of
+    # a generator from different threads or tasks
+
+    if inspect.isasyncgenfunction(fn):
+        @functools.wraps(fn)
+        async def async_gen_wrapper(*args):
+            results = fn(*args)
+            while True:
+                t0 = time.perf_counter()
+                with collect_spans() as spans:
+                    try:
+                        result = await results.__anext__()
+                    except StopAsyncIteration:
+                        return
+                yield finish(result, t0, spans)
+
+        return async_gen_wrapper
+
+    if inspect.iscoroutinefunction(fn):
+        @functools.wraps(fn)
+        async def async_wrapper(*args):
+            t0 = time.perf_counter()
+            with collect_spans() as spans:
+                result = await fn(*args)
+            return finish(result, t0, spans)
+
+        return async_wrapper
+
+    if inspect.isgeneratorfunction(fn):
+        @functools.wraps(fn)
+        def gen_wrapper(*args):
+            results = fn(*args)
+            while True:
+                t0 = time.perf_counter()
+                with collect_spans() as spans:
+                    try:
+                        result = next(results)
+                    except StopIteration:
+                        return
+                yield finish(result, t0, spans)
+
+        return gen_wrapper
+
+    @functools.wraps(fn)
+    def wrapper(*args):
+        t0 = time.perf_counter()
+        with collect_spans() as spans:
+            result = fn(*args)
+        return finish(result, t0, spans)
+
+    return wrapper
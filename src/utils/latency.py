@@ -0,0 +1,22 @@
+from typing import Dict, List
+
+
+def latency_percentiles(samples: List[float]) -> Dict[str, float]:
+    """
+    p50/p95/p99/max in milliseconds for latency samples given in seconds.
+    """
+    if not samples:
+        return {"count": 0, "p50_ms": 0.0, "p95_ms": 0.0, "p99_ms": 0.0, "max_ms": 0.0}
+
+    import numpy as np
+
+    arr = np.asarray(samples) * 1000.0
+    p50, p95, p99 = np.percentile(arr, [50, 95, 99])
+
+    return {
+        "count": int(arr.size),
+        "p50_ms": round(float(p50), 3),
+        "p95_ms": round(float(p95), 3),
+        "p99_ms": round(float(p99), 3),
+        "max_ms": round(float(arr.max()), 3),
+    }
@@ -0,0 +1,38 @@
+import os
+import resource
+import sys
+
+
+def get_rss_bytes() -> int:
+    """
+    Current resident set size of this process in bytes.
+    Falls back to the peak RSS where /proc is not available.
+    """
+    try:
+        with open("/proc/self/statm", "r") as f:
+            resident_pages = int(f.read().split()[1])
+        return resident_pages * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        pass
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in kilobytes on Linux and in bytes on macOS
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def get_private_bytes() -> int:
+    """
+    Memory only this process uses (private clean + dirty pages), i.e. not
+    shared with the parent of a pre-forked worker. 0 where /proc is not available.
+    """
+    try:
+        with open("/proc/self/smaps_rollup", "r") as f:
+            lines = f.read().splitlines()
+    except OSError:
+        return 0
+
+    total_kb = 0
+    for line in lines:
+        if line.startswith(("Private_Clean:", "Private_Dirty:")):
+            total_kb += int(line.split()[1])
+    return total_kb * 1024
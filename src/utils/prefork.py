@@ -0,0 +1,97 @@
+"""
+Pre-fork multi-process serving.
+
+The parent loads everything read-only that workers share (question pool,
+question stats, comment bank, heavy imports), freezes the heap and forks
+the workers. Frozen objects are moved out of the GC generations, so
+collections in the workers do not write to their headers and the pages
+stay shared copy-on-write. Reference counting still writes to the objects
+a worker touches, so a worker's private memory grows with what it uses,
+not with what the parent loaded.
+
+Each worker runs its own server (and event loop, and GIL). Games live in
+the memory of the worker that created them, so every worker gets its own
+port; put a proxy with sticky routing in front for a single address.
+"""
+
+import gc
+import importlib
+import os
+import pathlib
+import signal
+import sys
+import threading
+import traceback
+from typing import Callable, Dict
+
+
+def fork_workers(n_workers: int, serve: Callable[[int], None]) -> int:
+    """
+    Fork `n_workers` processes running `serve(worker_index)`, forward
+    SIGTERM to them and wait until all have exited. Returns the
+    number of workers that failed.
+    """
+    if threading.active_count() > 1:
+        # a forked child only gets the calling thread: locks held by the
+        # others would stay locked forever
+        raise RuntimeError("Threads must be started in the workers, not before forking")
+
+    gc.collect()
+    gc.freeze()
+
+    children: Dict[int, int] = {}
+    for index in range(n_workers):
+        pid = os.fork()
+        if pid == 0:
+            code = 0
+            try:
+                serve(index)
+            except BaseException:
+                traceback.print_exc()
+                code = 1
+            finally:
+                sys.stdout.flush()
+                sys.stderr.flush()
+                os._exit(code)
+        children[pid] = index
+
+    def forward(signum, frame) -> None:
+        for pid in children:
+            try:
+                os.kill(pid, signum)
+            except ProcessLookupError:
+                pass
+
+    signal.signal(signal.SIGTERM, forward)
+    # Ctrl+C already reaches the workers through the process group; a
+    # second SIGINT would make them skip their graceful shutdown
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+    failed = 0
+    while children:
+        try:
+            pid, status = os.wait()
+        except ChildProcessError:
+            break
+        index = children.pop(pid, None)
+        if index is not None and os.waitstatus_to_exitcode(status) not in (0, -signal.SIGINT, -signal.SIGTERM):
+            failed += 1
+            print(f"worker {index} (pid {pid}) exited with status {os.waitstatus_to_exitcode(status)}", file=sys.stderr)
+
+    return failed
+
+
+def preload(*module_names: str) -> None:
+    """
+    Import modules that are otherwise imported on first use, so the
+    workers share them instead of each importing its own copy.
+    """
+    for name in module_names:
+        importlib.import_module(name)
+
+
+def worker_path(path: pathlib.Path, worker_index: int) -> pathlib.Path:
+    """
+    Per-worker variant of a data file: data/x.npz -> data/x.worker<i>.npz
+    """
+    return path.with_name(f"{path.stem}.worker{worker_index}{path.suffix}")
@@ -1,15 +1,17 @@
 import json
 import pathlib
 import random
-from typing import List
+from typing import TYPE_CHECKING, List, Optional
 from dataclasses import asdict
 
-import pandas as pd
+if TYPE_CHECKING:
+    import pandas as pd
 
 from .data_models import Question
 
 PROCESSED_CLEAN_CSV_PATH = pathlib.Path("data/processed/cleaned_preview.csv")
 PROCESSED_QUESTIONS_PATH = pathlib.Path("data/processed/question_chaser.jsonl")
+PROCESSED_INDEX_PATH = pathlib.Path("data/processed/question_chaser.index.npz")
 
 """
 1. Load one or more raw OpenTriviaQA CSV files from data/raw/.
@@ -21,7 +23,7 @@ PROCESSED_QUESTIONS_PATH = pathlib.Path("data/processed/question_chaser.jsonl")
 
 
 
-def normalize_question_row(row: pd.Series, qid: str) -> Question:
+def normalize_question_row(row: "pd.Series", qid: str) -> Question:
     question_text = str(row['Questions']).strip()
 
     options = {
@@ -56,7 +58,9 @@ def normalize_question_row(row: pd.Series, qid: str) -> Question:
         correct_option = correct_option
     )
 
-def load_and_normalize_questions(csv_path:pathlib.Path) -> List[Question]:
+def load_and_normalize_questions(csv_path:pathlib.Path, seed: Optional[int] = None) -> List[Question]:
+    import pandas as pd
+
     df = pd.read_csv(csv_path)
 
     questions: List[Question] = []
@@ -86,7 +90,7 @@ def load_and_normalize_questions(csv_path:pathlib.Path) -> List[Question]:
         seen_keys.add(key)
         unique_questions.append(q)
 
-    random.shuffle(unique_questions)
+    random.Random(seed).shuffle(unique_questions)
 
     print(f"Total rows in cleaned csv: {len(questions)}")
     print(f"After dedup: {len(unique_questions)}")
@@ -0,0 +1,331 @@
+"""
+Inverted token index over the question pool.
+
+Built by scripts/prepare_questions.py next to the processed pool and
+loaded with it, so keyword lookups never scan the questions:
+
+- search(): boolean keyword queries ("nile river", "egypt OR sudan",
+  "war -world"), answered from sorted posting lists: short ones are
+  intersected by binary search, frequent terms as cached masks
+- exclusion: questions matching any of CHASER_EXCLUDED_KEYWORDS
+  (comma-separated, each one a query) are dropped from the pool at load
+- topic-balanced draws: a rare term (one that only a handful of questions
+  share) is a good proxy for the topic of a question. With
+  CHASER_TOPIC_BALANCED=1, the engine avoids drawing two questions sharing
+  a rare term within one game (see engine.draw_questions)
+
+File layout (one .npz): question ids, a CRC32 of the whole pool (an index
+built from another version of the pool is rebuilt in memory instead of
+being used), the sorted vocabulary, the posting list of every term as one
+int32 array with one offset per term, and the terms of every question the
+same way.
+"""
+
+import os
+import pathlib
+import re
+import zlib
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .data_models import Question
+
+OPTIONS = ["A", "B", "C", "D"]
+
+TOKEN_RE = re.compile(r"\w+")
+STOPWORDS = frozenset(
+    "a an and are as at be by did do does for from had has have he his how in is it its "
+    "name not of on or she that the their this to was were what when where which who whom "
+    "whose why with you your".split()
+)
+MIN_TOKEN_LENGTH = 2
+
+QUERY_OR = "OR"
+QUERY_NOT = "-"
+
+# a term shared by more questions than this is not specific to a topic
+RARE_MAX_DF_DEFAULT = 20
+
+# candidate lists longer than 1/DENSE_RATIO of the pool are combined as masks
+DENSE_RATIO = 64
+
+
+def tokenize(text: str) -> List[str]:
+    return [
+        token for token in TOKEN_RE.findall(text.lower())
+        if len(token) >= MIN_TOKEN_LENGTH and token not in STOPWORDS
+    ]
+
+
+def _contains(sorted_positions: np.ndarray, positions: np.ndarray) -> np.ndarray:
+    """
+    Which of `positions` are in `sorted_positions`.
+    """
+    if not len(sorted_positions):
+        return np.zeros(len(positions), dtype=bool)
+    i = np.searchsorted(sorted_positions, positions)
+    i[i == len(sorted_positions)] = 0
+    return sorted_positions[i] == positions
+
+
+def question_text(question: Question) -> str:
+    return " ".join([question.question, *(question.options[o] for o in OPTIONS)])
+
+
+def pool_fingerprint(questions: Sequence[Question]) -> int:
+    crc = 0
+    for q in questions:
+        crc = zlib.crc32(f"{q.id}\x1f{question_text(q)}\x1e".encode("utf-8"), crc)
+    return crc
+
+
+class QuestionIndex:
+    def __init__(
+            self,
+            ids: List[str],
+            fingerprint: int,
+            terms: List[str],
+            term_offsets: np.ndarray,
+            postings: np.ndarray,
+            doc_offsets: np.ndarray,
+            doc_terms: np.ndarray,
+            rare_max_df: int = RARE_MAX_DF_DEFAULT
+    ):
+        self.ids = ids
+        self.fingerprint = fingerprint
+        self.terms = terms
+        self.term_offsets = term_offsets
+        self.postings = postings
+        self.doc_offsets = doc_offsets
+        self.doc_terms = doc_terms
+
+        self._term_ids: Dict[str, int] = {term: i for i, term in enumerate(terms)}
+        self._masks: Dict[str, np.ndarray] = {}
+        self._positions: Dict[str, int] = {qid: i for i, qid in enumerate(ids)}
+        self.df = np.diff(term_offsets)
+        self.rare_max_df = rare_max_df
+        # a term of a single question cannot be shared with another one
+        self._rare = (self.df >= 2) & (self.df <= rare_max_df)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    # ---------- building ----------
+
+    @classmethod
+    def build(cls, questions: Sequence[Question], rare_max_df: int = RARE_MAX_DF_DEFAULT) -> "QuestionIndex":
+        term_ids: Dict[str, int] = {}
+        doc_offsets = [0]
+        doc_terms: List[int] = []
+        for q in questions:
+            # each term once per question, in first-seen order
+            for token in dict.fromkeys(tokenize(question_text(q))):
+                doc_terms.append(term_ids.setdefault(token, len(term_ids)))
+            doc_offsets.append(len(doc_terms))
+
+        # renumber the terms in sorted order
+        terms = sorted(term_ids)
+        order = np.empty(len(terms), dtype=np.int32)
+        order[[term_ids[term] for term in terms]] = np.arange(len(terms), dtype=np.int32)
+
+        doc_terms_arr = order[np.array(doc_terms, dtype=np.int32)] if doc_terms else np.zeros(0, dtype=np.int32)
+        doc_offsets_arr = np.array(doc_offsets, dtype=np.int64)
+        doc_of = np.repeat(np.arange(len(questions), dtype=np.int32), np.diff(doc_offsets_arr))
+
+        # stable sort by term keeps every posting list sorted by question
+        by_term = np.argsort(doc_terms_arr, kind="stable")
+        postings = doc_of[by_term]
+        term_offsets = np.zeros(len(terms) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(doc_terms_arr, minlength=len(terms)), out=term_offsets[1:])
+
+        return cls(
+            ids=[q.id for q in questions],
+            fingerprint=pool_fingerprint(questions),
+            terms=terms,
+            term_offsets=term_offsets,
+            postings=postings,
+            doc_offsets=doc_offsets_arr,
+            doc_terms=doc_terms_arr,
+            rare_max_df=rare_max_df
+        )
+
+    # ---------- persistence ----------
+
+    def save(self, path: pathlib.Path) -> None:
+        """
+        Write the index to `path` atomically.
+        """
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(path.name + ".tmp")
+        with tmp_path.open("wb") as f:
+            np.savez_compressed(
+                f,
+                ids=np.array(self.ids, dtype=str),
+                fingerprint=np.array([self.fingerprint], dtype=np.uint32),
+                terms=np.array(self.terms, dtype=str),
+                term_offsets=self.term_offsets,
+                postings=self.postings,
+                doc_offsets=self.doc_offsets,
+                doc_terms=self.doc_terms,
+            )
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(
+            cls,
+            path: pathlib.Path,
+            questions: Sequence[Question],
+            rare_max_df: int = RARE_MAX_DF_DEFAULT
+    ) -> "QuestionIndex":
+        """
+        The index saved at `path`, or one built in memory from `questions`
+        if there is no file or it was built from another pool.
+        """
+        if path.exists():
+            with np.load(path) as data:
+                fingerprint = int(data["fingerprint"][0])
+                if fingerprint == pool_fingerprint(questions):
+                    return cls(
+                        ids=data["ids"].tolist(),
+                        fingerprint=fingerprint,
+                        terms=data["terms"].tolist(),
+                        term_offsets=data["term_offsets"],
+                        postings=data["postings"],
+                        doc_offsets=data["doc_offsets"],
+                        doc_terms=data["doc_terms"],
+                        rare_max_df=rare_max_df
+                    )
+
+        return cls.build(questions, rare_max_df)
+
+    # ---------- queries ----------
+
+    def _postings(self, token: str) -> np.ndarray:
+        i = self._term_ids.get(token)
+        if i is None:
+            return self.postings[:0]
+        return self.postings[self.term_offsets[i]:self.term_offsets[i + 1]]
+
+    def _term_mask(self, token: str) -> np.ndarray:
+        """
+        Mask of the questions containing `token`, kept for frequent terms.
+        """
+        mask = self._masks.get(token)
+        if mask is None:
+            postings = self._postings(token)
+            mask = np.zeros(len(self.ids), dtype=bool)
+            mask[postings] = True
+            if len(postings) * DENSE_RATIO >= len(self.ids):
+                self._masks[token] = mask
+        return mask
+
+    def _clause(self, words: List[str]) -> np.ndarray:
+        """
+        Sorted positions matching all the words, or a mask over the pool
+        when there are many candidates.
+        """
+        include: List[str] = []
+        exclude: List[str] = []
+        for word in words:
+            negated = word.startswith(QUERY_NOT)
+            # "anglo-saxon" is split into tokens like the questions were
+            tokens = tokenize(word[1:] if negated else word)
+            (exclude if negated else include).extend(tokens)
+
+        if not include:
+            if not exclude:
+                return self.postings[:0]
+            mask = np.ones(len(self.ids), dtype=bool)
+            for token in exclude:
+                mask &= ~self._term_mask(token)
+            return mask
+
+        # shortest list first: the result is at most that long
+        include.sort(key=lambda token: len(self._postings(token)))
+        positions = self._postings(include[0])
+
+        if len(positions) * DENSE_RATIO < len(self.ids):
+            # few candidates: binary search them in the other lists
+            for token in include[1:]:
+                positions = positions[_contains(self._postings(token), positions)]
+            for token in exclude:
+                positions = positions[~_contains(self._postings(token), positions)]
+            return positions
+
+        mask = self._term_mask(include[0]).copy()
+        for token in include[1:]:
+            mask &= self._term_mask(token)
+        for token in exclude:
+            mask &= ~self._term_mask(token)
+        return mask
+
+    def _union(self, results: List[np.ndarray]) -> np.ndarray:
+        if not results:
+            return self.postings[:0]
+        if len(results) == 1 and results[0].dtype != bool:
+            return results[0]
+
+        mask = np.zeros(len(self.ids), dtype=bool)
+        for result in results:
+            if result.dtype == bool:
+                mask |= result
+            else:
+                mask[result] = True
+        return np.flatnonzero(mask).astype(np.int32)
+
+    def positions(self, query: str) -> np.ndarray:
+        """
+        Sorted pool positions of the questions matching `query`. Words are
+        ANDed, "OR" separates alternatives and "-word" excludes a word.
+        Matching is on whole tokens, case-insensitive; stopwords are ignored.
+        """
+        clauses: List[List[str]] = [[]]
+        for word in query.split():
+            if word == QUERY_OR:
+                clauses.append([])
+            else:
+                clauses[-1].append(word)
+
+        return self._union([self._clause(words) for words in clauses if words])
+
+    def search(self, query: str, limit: Optional[int] = None) -> List[str]:
+        """
+        Ids of the questions matching `query`, in pool order.
+        """
+        positions = self.positions(query)
+        if limit is not None:
+            positions = positions[:limit]
+        return [self.ids[i] for i in positions.tolist()]
+
+    def matching_any(self, queries: Iterable[str]) -> np.ndarray:
+        return self._union([self.positions(query) for query in queries])
+
+    def exclude(self, questions: List[Question], queries: Iterable[str]) -> List[Question]:
+        """
+        `questions` without the ones matching any of `queries`.
+        """
+        excluded = {self.ids[i] for i in self.matching_any(queries).tolist()}
+        if not excluded:
+            return questions
+        return [q for q in questions if q.id not in excluded]
+
+    # ---------- topics ----------
+
+    def rare_terms(self, qid: str) -> Tuple[int, ...]:
+        """
+        Term ids of the question that only a few other questions share.
+        """
+        i = self._positions.get(qid)
+        if i is None:
+            return ()
+        terms = self.doc_terms[self.doc_offsets[i]:self.doc_offsets[i + 1]]
+        return tuple(terms[self._rare[terms]].tolist())
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "questions": len(self.ids),
+            "terms": len(self.terms),
+            "postings": int(len(self.postings)),
+            "rare_terms": int(self._rare.sum()),
+        }
@@ -0,0 +1,238 @@
+"""
+Lightweight span tracing for the hot paths.
+
+`traced` wraps a function (sync or async) and `span` a block. Every
+finished span is added to an in-process latency histogram (exported in
+Prometheus text format by `render_prometheus`) and, if one is active, to
+the span collector of the current interaction, so the UI can show
+per-call latencies for a session.
+
+Tracing is on by default; set CHASER_TRACING=0 (or call set_enabled(False))
+and a traced call costs one flag check.
+"""
+
+import bisect
+import contextvars
+import functools
+import inspect
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Callable, Dict, Iterator, List, Optional, Tuple
+
+if TYPE_CHECKING:
+    from http.server import ThreadingHTTPServer
+
+# upper bounds in seconds, from a fast engine call to a slow LLM round trip
+BUCKETS = (
+    0.00001, 0.00005, 0.0001, 0.0005, 0.001, 0.005, 0.01, 0.025, 0.05,
+    0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0,
+)
+METRIC_NAME = "chaser_span_duration_seconds"
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+_enabled = os.getenv("CHASER_TRACING", "1").lower() not in ("0", "false", "no", "off")
+
+# spans of the interaction being handled; asyncio tasks and to_thread calls
+# inherit it, so spans from the LLM layer end up with the right session
+_collector: contextvars.ContextVar[Optional[List[Tuple[str, float]]]] = contextvars.ContextVar(
+    "chaser_span_collector", default=None
+)
+
+
+def set_enabled(enabled: bool) -> None:
+    global _enabled
+    _enabled = enabled
+
+
+def is_enabled() -> bool:
+    return _enabled
+
+
+class Histogram:
+    def __init__(self, buckets: Tuple[float, ...] = BUCKETS):
+        self.buckets = buckets
+        # one slot per bucket plus +Inf, non-cumulative
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+class SpanRegistry:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.histograms: Dict[str, Histogram] = {}
+
+    def observe(self, name: str, seconds: float) -> None:
+        with self._lock:
+            histogram = self.histograms.get(name)
+            if histogram is None:
+                histogram = self.histograms[name] = Histogram()
+            histogram.observe(seconds)
+
+    def reset(self) -> None:
+        with self._lock:
+            self.histograms.clear()
+
+    def render_prometheus(self, gauges: Optional[Dict[str, float]] = None) -> str:
+        """
+        All histograms (and optional extra gauges) in Prometheus text format.
+        """
+        lines = [
+            f"# HELP {METRIC_NAME} Duration of traced calls.",
+            f"# TYPE {METRIC_NAME} histogram",
+        ]
+
+        with self._lock:
+            for name in sorted(self.histograms):
+                h = self.histograms[name]
+                cumulative = 0
+                for bound, count in zip(h.buckets, h.counts):
+                    cumulative += count
+                    lines.append(f'{METRIC_NAME}_bucket{{span="{name}",le="{bound}"}} {cumulative}')
+                lines.append(f'{METRIC_NAME}_bucket{{span="{name}",le="+Inf"}} {h.count}')
+                lines.append(f'{METRIC_NAME}_sum{{span="{name}"}} {h.sum:.9f}')
+                lines.append(f'{METRIC_NAME}_count{{span="{name}"}} {h.count}')
+
+        typed = set()
+        for name, value in (gauges or {}).items():
+            # names may carry labels: 'metric{label="value"}'
+            base = name.split("{", 1)[0]
+            if base not in typed:
+                typed.add(base)
+                lines.append(f"# TYPE {base} gauge")
+            lines.append(f"{name} {value}")
+
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = SpanRegistry()
+
+
+def record(name: str, seconds: float) -> None:
+    REGISTRY.observe(name, seconds)
+
+    spans = _collector.get()
+    if spans is not None:
+        spans.append((name, seconds))
+
+
+@contextmanager
+def span(name: str) -> Iterator[None]:
+    if not _enabled:
+        yield
+        return
+
+    t0 = time.perf_counter()
+    try:
+        yield
+    finally:
+        record(name, time.perf_counter() - t0)
+
+
+@contextmanager
+def collect_spans() -> Iterator[List[Tuple[str, float]]]:
+    """
+    Collect the spans finished inside the block (including those of tasks
+    and threads started from it) into the yielded list.
+    """
+    spans: List[Tuple[str, float]] = []
+    token = _collector.set(spans)
+    try:
+        yield spans
+    finally:
+        _collector.reset(token)
+
+
+def traced(name: str) -> Callable[[Callable], Callable]:
+    """
+    Decorator recording every call of a sync or async function as span `name`.
+    """
+    def decorate(fn: Callable) -> Callable:
+        if inspect.iscoroutinefunction(fn):
+            @functools.wraps(fn)
+            async def async_wrapper(*args, **kwargs):
+                if not _enabled:
+                    return await fn(*args, **kwargs)
+
+                t0 = time.perf_counter()
+                try:
+                    return await fn(*args, **kwargs)
+                finally:
+                    record(name, time.perf_counter() - t0)
+
+            return async_wrapper
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return fn(*args, **kwargs)
+
+            t0 = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                record(name, time.perf_counter() - t0)
+
+        return wrapper
+
+    return decorate
+
+
+def summarize_spans(spans: List[Tuple[str, float]]) -> Dict[str, Dict[str, float]]:
+    """
+    Per span name: calls, last, average and max duration in milliseconds.
+    """
+    summary: Dict[str, Dict[str, float]] = {}
+
+    for name, seconds in spans:
+        ms = seconds * 1000.0
+        s = summary.setdefault(name, {"calls": 0, "last_ms": 0.0, "total_ms": 0.0, "max_ms": 0.0})
+        s["calls"] += 1
+        s["last_ms"] = ms
+        s["total_ms"] += ms
+        s["max_ms"] = max(s["max_ms"], ms)
+
+    for s in summary.values():
+        s["avg_ms"] = s.pop("total_ms") / s["calls"]
+
+    return summary
+
+
+def start_metrics_server(
+        port: int,
+        host: str = "127.0.0.1",
+        gauges: Optional[Callable[[], Dict[str, float]]] = None
+) -> "ThreadingHTTPServer":
+    """
+    Serve GET /metrics in Prometheus text format from a daemon thread.
+    """
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self) -> None:
+            if self.path.split("?", 1)[0] != "/metrics":
+                self.send_error(404)
+                return
+
+            body = REGISTRY.render_prometheus(gauges() if gauges else None).encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", PROMETHEUS_CONTENT_TYPE)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args) -> None:
+            pass
+
+    server = ThreadingHTTPServer((host, port), MetricsHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="metrics-server", daemon=True).start()
+
+    return server
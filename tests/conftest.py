@@ -0,0 +1,179 @@
+"""
+Micro-benchmarks for the hot paths, in the style of pytest-benchmark but
+without the extra dependency.
+
+Every test calls the `benchmark` fixture with the function to time. The
+median time per call is compared with tests/benchmark_baselines.json and
+calls that got slower than the threshold are listed at the end of the run.
+
+    python -m pytest tests -q                                # run and compare
+    python -m pytest tests -q --bench-save                   # store new baselines
+    python -m pytest tests -q --bench-fail-on-regression     # regressions fail
+"""
+
+import json
+import pathlib
+import platform
+import random
+import statistics
+import sys
+import time
+from typing import Any, Callable, Dict, List
+
+import pytest
+
+BASE_DIR = pathlib.Path(__file__).resolve().parents[1]
+if str(BASE_DIR) not in sys.path:
+    sys.path.insert(0, str(BASE_DIR))
+
+from src.utils.data_models import Question
+
+BASELINES_PATH = pathlib.Path(__file__).resolve().parent / "benchmark_baselines.json"
+POOL_SIZES = [100, 1_000, 10_000]
+
+ROUNDS = 7
+MIN_ROUND_SECONDS = 0.005
+MAX_BENCH_SECONDS = 1.0
+REGRESSION_THRESHOLD_DEFAULT = 0.30
+
+_results: Dict[str, Dict[str, float]] = {}
+_regressions: List[str] = []
+
+
+def pytest_addoption(parser) -> None:
+    group = parser.getgroup("bench")
+    group.addoption("--bench-save", action="store_true", help="Store the results as the new baselines")
+    group.addoption(
+        "--bench-threshold",
+        type=float,
+        default=REGRESSION_THRESHOLD_DEFAULT,
+        help="Relative slowdown over the baseline that counts as a regression",
+    )
+    group.addoption("--bench-fail-on-regression", action="store_true", help="Fail benchmarks that regressed")
+
+
+def _load_baselines() -> Dict[str, Any]:
+    if not BASELINES_PATH.exists():
+        return {}
+    return json.loads(BASELINES_PATH.read_text(encoding="utf-8"))
+
+
+# ---------- benchmark fixture ----------
+
+
+class Benchmark:
+    def __init__(self, name: str, config):
+        self.name = name
+        self.config = config
+        self.stats: Dict[str, float] = {}
+
+    def __call__(self, fn: Callable, *args, **kwargs) -> Any:
+        """
+        Time `fn(*args, **kwargs)` and return its result.
+
+        Each round runs the call enough times to last MIN_ROUND_SECONDS;
+        the reported time per call is the median over the rounds.
+        """
+        result = fn(*args, **kwargs)
+
+        t0 = time.perf_counter()
+        fn(*args, **kwargs)
+        once = max(time.perf_counter() - t0, 1e-9)
+        iterations = max(1, int(MIN_ROUND_SECONDS / once))
+
+        per_call: List[float] = []
+        started = time.perf_counter()
+        for _ in range(ROUNDS):
+            t0 = time.perf_counter()
+            for _ in range(iterations):
+                fn(*args, **kwargs)
+            per_call.append((time.perf_counter() - t0) / iterations)
+
+            if len(per_call) >= 3 and time.perf_counter() - started > MAX_BENCH_SECONDS:
+                break
+
+        self.stats = {
+            "median_us": round(statistics.median(per_call) * 1e6, 3),
+            "min_us": round(min(per_call) * 1e6, 3),
+            "rounds": len(per_call),
+            "iterations": iterations,
+        }
+        self._compare()
+
+        return result
+
+    def _compare(self) -> None:
+        _results[self.name] = self.stats
+
+        baseline = _load_baselines().get("benchmarks", {}).get(self.name)
+        if baseline is None or self.config.getoption("--bench-save"):
+            return
+
+        threshold = self.config.getoption("--bench-threshold")
+        ratio = self.stats["median_us"] / max(baseline["median_us"], 1e-6)
+        if ratio > 1.0 + threshold:
+            message = (
+                f"{self.name}: {self.stats['median_us']:.1f} us vs baseline "
+                f"{baseline['median_us']:.1f} us ({ratio:.2f}x)"
+            )
+            _regressions.append(message)
+            if self.config.getoption("--bench-fail-on-regression"):
+                pytest.fail(f"benchmark regression: {message}")
+
+
+@pytest.fixture
+def benchmark(request) -> Benchmark:
+    return Benchmark(request.node.name, request.config)
+
+
+def pytest_sessionfinish(session, exitstatus) -> None:
+    if not session.config.getoption("--bench-save") or not _results:
+        return
+
+    baselines = _load_baselines()
+    benchmarks = baselines.get("benchmarks", {})
+    benchmarks.update(_results)
+    baselines = {
+        "machine": f"{platform.machine()} {platform.system()} / Python {platform.python_version()}",
+        "benchmarks": dict(sorted(benchmarks.items())),
+    }
+    BASELINES_PATH.write_text(json.dumps(baselines, indent=2) + "\n", encoding="utf-8")
+
+
+def pytest_terminal_summary(terminalreporter) -> None:
+    if not _results:
+        return
+
+    terminalreporter.section("benchmarks")
+    for name, stats in sorted(_results.items()):
+        terminalreporter.write_line(f"{name:<60} {stats['median_us']:>12.2f} us")
+
+    if _regressions:
+        terminalreporter.section("benchmark regressions")
+        for message in _regressions:
+            terminalreporter.write_line(message)
+
+
+# ---------- synthetic data ----------
+
+
+WORDS = (
+    "capital river mountain king planet element novel composer painter ocean "
+    "empire battle language island desert treaty orbit saint festival dynasty"
+).split()
+
+
+def make_question(i: int, rng: random.Random) -> Question:
+    options = {opt: " ".join(rng.choices(WORDS, k=rng.randint(1, 4))) + f" {i}{opt}" for opt in "ABCD"}
+    text = "Which " + " ".join(rng.choices(WORDS, k=rng.randint(6, 16))) + "?"
+    return Question(id=f"q_{i:06d}", question=text, options=options, correct_option=rng.choice("ABCD"))
+
+
+def make_pool(n: int, seed: int = 0) -> List[Question]:
+    rng = random.Random(seed)
+    return [make_question(i, rng) for i in range(n)]
+
+
+@pytest.fixture(scope="session")
+def question_pools() -> Dict[int, List[Question]]:
+    return {n: make_pool(n) for n in POOL_SIZES}
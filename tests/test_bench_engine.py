@@ -0,0 +1,58 @@
+import pytest
+
+from src.game.engine import (
+    start_new_game,
+    start_cash_builder,
+    generate_chase_offers,
+    apply_player_offer_choice,
+    get_next_chase_question,
+    process_chase_step
+)
+from src.game.state import GamePhase
+from conftest import POOL_SIZES
+
+USED_IDS_DURING_CHASE = 8
+
+
+def chase_state(pool):
+    state = start_new_game(pool, seed=0)
+    state = start_cash_builder(state, 5)
+    state.player.correct_answers = 5
+    offers = generate_chase_offers(state)
+    return apply_player_offer_choice(state, offers, "mid")
+
+
+@pytest.mark.parametrize("n", POOL_SIZES)
+def test_get_next_chase_question(benchmark, question_pools, n):
+    state = chase_state(question_pools[n])
+    used = [q.id for q in state.question_pool[:USED_IDS_DURING_CHASE]]
+
+    def next_question():
+        state.chase.question_ids_used[:] = used
+        return get_next_chase_question(state)
+
+    q = benchmark(next_question)
+    assert q.id not in used
+
+
+@pytest.mark.parametrize("n", POOL_SIZES)
+def test_process_chase_step(benchmark, question_pools, n):
+    state = chase_state(question_pools[n])
+    q = state.question_pool[0]
+
+    def step():
+        state.phase = GamePhase.CHASE
+        state.player.board_position = 4
+        state.chaser.board_position = 8
+        state.current_question = q
+        return process_chase_step(state, q.correct_option, True, True)
+
+    state = benchmark(step)
+    assert state.player.board_position == 3 and state.chaser.board_position == 7
+
+
+@pytest.mark.parametrize("n", POOL_SIZES)
+def test_generate_chase_offers(benchmark, question_pools, n):
+    state = chase_state(question_pools[n])
+    offers = benchmark(generate_chase_offers, state)
+    assert offers.low_offer_money <= offers.mid_offer_money <= offers.high_offer_money
@@ -0,0 +1,52 @@
+import csv
+import json
+from dataclasses import asdict
+
+import pytest
+
+from src.utils.question_loader import load_questions_from_jsonl
+from src.utils.prepare_questions import load_and_normalize_questions
+from conftest import POOL_SIZES
+
+
+@pytest.fixture(scope="module")
+def jsonl_files(tmp_path_factory, question_pools):
+    root = tmp_path_factory.mktemp("jsonl")
+    paths = {}
+    for n, pool in question_pools.items():
+        path = root / f"questions_{n}.jsonl"
+        with path.open("w", encoding="utf-8") as f:
+            for q in pool:
+                f.write(json.dumps(asdict(q), ensure_ascii=False) + "\n")
+        paths[n] = path
+    return paths
+
+
+@pytest.fixture(scope="module")
+def csv_files(tmp_path_factory, question_pools):
+    root = tmp_path_factory.mktemp("csv")
+    paths = {}
+    for n, pool in question_pools.items():
+        path = root / f"cleaned_{n}.csv"
+        with path.open("w", encoding="utf-8", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(["Questions", "A", "B", "C", "D", "Correct"])
+            for i, q in enumerate(pool):
+                # alternate between letter and full-text answers, as in the raw data
+                correct = q.correct_option if i % 2 else q.options[q.correct_option]
+                writer.writerow([q.question, q.options["A"], q.options["B"], q.options["C"], q.options["D"], correct])
+        paths[n] = path
+    return paths
+
+
+@pytest.mark.parametrize("n", POOL_SIZES)
+def test_load_questions_from_jsonl(benchmark, jsonl_files, n):
+    questions = benchmark(load_questions_from_jsonl, jsonl_files[n])
+    assert len(questions) == n
+
+
+@pytest.mark.parametrize("n", POOL_SIZES)
+def test_load_and_normalize_questions(benchmark, csv_files, n, capsys):
+    pytest.importorskip("pandas")
+    questions = benchmark(load_and_normalize_questions, csv_files[n], seed=0)
+    assert len(questions) == n
@@ -0,0 +1,47 @@
+import pytest
+
+from src.game.chaser_logic import ChaserAnswer, build_comment_prompts
+from src.llm.personas import get_all_personas
+from src.llm.question_answerer import build_question_prompt, parse_llm_answer
+
+RESPONSES = {
+    "short": "Answer: C",
+    "reasoning": "Let me think. The river is longer than the others, so " * 20 + "Answer: C",
+    "fallback": "I would go with option C here, it is the capital.",
+}
+
+
+@pytest.mark.parametrize("n", [100, 10_000])
+def test_build_question_prompt(benchmark, question_pools, n):
+    q = question_pools[n][-1]
+    prompt = benchmark(build_question_prompt, q)
+    assert q.options["D"] in prompt
+
+
+@pytest.mark.parametrize("persona", [p.key for p in get_all_personas()])
+def test_build_comment_prompts(benchmark, question_pools, persona):
+    persona = next(p for p in get_all_personas() if p.key == persona)
+    q = question_pools[100][0]
+    wrong = next(opt for opt in "ABCD" if opt != q.correct_option)
+    chaser_answer = ChaserAnswer(
+        chosen_option=wrong,
+        is_correct=False,
+        raw_llm_response=f"Answer: {wrong}",
+        natural_llm_choice=q.correct_option
+    )
+
+    system_prompt, user_prompt = benchmark(
+        build_comment_prompts,
+        question=q,
+        correct_option=q.correct_option,
+        player_correct=True,
+        chaser_answer=chaser_answer,
+        persona=persona,
+        player_answer_option=q.correct_option
+    )
+    assert persona.name in system_prompt and q.question in user_prompt
+
+
+@pytest.mark.parametrize("style", list(RESPONSES))
+def test_parse_llm_answer(benchmark, style):
+    assert benchmark(parse_llm_answer, RESPONSES[style]) == "C"
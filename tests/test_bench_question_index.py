@@ -0,0 +1,49 @@
+import pytest
+
+from src.utils.question_index import QuestionIndex
+from src.game.engine import start_new_game, draw_questions
+from conftest import POOL_SIZES
+
+QUERIES = {
+    "and": "capital river",
+    "or": "capital OR river",
+    "not": "capital river -king -ocean",
+    "rare": "empire 17a",
+}
+
+
+@pytest.fixture(scope="module")
+def indexes(question_pools):
+    return {n: QuestionIndex.build(pool) for n, pool in question_pools.items()}
+
+
+@pytest.mark.parametrize("n", POOL_SIZES)
+def test_build_question_index(benchmark, question_pools, n):
+    index = benchmark(QuestionIndex.build, question_pools[n])
+    assert len(index) == n
+
+
+@pytest.mark.parametrize("query", sorted(QUERIES))
+@pytest.mark.parametrize("n", POOL_SIZES)
+def test_question_index_query(benchmark, indexes, question_pools, n, query):
+    index = indexes[n]
+    positions = benchmark(index.positions, QUERIES[query])
+
+    words = QUERIES[query].split()
+    for i in positions.tolist()[:20]:
+        q = question_pools[n][i]
+        text = " ".join([q.question.lower(), *q.options.values()])
+        assert any(word in text for word in words if not word.startswith("-"))
+
+
+@pytest.mark.parametrize("n", POOL_SIZES)
+def test_draw_questions_balanced(benchmark, indexes, question_pools, n):
+    state = start_new_game(question_pools[n], seed=0)
+    state.question_index = indexes[n]
+
+    def draw():
+        state.drawn_terms.clear()
+        return draw_questions(state, 8)
+
+    questions = benchmark(draw)
+    assert len({q.id for q in questions}) == min(8, n)
@@ -0,0 +1,65 @@
+import asyncio
+import json
+
+from src.llm.cassette import CASSETTE_MODE_RECORD, CASSETTE_MODE_REPLAY, Cassette
+
+URL = "http://llm.test/v1/chat/completions"
+
+
+def answer(request, n: int):
+    body = json.loads(request.content)
+    return {"choices": [{"message": {"content": f"{body['messages'][-1]['content'].upper()} {n}"}}]}
+
+
+def record(path, requests) -> None:
+    cassette = Cassette(path, CASSETTE_MODE_RECORD)
+    transport = cassette.transport()
+    sent = []
+
+    def respond(request):
+        sent.append(request)
+        return cassette.http.Response(200, json=answer(request, len(sent)))
+
+    transport._inner = cassette.http.MockTransport(respond)
+
+    with cassette.http.Client(transport=transport) as client:
+        for body in requests:
+            assert client.post(URL, json=body).status_code == 200
+    assert cassette.recorded == len(requests)
+
+
+def test_recorded_responses_are_replayed(tmp_path):
+    path = tmp_path / "cassette.jsonl"
+    record(path, [{"model": "mini", "messages": [{"role": "user", "content": "hello"}]}])
+
+    cassette = Cassette(path, CASSETTE_MODE_REPLAY)
+    with cassette.http.Client(transport=cassette.transport()) as client:
+        # key order does not matter, the host does not either
+        body = {"messages": [{"content": "hello", "role": "user"}], "model": "mini"}
+        response = client.post("http://elsewhere.test/v1/chat/completions", json=body)
+        assert response.status_code == 200
+        assert response.json()["choices"][0]["message"]["content"] == "HELLO 1"
+
+        missing = client.post(URL, json={"model": "mini", "messages": [{"role": "user", "content": "bye"}]})
+        assert missing.status_code == 404
+
+    assert cassette.hits == 1 and cassette.misses == 1
+
+
+def test_identical_requests_cycle_through_recordings(tmp_path):
+    path = tmp_path / "cassette.jsonl"
+    body = {"model": "mini", "messages": [{"role": "user", "content": "again"}]}
+    record(path, [body, body])
+    # a line cut short by a killed recording is skipped
+    with path.open("a", encoding="utf-8") as f:
+        f.write('{"key": "trunc')
+
+    cassette = Cassette(path, CASSETTE_MODE_REPLAY)
+
+    async def replay():
+        async with cassette.http.AsyncClient(transport=cassette.async_transport()) as client:
+            responses = [await client.post(URL, json=body) for _ in range(3)]
+            return [r.json()["choices"][0]["message"]["content"] for r in responses]
+
+    assert asyncio.run(replay()) == ["AGAIN 1", "AGAIN 2", "AGAIN 1"]
+    assert cassette.hits == 3
@@ -0,0 +1,51 @@
+import asyncio
+
+from conftest import make_pool
+from src.game.chaser_logic import ChaserLogic
+from src.game.degraded import DEGRADED_REASON_ERROR, DegradedMode
+from src.llm.question_answerer import AnswerResult
+
+QUESTIONS = make_pool(5)
+FAILING = QUESTIONS[2].id
+
+
+class FakeAnswerer:
+    def answer_question_detailed(self, question, **kwargs) -> AnswerResult:
+        if question.id == FAILING:
+            raise ValueError("Could not parse answer")
+        return AnswerResult(choice=question.correct_option, raw=question.correct_option)
+
+    async def aanswer_question_detailed(self, question, **kwargs) -> AnswerResult:
+        return self.answer_question_detailed(question)
+
+    def close(self) -> None:
+        pass
+
+
+def make_chaser() -> ChaserLogic:
+    return ChaserLogic(qa=FakeAnswerer(), degraded=DegradedMode(), seed=0)
+
+
+def check_answers(answers) -> None:
+    assert sorted(answers) == list(range(len(QUESTIONS)))
+    for i, answer in answers.items():
+        if QUESTIONS[i].id == FAILING:
+            assert answer.natural_llm_choice == "" and answer.degraded_reason == DEGRADED_REASON_ERROR
+            assert answer.chosen_option in "ABCD"
+        else:
+            assert answer.natural_llm_choice == QUESTIONS[i].correct_option
+            assert answer.degraded_reason is None
+
+
+def test_final_chase_survives_a_failing_question():
+    chaser = make_chaser()
+    check_answers(dict(chaser.answer_final_chase(QUESTIONS)))
+
+
+def test_async_final_chase_survives_a_failing_question():
+    chaser = make_chaser()
+
+    async def collect():
+        return {i: answer async for i, answer in chaser.aanswer_final_chase(QUESTIONS)}
+
+    check_answers(asyncio.run(collect()))
@@ -0,0 +1,33 @@
+import asyncio
+
+from src.llm.client import OpenAIClient
+
+
+def make_client(monkeypatch) -> OpenAIClient:
+    monkeypatch.setenv("OPENAI_API_KEY", "x")
+    return OpenAIClient(model="mini")
+
+
+def test_aclose_closes_the_async_client(monkeypatch):
+    client = make_client(monkeypatch)
+
+    async def scenario():
+        async_client = client._get_async_client()
+        await client.aclose()
+        return async_client
+
+    assert asyncio.run(scenario()).is_closed()
+
+
+def test_close_from_another_thread_closes_the_async_client_on_its_loop(monkeypatch):
+    client = make_client(monkeypatch)
+
+    async def scenario():
+        async_client = client._get_async_client()
+        # like a session evicted by the sweeper thread
+        await asyncio.to_thread(client.close)
+        for _ in range(5):
+            await asyncio.sleep(0)
+        return async_client
+
+    assert asyncio.run(scenario()).is_closed()
@@ -0,0 +1,180 @@
+import asyncio
+import time
+
+from conftest import make_pool
+from src.game.chaser_logic import ChaserLogic
+from src.game.degraded import (
+    BREAKER_CLOSED,
+    BREAKER_HALF_OPEN,
+    BREAKER_OPEN,
+    DEGRADED_REASON_BREAKER,
+    DEGRADED_REASON_BUDGET,
+    DEGRADED_REASON_SHED,
+    MODE_NORMAL,
+    MODE_SHEDDING,
+    CircuitBreaker,
+    DegradedMode,
+)
+from src.llm.question_answerer import ANSWER_MODE_CONSTRAINED, AnswerResult, QuestionAnswerer
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def open_breaker(clock: FakeClock) -> CircuitBreaker:
+    breaker = CircuitBreaker(window_size=10, min_calls=4, error_rate=0.5, cooldown_seconds=30, clock=clock)
+    for ok in (True, False, True, False):
+        breaker.record(ok)
+    return breaker
+
+
+def test_breaker_opens_at_the_error_rate():
+    breaker = open_breaker(FakeClock())
+
+    assert breaker.state == BREAKER_OPEN
+    assert not breaker.allow()
+    assert breaker.opened == 1
+
+
+def test_half_open_probe_closes_or_reopens_the_breaker():
+    clock = FakeClock()
+    breaker = open_breaker(clock)
+
+    clock.now = 30
+    assert breaker.allow()
+    assert breaker.state == BREAKER_HALF_OPEN
+    # only the probe goes through
+    assert not breaker.allow()
+
+    breaker.record(False)
+    assert breaker.state == BREAKER_OPEN and breaker.opened == 2
+
+    clock.now = 60
+    assert breaker.allow()
+    breaker.record(True)
+    assert breaker.state == BREAKER_CLOSED
+    assert breaker.allow()
+
+
+def test_probe_that_never_reports_is_replaced_after_a_cooldown():
+    clock = FakeClock()
+    breaker = open_breaker(clock)
+
+    clock.now = 30
+    assert breaker.allow()
+    clock.now = 59
+    assert not breaker.allow()
+    clock.now = 60
+    assert breaker.allow()
+    assert breaker.state == BREAKER_HALF_OPEN
+
+
+def test_open_breaker_degrades_steps():
+    degraded = DegradedMode(breaker=open_breaker(FakeClock()))
+
+    with degraded.step() as reason:
+        assert reason == DEGRADED_REASON_BREAKER
+    assert degraded.in_flight == 0
+
+
+def test_steps_are_shed_past_the_in_flight_limit():
+    degraded = DegradedMode(shed_in_flight=5)
+    waiting = [degraded.step() for _ in range(5)]
+    assert [step.__enter__() for step in waiting] == [None] * 5
+
+    with degraded.step() as reason:
+        assert reason == DEGRADED_REASON_SHED
+    assert degraded.mode == MODE_SHEDDING
+
+    # shedding stops below SHED_RESUME_RATIO of the limit, not at the limit
+    waiting.pop().__exit__(None, None, None)
+    assert degraded.mode == MODE_SHEDDING
+    waiting.pop().__exit__(None, None, None)
+    assert degraded.mode == MODE_NORMAL
+
+    with degraded.step() as reason:
+        assert reason is None
+    for step in waiting:
+        step.__exit__(None, None, None)
+    assert degraded.in_flight == 0
+
+
+class HangingClient:
+    model = "mini"
+
+    def __init__(self):
+        self.started = 0
+        self.cancelled = 0
+
+    async def hang(self):
+        self.started += 1
+        try:
+            await asyncio.Event().wait()
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+
+    async def acomplete(self, **kwargs):
+        return await self.hang()
+
+    async def achat(self, **kwargs):
+        return await self.hang()
+
+
+def test_step_over_budget_cancels_the_llm_calls(monkeypatch):
+    monkeypatch.setenv("OPENAI_API_KEY", "x")
+    qa = QuestionAnswerer(model="mini", answer_mode=ANSWER_MODE_CONSTRAINED)
+    client = qa.client = HangingClient()
+    degraded = DegradedMode(budget_seconds=0.01)
+    chaser = ChaserLogic(qa=qa, degraded=degraded, seed=0)
+    question = make_pool(1)[0]
+
+    async def step():
+        answer, comment = await chaser.aanswer_and_comment(question, "A")
+        # let the cancelled calls unwind
+        await asyncio.sleep(0)
+        return answer, comment
+
+    answer, comment = asyncio.run(step())
+
+    assert answer.degraded_reason == DEGRADED_REASON_BUDGET and comment
+    # the answer call sits behind a single flight, it is cancelled all the same
+    assert client.started == 2 and client.cancelled == 2
+    assert not qa.flights._awaiters
+
+
+class FakeBank:
+    def get(self, question, persona_key, player_option, chaser_correct):
+        return "banked"
+
+
+class SlowAnswerer:
+    def answer_question_detailed(self, question, **kwargs):
+        time.sleep(0.02)
+        return AnswerResult(choice=question.correct_option, raw=question.correct_option)
+
+    async def aanswer_question_detailed(self, question, **kwargs):
+        await asyncio.sleep(1)
+
+    def close(self) -> None:
+        pass
+
+
+def test_late_answer_with_a_banked_comment_is_degraded_on_both_paths():
+    question = make_pool(1)[0]
+
+    def step(run):
+        degraded = DegradedMode(budget_seconds=0.01)
+        chaser = ChaserLogic(qa=SlowAnswerer(), degraded=degraded, comment_bank=FakeBank(), seed=0)
+        answer, comment = run(chaser)
+        assert comment == "banked"
+        assert answer.degraded_reason == DEGRADED_REASON_BUDGET
+        assert degraded.snapshot()["degraded_steps"] == {DEGRADED_REASON_BUDGET: 1}
+
+    step(lambda chaser: chaser.answer_and_comment(question, "A"))
+    step(lambda chaser: asyncio.run(chaser.aanswer_and_comment(question, "A")))
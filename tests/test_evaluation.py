@@ -0,0 +1,23 @@
+import asyncio
+
+from conftest import make_pool
+from src.llm.evaluation import EvalConfig, aevaluate
+from src.llm.question_answerer import AnswerResult, QuestionAnswerer
+
+
+def test_evaluation_closes_the_async_clients(monkeypatch):
+    monkeypatch.setenv("OPENAI_API_KEY", "x")
+    clients = []
+
+    async def answer(self, question, **kwargs):
+        # opens the async client like a real call would
+        clients.append(self.client._get_async_client())
+        return AnswerResult(choice=question.correct_option, raw=question.correct_option)
+
+    monkeypatch.setattr(QuestionAnswerer, "aanswer_question_detailed", answer)
+
+    questions = make_pool(3)
+    results = asyncio.run(aevaluate(questions, EvalConfig(models=["mini", "nano"]), done=set()))
+
+    assert len(results) == 6 and all(r.correct for r in results)
+    assert clients and all(client.is_closed() for client in clients)
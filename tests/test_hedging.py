@@ -0,0 +1,71 @@
+import threading
+import time
+
+from src.llm.hedging import HedgePolicy, Hedger
+from src.llm.scheduler import LLMScheduler
+
+DELAY = 0.05
+
+
+class Backend:
+    def __init__(self, latencies):
+        self.latencies = latencies
+        self.sent = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+
+    def create(self, target):
+        with self._lock:
+            self.sent.append(target)
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        time.sleep(self.latencies[target])
+        with self._lock:
+            self.in_flight -= 1
+        return f"raw from {target}"
+
+
+def make_hedger(capacity: int) -> Hedger:
+    policy = HedgePolicy(min_delay_seconds=DELAY, max_delay_seconds=DELAY)
+    return Hedger(policy, "primary", "alternate", scheduler=LLMScheduler(capacity=capacity, preempt=False))
+
+
+def test_duplicate_wins_a_slow_call():
+    hedger = make_hedger(capacity=2)
+    backend = Backend({"primary": 0.5, "alternate": 0.0})
+
+    raw, target = hedger.run(backend.create, "answer")
+    assert target == "alternate" and raw == "raw from alternate"
+    hedger.close()
+
+
+def test_duplicate_waits_for_a_slot_of_its_own():
+    hedger = make_hedger(capacity=1)
+    backend = Backend({"primary": 0.2, "alternate": 0.0})
+
+    raw, target = hedger.run(backend.create, "answer")
+
+    # no free slot for the duplicate: it is never sent
+    assert target == "primary"
+    time.sleep(DELAY)
+    assert backend.sent == ["primary"] and backend.max_in_flight == 1
+    hedger.close()
+
+
+def test_waiting_for_a_slot_does_not_trigger_a_hedge():
+    hedger = make_hedger(capacity=1)
+    backend = Backend({"primary": 0.0, "alternate": 0.0})
+    release = threading.Event()
+    holder = threading.Thread(target=hedger.scheduler.run, args=("answer", release.wait))
+    holder.start()
+    time.sleep(0.01)
+
+    starts = []
+    threading.Timer(4 * DELAY, release.set).start()
+    raw, target = hedger.run(backend.create, "answer", on_start=lambda: starts.append(time.perf_counter()))
+    holder.join()
+
+    assert target == "primary" and backend.sent == ["primary"]
+    assert len(starts) == 1
+    hedger.close()
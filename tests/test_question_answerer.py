@@ -0,0 +1,89 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from src.llm import question_answerer
+from src.llm.question_answerer import ANSWER_MODE_CONSTRAINED, QuestionAnswerer
+from src.utils.data_models import Question
+
+QUESTION = Question(id="q_1", question="Which one?", options={"A": "a", "B": "b", "C": "c", "D": "d"}, correct_option="B")
+
+
+class StatusError(Exception):
+    def __init__(self, status_code: int, message: str, param=None):
+        super().__init__(message)
+        self.status_code = status_code
+        self.message = message
+        self.param = param
+
+
+def letter_response(letter: str):
+    return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=letter), logprobs=None)])
+
+
+class FakeClient:
+    model = "mini"
+
+    def __init__(self, errors):
+        self.errors = list(errors)
+        self.constrained_calls = 0
+        self.free_calls = 0
+
+    def complete(self, **kwargs):
+        self.constrained_calls += 1
+        if self.errors:
+            raise self.errors.pop(0)
+        return letter_response("B")
+
+    def chat(self, **kwargs):
+        self.free_calls += 1
+        return "Answer: C"
+
+    async def acomplete(self, **kwargs):
+        return self.complete(**kwargs)
+
+    async def achat(self, **kwargs):
+        return self.chat(**kwargs)
+
+
+def make_answerer(monkeypatch, errors) -> QuestionAnswerer:
+    monkeypatch.setenv("OPENAI_API_KEY", "x")
+    qa = QuestionAnswerer(model="mini", answer_mode=ANSWER_MODE_CONSTRAINED)
+    qa.client = FakeClient(errors)
+    return qa
+
+
+def test_unrelated_400_is_raised_and_keeps_constrained_mode(monkeypatch):
+    qa = make_answerer(monkeypatch, [StatusError(400, "context_length_exceeded")])
+
+    with pytest.raises(StatusError):
+        qa.answer_question_detailed(QUESTION)
+
+    assert qa.constrained()
+    assert qa.answer_question_detailed(QUESTION).choice == "B"
+
+
+def test_unsupported_param_falls_back_for_the_call_and_the_model(monkeypatch):
+    qa = make_answerer(monkeypatch, [StatusError(400, "Unrecognized request argument", param="logit_bias")])
+
+    result = qa.answer_question_detailed(QUESTION)
+    assert result.choice == "C" and not result.constrained
+    assert not qa.constrained()
+
+    # the next question goes straight to free mode
+    qa.answer_question_detailed(QUESTION)
+    assert qa.client.constrained_calls == 1 and qa.client.free_calls == 2
+
+
+def test_unsupported_param_is_retried_later(monkeypatch):
+    qa = make_answerer(monkeypatch, [StatusError(422, "max_tokens is not supported")])
+    now = [1000.0]
+    monkeypatch.setattr(question_answerer.time, "monotonic", lambda: now[0])
+
+    asyncio.run(qa.aanswer_question_detailed(QUESTION))
+    assert not qa.constrained()
+
+    now[0] += question_answerer.UNSUPPORTED_PARAMS_RETRY_SECONDS
+    assert qa.constrained()
+    assert asyncio.run(qa.aanswer_question_detailed(QUESTION)).choice == "B"
@@ -0,0 +1,76 @@
+from src.llm.router import ModelRouter, Route
+from src.llm.telemetry import LLMCallRecord
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def make_router(clock: FakeClock, **kwargs) -> ModelRouter:
+    return ModelRouter([Route("answer", budget_seconds=2.0, fallback_model="nano")], clock=clock, **kwargs)
+
+
+def observe(router: ModelRouter, model: str, latency: float, error: bool = False, n: int = 1) -> None:
+    for _ in range(n):
+        router.observe(LLMCallRecord(model=model, persona="p", call_type="answer", latency_seconds=latency, error=error))
+
+
+def test_slow_primary_routes_to_fallback():
+    router = make_router(FakeClock())
+    observe(router, "mini", 5.0, n=20)
+
+    models = [router.choose("answer", "p", "mini") for _ in range(40)]
+    assert models.count("nano") == 38 and models.count("mini") == 2
+
+
+def test_failing_fallback_is_not_used():
+    clock = FakeClock()
+    router = make_router(clock)
+    observe(router, "mini", 5.0, n=100)
+
+    chosen = []
+    for _ in range(200):
+        model = router.choose("answer", "p", "mini")
+        chosen.append(model)
+        # the fallback fails at once, like an unknown model
+        observe(router, model, 0.03 if model == "nano" else 5.0, error=model == "nano")
+        clock.now += 0.05
+
+    assert chosen.count("nano") <= router.min_error_samples
+
+
+def test_failing_primary_routes_to_fallback():
+    router = make_router(FakeClock())
+    observe(router, "mini", 0.1, error=True, n=10)
+
+    assert router.choose("answer", "p", "mini") == "nano"
+
+
+def test_probe_under_budget_recovers_the_route():
+    clock = FakeClock()
+    router = make_router(clock)
+    observe(router, "mini", 5.0, n=100)
+
+    calls = 0
+    while router.choose("answer", "p", "mini") != "mini":
+        calls += 1
+        assert calls < 100
+    # the probe comes back fast
+    observe(router, "mini", 0.5)
+
+    assert router.choose("answer", "p", "mini") == "mini"
+    assert calls < router.probe_every
+
+
+def test_samples_age_out():
+    clock = FakeClock()
+    router = make_router(clock)
+    observe(router, "mini", 5.0, n=100)
+    assert router.choose("answer", "p", "mini") == "nano"
+
+    clock.now += router.window_seconds + 1
+    assert router.choose("answer", "p", "mini") == "mini"
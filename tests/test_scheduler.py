@@ -0,0 +1,169 @@
+import asyncio
+
+import pytest
+
+from src.llm.scheduler import (
+    PRIORITY_BATCH,
+    PRIORITY_LIVE_COMMENT,
+    PRIORITY_LIVE_STEP,
+    PRIORITY_PREFETCH,
+    LLMScheduler,
+    llm_work,
+)
+from src.llm.telemetry import CALL_TYPE_ANSWER
+
+
+def classes(scheduler: LLMScheduler):
+    return {c["priority"]: c for c in scheduler.snapshot()["classes"]}
+
+
+def start(scheduler: LLMScheduler, coro_fn, priority=None, flow=None) -> asyncio.Task:
+    # the task copies the llm_work context it is created in
+    with llm_work(priority=priority, flow=flow):
+        return asyncio.ensure_future(scheduler.arun(CALL_TYPE_ANSWER, coro_fn))
+
+
+async def settle() -> None:
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+def test_free_slot_goes_to_the_highest_class():
+    async def scenario():
+        scheduler = LLMScheduler(capacity=1, preempt=False)
+        gate = asyncio.Event()
+        order = []
+
+        async def call(name, wait=False):
+            order.append(name)
+            if wait:
+                await gate.wait()
+
+        holder = start(scheduler, lambda: call("holder", wait=True))
+        await settle()
+        waiting = [
+            start(scheduler, lambda n=name: call(n), priority=priority)
+            for name, priority in [
+                ("batch", PRIORITY_BATCH),
+                ("prefetch", PRIORITY_PREFETCH),
+                ("comment", PRIORITY_LIVE_COMMENT),
+                ("step", PRIORITY_LIVE_STEP),
+            ]
+        ]
+        await settle()
+        assert order == ["holder"]
+
+        gate.set()
+        await asyncio.gather(holder, *waiting)
+        return order
+
+    assert asyncio.run(scenario()) == ["holder", "step", "comment", "prefetch", "batch"]
+
+
+def test_background_work_is_capped():
+    async def scenario():
+        scheduler = LLMScheduler(capacity=4, background_share=0.5, preempt=False)
+        gate = asyncio.Event()
+
+        background = [start(scheduler, gate.wait, priority=PRIORITY_BATCH) for _ in range(4)]
+        await settle()
+        batch = classes(scheduler)["batch"]
+        assert batch["running"] == 2 and batch["queued"] == 2
+
+        # the live call finds a slot while background work is still waiting
+        live = start(scheduler, lambda: asyncio.sleep(0, result="live"))
+        assert await asyncio.wait_for(live, 1.0) == "live"
+
+        gate.set()
+        await asyncio.gather(*background)
+
+    asyncio.run(scenario())
+
+
+def test_live_call_preempts_and_requeues_background_call():
+    async def scenario():
+        scheduler = LLMScheduler(capacity=1)
+        release = asyncio.Event()
+        attempts = []
+        order = []
+
+        async def background():
+            attempts.append(len(attempts))
+            if len(attempts) == 1:
+                # never finishes unless preempted
+                await asyncio.Event().wait()
+            await release.wait()
+            order.append("background")
+            return "done"
+
+        async def live():
+            order.append("live")
+            release.set()
+            return "live"
+
+        batch = start(scheduler, background, priority=PRIORITY_BATCH)
+        await settle()
+        assert await asyncio.wait_for(start(scheduler, live), 1.0) == "live"
+        assert await asyncio.wait_for(batch, 1.0) == "done"
+
+        assert len(attempts) == 2 and order == ["live", "background"]
+        assert classes(scheduler)["batch"]["preempted"] == 1
+        assert all(c["running"] == 0 for c in classes(scheduler).values())
+
+    asyncio.run(scenario())
+
+
+def test_waiter_cancelled_while_granted_gives_the_slot_back():
+    async def scenario():
+        scheduler = LLMScheduler(capacity=1, preempt=False)
+        gate = asyncio.Event()
+
+        holder = start(scheduler, gate.wait)
+        await settle()
+        waiter = start(scheduler, lambda: asyncio.sleep(0))
+        await settle()
+
+        # cancel the waiter right after the holder's release grants it the slot
+        (_, _, ticket), = scheduler._queues[PRIORITY_LIVE_STEP]
+        wake = ticket.wake
+
+        def wake_then_cancel():
+            wake()
+            waiter.cancel()
+
+        ticket.wake = wake_then_cancel
+
+        gate.set()
+        await holder
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+
+        assert all(c["running"] == 0 for c in classes(scheduler).values())
+        await asyncio.wait_for(start(scheduler, lambda: asyncio.sleep(0)), 1.0)
+
+    asyncio.run(scenario())
+
+
+def test_busy_flow_does_not_starve_others():
+    async def scenario():
+        scheduler = LLMScheduler(capacity=1, preempt=False)
+        gate = asyncio.Event()
+        order = []
+
+        async def call(flow):
+            order.append(flow)
+
+        holder = start(scheduler, gate.wait, flow="holder")
+        await settle()
+        waiting = [start(scheduler, lambda: call("busy"), flow="busy") for _ in range(6)]
+        waiting += [start(scheduler, lambda: call("quiet"), flow="quiet") for _ in range(2)]
+        await settle()
+
+        gate.set()
+        await asyncio.gather(holder, *waiting)
+        return order
+
+    order = asyncio.run(scenario())
+    assert order.count("busy") == 6
+    # the quiet flow's calls alternate with the busy one's instead of waiting behind them
+    assert [i for i, flow in enumerate(order) if flow == "quiet"] == [1, 3]
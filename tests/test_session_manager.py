@@ -0,0 +1,82 @@
+from src.game.engine import start_new_game
+from src.game.session_manager import SessionManager, estimate_state_bytes
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class FakeChaser:
+    def __init__(self):
+        self.closed = False
+
+    def close(self) -> None:
+        self.closed = True
+
+
+def test_state_size_does_not_count_shared_questions(question_pools):
+    small = estimate_state_bytes(start_new_game(question_pools[100], seed=0))
+    large = estimate_state_bytes(start_new_game(question_pools[10_000], seed=0))
+
+    # only the list of pointers grows with the pool
+    assert large - small < 10_000 * 16
+
+
+def test_idle_session_expires(question_pools):
+    clock = FakeClock()
+    sessions = SessionManager(ttl_seconds=10, clock=clock)
+    chaser = FakeChaser()
+    session = sessions.create(start_new_game(question_pools[100], seed=0), chaser)
+
+    clock.now = 5
+    assert sessions.get(session.session_id) is session
+
+    clock.now = 16
+    assert sessions.get(session.session_id) is None
+    assert chaser.closed
+    assert sessions.stats()["evicted_ttl"] == 1
+
+
+def test_sweep_evicts_expired_sessions(question_pools):
+    clock = FakeClock()
+    sessions = SessionManager(ttl_seconds=10, clock=clock)
+    old = sessions.create(start_new_game(question_pools[100], seed=0))
+    clock.now = 8
+    recent = sessions.create(start_new_game(question_pools[100], seed=1))
+
+    clock.now = 12
+    assert sessions.evict_expired() == 1
+    assert sessions.get(old.session_id) is None
+    assert sessions.get(recent.session_id) is recent
+
+
+def test_memory_limit_evicts_least_recently_used(question_pools):
+    clock = FakeClock()
+    sessions = SessionManager(clock=clock)
+
+    first, second, third = (sessions.create(start_new_game(question_pools[100], seed=i)) for i in range(3))
+    sessions.max_memory_bytes = int(first.size_bytes * 3.5)
+    # touching the first session makes the second the least recently used
+    assert sessions.get(first.session_id) is first
+
+    sessions.create(start_new_game(question_pools[100], seed=3))
+
+    assert sessions.get(second.session_id) is None
+    assert sessions.get(first.session_id) is first
+    assert sessions.get(third.session_id) is third
+    assert sessions.stats()["evicted_memory"] == 1
+
+
+def test_shared_chaser_is_not_closed(question_pools):
+    clock = FakeClock()
+    sessions = SessionManager(ttl_seconds=10, clock=clock)
+    chaser = FakeChaser()
+    session = sessions.create(start_new_game(question_pools[100], seed=0), chaser, owns_chaser=False)
+
+    sessions.remove(session.session_id)
+    assert not chaser.closed
+    assert len(sessions) == 0
@@ -0,0 +1,129 @@
+import asyncio
+import threading
+
+import pytest
+
+from src.llm.single_flight import SingleFlight
+
+
+def test_concurrent_callers_share_the_leader_exception():
+    flights = SingleFlight()
+    started = threading.Event()
+    release = threading.Event()
+    calls = []
+    errors = []
+
+    def fn():
+        calls.append(1)
+        started.set()
+        release.wait()
+        raise ValueError("boom")
+
+    def caller():
+        try:
+            flights.do("k", fn, on_join=release.set)
+        except ValueError as e:
+            errors.append(e)
+
+    leader = threading.Thread(target=caller)
+    leader.start()
+    started.wait()
+    joiner = threading.Thread(target=caller)
+    joiner.start()
+    leader.join()
+    joiner.join()
+
+    assert len(calls) == 1 and len(errors) == 2
+    assert flights.stats() == {"leaders": 1, "coalesced": 1}
+
+    # nothing is cached: the next caller runs the function again
+    assert flights.do("k", lambda: "ok") == "ok"
+
+
+def test_async_callers_share_the_leader_exception():
+    async def scenario():
+        flights = SingleFlight()
+        calls = []
+
+        async def fn():
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            raise ValueError("boom")
+
+        results = await asyncio.gather(flights.ado("k", fn), flights.ado("k", fn), return_exceptions=True)
+        assert len(calls) == 1
+        assert all(isinstance(r, ValueError) for r in results)
+
+    asyncio.run(scenario())
+
+
+def test_cancelled_joiner_does_not_cancel_the_call():
+    async def scenario():
+        flights = SingleFlight()
+        release = asyncio.Event()
+
+        async def fn():
+            await release.wait()
+            return "answer"
+
+        leader = asyncio.ensure_future(flights.ado("k", fn))
+        joiner = asyncio.ensure_future(flights.ado("k", fn))
+        await asyncio.sleep(0)
+
+        joiner.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await joiner
+
+        release.set()
+        assert await leader == "answer"
+
+    asyncio.run(scenario())
+
+
+def test_cancelled_leader_does_not_cancel_the_call():
+    async def scenario():
+        flights = SingleFlight()
+        release = asyncio.Event()
+
+        async def fn():
+            await release.wait()
+            return "answer"
+
+        leader = asyncio.ensure_future(flights.ado("k", fn))
+        joiner = asyncio.ensure_future(flights.ado("k", fn))
+        await asyncio.sleep(0)
+
+        leader.cancel()
+        await asyncio.sleep(0)
+        release.set()
+        assert await joiner == "answer"
+        assert leader.cancelled()
+
+    asyncio.run(scenario())
+
+
+def test_call_is_cancelled_when_every_caller_is():
+    async def scenario():
+        flights = SingleFlight()
+        cancelled = []
+
+        async def fn():
+            try:
+                await asyncio.Event().wait()
+            except asyncio.CancelledError:
+                cancelled.append(1)
+                raise
+
+        callers = [asyncio.ensure_future(flights.ado("k", fn)) for _ in range(2)]
+        await asyncio.sleep(0)
+        for caller in callers:
+            caller.cancel()
+        await asyncio.gather(*callers, return_exceptions=True)
+        await asyncio.sleep(0)
+
+        assert cancelled == [1]
+        # the next caller starts a new call
+        assert await flights.ado("k", lambda: asyncio.sleep(0, result="ok")) == "ok"
+        assert flights.stats() == {"leaders": 2, "coalesced": 1}
+
+    asyncio.run(scenario())
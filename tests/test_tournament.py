@@ -0,0 +1,45 @@
+from conftest import make_pool
+from src.game.tournament import TournamentConfig, run_tournament
+from src.llm.cassette import sdk_http_module
+from src.llm.client import OpenAIClient
+
+
+def completion(content: str) -> dict:
+    return {
+        "id": "chatcmpl-test",
+        "object": "chat.completion",
+        "created": 0,
+        "model": "mini",
+        "choices": [{"index": 0, "message": {"role": "assistant", "content": content}, "finish_reason": "stop"}],
+        "usage": {"prompt_tokens": 10, "completion_tokens": 1, "total_tokens": 11},
+    }
+
+
+def test_games_share_one_client_and_count_their_own_usage(monkeypatch):
+    monkeypatch.setenv("OPENAI_API_KEY", "x")
+    http = sdk_http_module()
+    requests = []
+    http_clients = []
+
+    def respond(request):
+        requests.append(request)
+        return http.Response(200, json=completion("A"))
+
+    def http_client(self):
+        from openai import DefaultHttpxClient
+
+        http_clients.append(DefaultHttpxClient(transport=http.MockTransport(respond)))
+        return http_clients[-1]
+
+    monkeypatch.setattr(OpenAIClient, "_http_client", http_client)
+
+    results = []
+    config = TournamentConfig(n_games=6, concurrency=3, base_seed=0, chaser_model="mini")
+    report = run_tournament(make_pool(200), config, on_result=results.append)
+
+    assert report["errors"] == 0, report["sample_errors"]
+    # one client for the whole run, closed once it is over
+    assert len(http_clients) == 1 and http_clients[0].is_closed
+    # every request is counted once, by the game that sent it
+    assert sum(r.llm_calls for r in results) == len(requests) > 0
+    assert sum(r.prompt_tokens for r in results) == 10 * len(requests)